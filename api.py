@@ -0,0 +1,72 @@
+# api.py
+# 추천 서비스 HTTP API
+#
+# 실행:
+#   uvicorn api:app --host 0.0.0.0 --port 8000 --workers 4
+# 각 워커는 시작 시 공유 자원을 한 번 로드하고, 동기 엔드포인트는 스레드 풀에서 동시에 처리됨
+
+from contextlib import asynccontextmanager
+from typing import List, Literal, Optional
+
+from dotenv import load_dotenv
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel, Field
+
+import service
+
+#========== 요청 모델 ==========
+class SurveyResponses(BaseModel):
+    ai_knowledge: str = ""
+    job: str = ""
+    tool_interest: List[str] = Field(default_factory=list)
+    specific_purpose: List[str] = Field(default_factory=list)
+    preferred_difficulty: str = "난이도보다는 기능 중심으로 선택하고 싶음"
+
+class RecommendRequest(BaseModel):
+    responses: List[SurveyResponses]
+    max_recommendations: int = Field(default=3, ge=1, le=20)
+    engine: Literal["rules", "embedding", "hybrid"] = "rules"
+
+class AskRequest(BaseModel):
+    question: str = Field(min_length=1)
+    responses: Optional[SurveyResponses] = None
+
+#========== 앱 ==========
+@asynccontextmanager
+async def lifespan(app):
+    # 첫 요청이 느려지지 않도록 시작 시 미리 로드
+    load_dotenv()
+    service.load_resources()
+    yield
+
+app = FastAPI(title="AI 도구 추천 API", lifespan=lifespan)
+
+@app.post("/classify")
+def classify(responses: SurveyResponses):
+    return service.classify(responses.model_dump())
+
+@app.post("/recommend")
+def recommend(request: RecommendRequest):
+    return {
+        "results": service.recommend_batch(
+            [responses.model_dump() for responses in request.responses],
+            request.max_recommendations,
+            request.engine
+        )
+    }
+
+@app.get("/tools")
+def tools(difficulty: str = "모든 난이도", category: str = "모든 카테고리", search: str = ""):
+    return {"tools": service.list_tools(difficulty, category, search)}
+
+@app.get("/tools/{name}")
+def tool_detail(name: str):
+    detail = service.tool_detail(name)
+    if detail is None:
+        raise HTTPException(status_code=404, detail="도구를 찾을 수 없습니다.")
+    return detail
+
+@app.post("/ask")
+def ask(request: AskRequest):
+    responses = request.responses.model_dump() if request.responses else None
+    return service.ask(request.question, responses)
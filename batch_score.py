@@ -0,0 +1,265 @@
+# batch_score.py
+# 대량 설문 응답(CSV/JSONL)의 사용자 유형과 상위 추천 도구를 오프라인으로 계산
+#
+# 입력을 청크 단위로 읽어 프로세스 풀에서 행렬 연산으로 점수를 계산하고 바로 출력하므로
+# 입력 크기와 무관하게 메모리 사용량이 일정함
+#
+# 사용법:
+#   python batch_score.py responses.jsonl scores.parquet
+#   python batch_score.py responses.csv scores.csv --chunksize 50000 --workers 8
+#
+# 여러 개 선택 응답(tool_interest, specific_purpose)은 JSONL에서는 리스트로,
+# CSV에서는 JSON 리스트 문자열 또는 ';'로 구분한 문자열로 입력
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from recommend import (
+    DIFFICULTY_PREFERENCE_MAP, INTEREST_CATEGORY_MAP, JOB_CATEGORY_MAP, PURPOSE_CATEGORY_MAP,
+    load_json_data
+)
+from user_type import (
+    BEGINNER_LEVELS, INTEREST_POINTS, JOB_POINTS, KNOWLEDGE_POINTS, PURPOSE_POINTS, USER_TYPES
+)
+
+EXPERT_LEVEL = 'AI 모델이나 알고리즘을 직접 다뤄본 적 있다'
+DEFAULT_PREFERENCE = "난이도보다는 기능 중심으로 선택하고 싶음"
+
+_tables = None
+
+#========== 점수 테이블 ==========
+def points_table(points_map, options):
+    """옵션별 유형 점수 행렬 (마지막 행은 알 수 없는 응답용 0 벡터)"""
+    table = np.zeros((len(options) + 1, len(USER_TYPES)), dtype=np.int32)
+    for i, option in enumerate(options):
+        for user_type, value in points_map.get(option, {}).items():
+            table[i, USER_TYPES.index(user_type)] = value
+    return table
+
+def category_table(category_map, options, categories, weight):
+    """옵션별 도구 가산점 행렬 (옵션 → 카테고리 일치 여부 × 가중치)"""
+    table = np.zeros((len(options) + 1, len(categories)), dtype=np.int32)
+    for i, option in enumerate(options):
+        matching = set(category_map.get(option, []))
+        table[i] = [weight if category in matching else 0 for category in categories]
+    return table
+
+def build_tables(tools):
+    """설문 옵션과 카탈로그로 행렬 연산용 점수 테이블 생성"""
+    categories = [tool.get("category") for tool in tools]
+    difficulties = [tool.get("difficulty") for tool in tools]
+
+    knowledge_options = list(KNOWLEDGE_POINTS)
+    job_options = sorted(set(JOB_POINTS) | set(JOB_CATEGORY_MAP))
+    interest_options = sorted(set(INTEREST_POINTS) | set(INTEREST_CATEGORY_MAP))
+    purpose_options = sorted(set(PURPOSE_POINTS) | set(PURPOSE_CATEGORY_MAP))
+    preference_options = list(DIFFICULTY_PREFERENCE_MAP)
+
+    # 선호 난이도 일치 +5, 난이도 정보 없음은 medium 선호 시 +4
+    preference_scores = np.zeros((len(preference_options) + 1, len(tools)), dtype=np.int32)
+    for i, option in enumerate(preference_options):
+        preferred = DIFFICULTY_PREFERENCE_MAP[option]
+        if preferred:
+            preference_scores[i] = [5 if d == preferred else (4 if d is None and preferred == "medium" else 0)
+                                    for d in difficulties]
+
+    # 초보자는 쉬운 도구 +3, 전문가는 어려운 도구 +3
+    knowledge_scores = np.zeros((len(knowledge_options) + 1, len(tools)), dtype=np.int32)
+    for i, option in enumerate(knowledge_options):
+        if option in BEGINNER_LEVELS:
+            knowledge_scores[i] = [3 if d == "low" else 0 for d in difficulties]
+        elif option == EXPERT_LEVEL:
+            knowledge_scores[i] = [3 if d == "hard" else 0 for d in difficulties]
+
+    return {
+        "tool_names": np.array([tool.get("name") for tool in tools], dtype=object),
+        "is_low": np.array([d == "low" for d in difficulties]),
+        "description_bonus": np.array([1 if tool.get("description") and len(str(tool.get("description"))) > 10 else 0
+                                       for tool in tools], dtype=np.int32),
+        "beginner_index": USER_TYPES.index("AI 초보 탐험가"),
+        "beginner_options": [knowledge_options.index(level) for level in BEGINNER_LEVELS],
+        "options": {
+            "ai_knowledge": knowledge_options,
+            "job": job_options,
+            "tool_interest": interest_options,
+            "specific_purpose": purpose_options,
+            "preferred_difficulty": preference_options,
+        },
+        "type_points": {
+            "ai_knowledge": points_table(KNOWLEDGE_POINTS, knowledge_options),
+            "job": points_table(JOB_POINTS, job_options),
+            "tool_interest": points_table(INTEREST_POINTS, interest_options),
+            "specific_purpose": points_table(PURPOSE_POINTS, purpose_options),
+        },
+        "tool_points": {
+            "preferred_difficulty": preference_scores,
+            "ai_knowledge": knowledge_scores,
+            "job": category_table(JOB_CATEGORY_MAP, job_options, categories, 5),
+            "tool_interest": category_table(INTEREST_CATEGORY_MAP, interest_options, categories, 4),
+            "specific_purpose": category_table(PURPOSE_CATEGORY_MAP, purpose_options, categories, 4),
+        },
+    }
+
+#========== 응답 인코딩 ==========
+def parse_multi(value):
+    """여러 개 선택 응답을 리스트로 변환"""
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return list(value)
+    if value is None or (isinstance(value, float) and np.isnan(value)) or value == "":
+        return []
+    value = str(value)
+    if value.startswith("["):
+        return json.loads(value)
+    return [item.strip() for item in value.split(";") if item.strip()]
+
+def encode_single(series, options, default=""):
+    """단일 선택 응답 → 옵션 인덱스 (알 수 없는 응답은 마지막 0 행)"""
+    index = {option: i for i, option in enumerate(options)}
+    return series.fillna(default).map(lambda v: index.get(v, len(options))).to_numpy()
+
+def encode_multi(series, options):
+    """여러 개 선택 응답 → 행별 옵션 선택 횟수 행렬"""
+    index = {option: i for i, option in enumerate(options)}
+    counts = np.zeros((len(series), len(options) + 1), dtype=np.int32)
+    for row, value in enumerate(series):
+        for option in parse_multi(value):
+            counts[row, index.get(option, len(options))] += 1
+    return counts
+
+#========== 청크 점수 계산 ==========
+def _init_worker(tools):
+    global _tables
+    _tables = build_tables(tools)
+
+def score_chunk(chunk, top_k=3, tables=None):
+    """응답 청크 하나의 유형과 상위 추천 도구를 행렬 연산으로 계산"""
+    tables = tables or _tables
+    options = tables["options"]
+    n = len(chunk)
+
+    def column(key):
+        return chunk[key] if key in chunk else pd.Series([None] * n, index=chunk.index)
+
+    knowledge = encode_single(column("ai_knowledge"), options["ai_knowledge"])
+    job = encode_single(column("job"), options["job"])
+    preference = encode_single(column("preferred_difficulty"), options["preferred_difficulty"], DEFAULT_PREFERENCE)
+    interests = encode_multi(column("tool_interest"), options["tool_interest"])
+    purposes = encode_multi(column("specific_purpose"), options["specific_purpose"])
+
+    # 사용자 유형: 응답별 점수 합산 후 최고점 (동점이면 USER_TYPES 순서상 앞 유형)
+    type_points = tables["type_points"]
+    points = (type_points["ai_knowledge"][knowledge] + type_points["job"][job]
+              + interests @ type_points["tool_interest"] + purposes @ type_points["specific_purpose"])
+    beginner_rows = np.isin(knowledge, tables["beginner_options"])
+    points[beginner_rows, tables["beginner_index"]] = points[beginner_rows].max(axis=1) + 5
+    user_types = np.array(USER_TYPES, dtype=object)[points.argmax(axis=1)]
+
+    # 도구 점수: recommend_tools_by_criteria와 같은 기준
+    tool_points = tables["tool_points"]
+    scores = (tool_points["preferred_difficulty"][preference] + tool_points["ai_knowledge"][knowledge]
+              + tool_points["job"][job] + interests @ tool_points["tool_interest"]
+              + purposes @ tool_points["specific_purpose"] + tables["description_bonus"])
+
+    # 점수 내림차순 (동점은 카탈로그 순서 유지)
+    order = np.argsort(-scores, axis=1, kind="stable")
+    top = order[:, :top_k].copy()
+
+    # 상위 목록에 쉬운 도구가 없으면 마지막 자리를 다음 순위의 쉬운 도구로 교체
+    low_in_order = tables["is_low"][order]
+    needs_easy = ~low_in_order[:, :top_k].any(axis=1) & low_in_order[:, top_k:].any(axis=1)
+    if needs_easy.any():
+        rows = np.nonzero(needs_easy)[0]
+        replacement = top_k + low_in_order[rows, top_k:].argmax(axis=1)
+        top[rows, -1] = order[rows, replacement]
+
+    rows = np.arange(n)[:, None]
+    top_scores = scores[rows, top]
+    result = pd.DataFrame({
+        "id": chunk["id"].to_numpy() if "id" in chunk else chunk.index.to_numpy(),
+        "user_type": user_types,
+    })
+    for i in range(top.shape[1]):
+        result[f"tool_{i + 1}"] = tables["tool_names"][top[:, i]]
+        result[f"score_{i + 1}"] = top_scores[:, i]
+    return result
+
+#========== 입출력 ==========
+def read_chunks(path, chunksize):
+    """CSV/JSONL 입력을 청크 단위로 스트리밍"""
+    if path.endswith((".jsonl", ".ndjson", ".json")):
+        return pd.read_json(path, lines=True, chunksize=chunksize, dtype=False)
+    return pd.read_csv(path, chunksize=chunksize, dtype=str)
+
+class ResultWriter:
+    """청크 결과를 CSV 또는 Parquet 파일에 이어서 기록"""
+
+    def __init__(self, path):
+        self.path = path
+        self.parquet = path.endswith(".parquet")
+        self._writer = None
+        self._first = True
+
+    def write(self, df):
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        else:
+            df.to_csv(self.path, mode="w" if self._first else "a", header=self._first, index=False)
+        self._first = False
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+def run(input_path, output_path, tools, chunksize, workers, top_k):
+    """입력 전체를 점수화하고 처리한 행 수 반환"""
+    writer = ResultWriter(output_path)
+    pending = []
+    total = 0
+    start = time.perf_counter()
+
+    def drain(limit):
+        nonlocal total
+        # 입력 순서대로 기록하고, 진행 중인 청크 수를 제한해 메모리를 일정하게 유지
+        while len(pending) > limit:
+            result = pending.pop(0).result()
+            writer.write(result)
+            total += len(result)
+            print(f"  {total:,}행 처리 ({total / (time.perf_counter() - start):,.0f}행/초)")
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(tools,)) as executor:
+            for chunk in read_chunks(input_path, chunksize):
+                pending.append(executor.submit(score_chunk, chunk, top_k))
+                drain(workers * 2)
+            drain(0)
+    finally:
+        writer.close()
+    return total
+
+def main():
+    parser = argparse.ArgumentParser(description="설문 응답 대량 점수화")
+    parser.add_argument("input", help="입력 CSV 또는 JSONL")
+    parser.add_argument("output", help="출력 .csv 또는 .parquet")
+    parser.add_argument("--tools", default="tools.json")
+    parser.add_argument("--chunksize", type=int, default=20000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--top-k", type=int, default=3)
+    args = parser.parse_args()
+
+    tools = load_json_data(args.tools)
+    total = run(args.input, args.output, tools, args.chunksize, args.workers, args.top_k)
+    print(f"✅ {total:,}행 점수화 완료: {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+# benchmark.py
+# 검색/추천/카탈로그 핫패스 벤치마크 (OpenAI 호출 없이 로컬 임베딩/LLM 사용)
+#
+# 사용법:
+#   python benchmark.py                                  # 결과를 bench_results.json에 저장
+#   python benchmark.py --baseline old.json --threshold 0.2   # 20% 이상 느려지면 종료 코드 1
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from catalog import SORT_COLUMNS, build_catalog_table, filter_catalog, get_page, list_categories, sort_catalog
+from feedback import save_user_feedback
+from ingest import SPLIT_STRATEGY, ensure_index, load_index, parse_source
+from local_models import FakeLLM, HashingEmbeddings
+from rag import DEFAULT_CHUNK_SIZES, build_qa_chain, run_qa
+from recommend import load_json_data, recommend_tools_by_criteria
+from survey import random_survey_responses
+from user_type import determine_user_type
+
+DIFFICULTIES = ["low", "medium", "hard", None]
+
+#========== 측정 도구 ==========
+def measure(fn, repeat):
+    """fn을 repeat번 실행하고 지연 시간 통계(ms) 반환"""
+    timings = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        fn(i)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        "repeat": repeat,
+        "mean_ms": statistics.mean(timings),
+        "min_ms": timings[0],
+        "p50_ms": timings[len(timings) // 2],
+        "p95_ms": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+    }
+
+#========== 입력 데이터 생성 ==========
+def make_synthetic_catalog(base_tools, size, rng):
+    """실제 카탈로그의 카테고리 분포를 따르는 합성 카탈로그 생성"""
+    categories = [tool.get("category") for tool in base_tools]
+    descriptions = [tool.get("description") for tool in base_tools]
+    return [{
+        "name": f"Synthetic Tool {i}",
+        "category": rng.choice(categories),
+        "difficulty": rng.choice(DIFFICULTIES),
+        "description": rng.choice(descriptions),
+    } for i in range(size)]
+
+#========== 벤치마크 ==========
+def bench_document_pipeline(results, repeat, pdf_path):
+    """PDF 로드 → 분할 → 정제 파이프라인 (운영 분할 방식 SPLIT_STRATEGY, ingest와 같은 청크 설정)"""
+    chunk_size = DEFAULT_CHUNK_SIZES[SPLIT_STRATEGY]
+    chunk_overlap = 0 if SPLIT_STRATEGY == "tool" else 200
+    results[f"pdf_parse_{SPLIT_STRATEGY}"] = measure(
+        lambda _: parse_source(pdf_path, chunk_size, chunk_overlap, SPLIT_STRATEGY), repeat
+    )
+
+def bench_vectorstore(results, repeat, pdf_path, embeddings):
+    """ensure_index 구축 vs 저장된 인덱스 로드, k별 similarity_search 지연"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # 매번 빈 디렉터리에 새로 구축 (manifest가 없으므로 분할·임베딩·저장 전체 실행)
+        results["index_build"] = measure(
+            lambda i: ensure_index([pdf_path], embeddings, os.path.join(tmp_dir, f"build_{i}")), repeat
+        )
+        index_dir = os.path.join(tmp_dir, "build_0")
+        results["index_ensure_cached"] = measure(lambda _: ensure_index([pdf_path], embeddings, index_dir), repeat)
+        results["index_load"] = measure(lambda _: load_index(embeddings, index_dir), repeat)
+        vectorstore, _ = load_index(embeddings, index_dir)
+
+    queries = ["ChatGPT 주요 기능", "best AI image generator", "meeting notetaker pricing",
+               "AI resume builder", "code editor with AI", "voice cloning"]
+    for k in (3, 5, 7):
+        results[f"similarity_search_k{k}"] = measure(
+            lambda i, k=k: vectorstore.similarity_search(queries[i % len(queries)], k=k),
+            repeat * 10
+        )
+
+    # 고정 응답 LLM으로 RetrievalQA 체인 자체의 오버헤드 측정
+    qa = build_qa_chain(FakeLLM(), vectorstore, {"k": 5})
+    results["qa_run_fake_llm"] = measure(lambda i: run_qa(qa, queries[i % len(queries)]), repeat * 5)
+
+def bench_catalog(results, prefix, tools, repeat, rng):
+    """추천, 유형 판별, 필터 체인"""
+    survey_samples = [random_survey_responses(rng) for _ in range(max(repeat, 1))]
+
+    results[f"{prefix}determine_user_type"] = measure(
+        lambda i: determine_user_type(survey_samples[i % len(survey_samples)]), repeat * 10
+    )
+    results[f"{prefix}recommend_tools_by_criteria"] = measure(
+        lambda i: recommend_tools_by_criteria(tools, survey_samples[i % len(survey_samples)], 3), repeat
+    )
+
+    # 도구 탐색 화면과 같은 경로: Arrow 테이블 필터 → 정렬 → 한 페이지만 변환
+    results[f"{prefix}build_catalog_table"] = measure(lambda _: build_catalog_table(tools), repeat)
+    table = build_catalog_table(tools)
+    categories = list_categories(table)
+    difficulties = ["모든 난이도", "쉬움", "중간", "어려움"]
+    search_terms = ["", "ai", "chat", "이미지"]
+    sort_columns = list(SORT_COLUMNS)
+
+    def filter_chain(i):
+        filtered = filter_catalog(table, difficulties[i % len(difficulties)], categories[i % len(categories)],
+                                  search_terms[i % len(search_terms)])
+        return get_page(sort_catalog(filtered, sort_columns[i % len(sort_columns)]), 1, 50)
+    results[f"{prefix}filter_chain"] = measure(filter_chain, repeat * 5)
+
+def bench_feedback(results, repeat, existing_records, rng):
+    """대용량 기존 파일이 있을 때 save_user_feedback"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "user_feedback.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            for _ in range(existing_records):
+                f.write(json.dumps({"tool": "ChatGPT", "rating": rng.randint(1, 5), "feedback": "좋아요",
+                                    "responses": random_survey_responses(rng)}, ensure_ascii=True) + "\n")
+        responses = random_survey_responses(rng)
+        results[f"save_user_feedback_{existing_records}"] = measure(
+            lambda _: save_user_feedback("ChatGPT", 5, "벤치마크", responses, path=path), repeat
+        )
+
+#========== 회귀 비교 ==========
+def compare_with_baseline(results, baseline_path, threshold):
+    """기준 결과보다 mean_ms가 threshold 비율 이상 늘어난 항목 반환"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+
+    regressions = []
+    for name, stats in results.items():
+        if name not in baseline or baseline[name]["mean_ms"] <= 0:
+            continue
+        ratio = stats["mean_ms"] / baseline[name]["mean_ms"]
+        if ratio > 1 + threshold:
+            regressions.append((name, baseline[name]["mean_ms"], stats["mean_ms"], ratio))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="AI 도구 추천 핫패스 벤치마크")
+    parser.add_argument("--output", default="bench_results.json", help="결과 JSON 경로")
+    parser.add_argument("--baseline", help="회귀 비교에 사용할 이전 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=0.2, help="허용 지연 증가 비율 (기본 0.2 = 20%%)")
+    parser.add_argument("--repeat", type=int, default=5, help="기본 반복 횟수")
+    parser.add_argument("--sizes", default="10000,100000", help="합성 카탈로그 크기 (쉼표 구분)")
+    parser.add_argument("--feedback-records", type=int, default=10000, help="기존 피드백 파일 레코드 수")
+    parser.add_argument("--pdf", default="tools.pdf")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    embeddings = HashingEmbeddings()
+    results = {}
+
+    print("📄 문서 파이프라인 / FAISS 벤치마크...")
+    bench_document_pipeline(results, args.repeat, args.pdf)
+    bench_vectorstore(results, args.repeat, args.pdf, embeddings)
+
+    print("🔎 카탈로그 벤치마크 (tools.json)...")
+    tools = load_json_data()
+    bench_catalog(results, "", tools, args.repeat * 20, rng)
+
+    for size in [int(s) for s in args.sizes.split(",") if s]:
+        print(f"🔎 카탈로그 벤치마크 (합성 {size}개)...")
+        synthetic = make_synthetic_catalog(tools, size, rng)
+        bench_catalog(results, f"synthetic_{size}_", synthetic, args.repeat, rng)
+
+    print("📝 피드백 저장 벤치마크...")
+    bench_feedback(results, args.repeat, args.feedback_records, rng)
+
+    output = {
+        "meta": {
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(output, f, ensure_ascii=False, indent=2)
+
+    for name, stats in results.items():
+        print(f"{name:50s} mean {stats['mean_ms']:10.3f} ms  p95 {stats['p95_ms']:10.3f} ms")
+    print(f"✅ 결과 저장: {args.output}")
+
+    if args.baseline:
+        regressions = compare_with_baseline(results, args.baseline, args.threshold)
+        if regressions:
+            print("❌ 성능 회귀 발견:")
+            for name, before, after, ratio in regressions:
+                print(f"  {name}: {before:.3f} ms → {after:.3f} ms (x{ratio:.2f})")
+            sys.exit(1)
+        print("✅ 기준 대비 성능 회귀 없음")
+
+if __name__ == "__main__":
+    main()
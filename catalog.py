@@ -0,0 +1,94 @@
+# catalog.py
+# 도구 카탈로그 탐색용 Arrow 테이블
+#   - 카탈로그를 한 번 Arrow 테이블로 만들고 필터/정렬/페이지 나누기를 서버에서 벡터 연산으로 처리
+#   - 필터 의미는 recommend.py의 filter_tools_by_* 함수와 같음 (난이도 정보 없음 = 중간)
+#   - 이름 자동 완성은 일치하는 상위 몇 개만 반환
+# 화면에는 한 페이지 분량의 행만 전달하므로 카탈로그가 수만 개여도 재실행 비용이 일정함
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from recommend import translate_difficulty
+
+DIFFICULTY_LEVELS = {"쉬움": "low", "중간": "medium", "어려움": "hard"}
+
+# 화면 열 이름 → 정렬에 쓰는 테이블 열
+SORT_COLUMNS = {"이름": "name_lower", "카테고리": "category", "난이도": "difficulty_rank"}
+DIFFICULTY_RANK = {"low": 0, "medium": 1, "hard": 2}
+
+#========== 테이블 구성 ==========
+def build_catalog_table(tools):
+    """도구 목록을 탐색용 Arrow 테이블로 변환 (row는 원래 목록의 위치)"""
+    difficulties = [tool.get("difficulty") for tool in tools]
+    return pa.table({
+        "row": pa.array(range(len(tools)), pa.int64()),
+        "name": [tool.get("name", "") for tool in tools],
+        "name_lower": [tool.get("name", "").lower() for tool in tools],
+        "category": [tool.get("category") for tool in tools],
+        "difficulty": difficulties,
+        "difficulty_rank": pa.array([DIFFICULTY_RANK.get(d or "medium", 1) for d in difficulties], pa.int8()),
+        "description_lower": [(tool.get("description") or "").lower() for tool in tools],
+    })
+
+def list_categories(table):
+    """필터 선택지용 카테고리 목록 (가나다순)"""
+    return sorted(category for category in pc.unique(table["category"]).to_pylist() if category)
+
+#========== 필터 / 정렬 / 페이지 ==========
+def filter_catalog(table, difficulty_level="모든 난이도", category="모든 카테고리", search_term=""):
+    """난이도, 카테고리, 검색어(이름 또는 설명, 대소문자 무시)로 필터링"""
+    mask = None
+
+    def combine(condition):
+        return condition if mask is None else pc.and_(mask, condition)
+
+    target = DIFFICULTY_LEVELS.get(difficulty_level)
+    if target:
+        condition = pc.equal(table["difficulty"], target)
+        if target == "medium":
+            # None 난이도는 중간 난이도로 간주
+            condition = pc.or_kleene(condition, pc.is_null(table["difficulty"]))
+        mask = combine(pc.fill_null(condition, False))
+
+    if category != "모든 카테고리":
+        mask = combine(pc.fill_null(pc.equal(table["category"], category), False))
+
+    if search_term:
+        term = search_term.lower()
+        mask = combine(pc.or_(pc.match_substring(table["name_lower"], term),
+                              pc.match_substring(table["description_lower"], term)))
+
+    return table if mask is None else table.filter(mask)
+
+def sort_catalog(table, sort_by="이름", descending=False):
+    """화면 열 기준 정렬 (같은 값은 이름순)"""
+    order = "descending" if descending else "ascending"
+    keys = [(SORT_COLUMNS[sort_by], order)]
+    if sort_by != "이름":
+        keys.append(("name_lower", "ascending"))
+    return table.sort_by(keys)
+
+def page_count(table, page_size):
+    return max(1, (table.num_rows + page_size - 1) // page_size)
+
+def get_page(table, page, page_size):
+    """1부터 시작하는 페이지 번호의 화면용 행 목록"""
+    rows = table.slice((page - 1) * page_size, page_size).select(["name", "category", "difficulty"]).to_pylist()
+    return [{
+        "이름": row["name"],
+        "카테고리": row["category"] or "",
+        "난이도": translate_difficulty(row["difficulty"] or "medium"),
+    } for row in rows]
+
+#========== 자동 완성 ==========
+def suggest_names(table, query, limit=20):
+    """입력한 글자로 시작하는 이름을 먼저, 그다음 포함하는 이름 순으로 최대 limit개"""
+    if not query:
+        return []
+    query = query.lower()
+    starts = table.filter(pc.starts_with(table["name_lower"], query))["name"].to_pylist()
+    if len(starts) >= limit:
+        return starts[:limit]
+    contains = table.filter(pc.match_substring(table["name_lower"], query))["name"].to_pylist()
+    seen = set(starts)
+    return (starts + [name for name in contains if name not in seen])[:limit]
@@ -0,0 +1,237 @@
+# evaluate.py
+# 검색 품질(recall@k, MRR)과 지연/토큰 비용을 함께 비교하는 오프라인 평가 도구
+#
+# 사용법:
+#   python evaluate.py                         # 로컬 임베딩으로 전체 설정 그리드 평가
+#   python evaluate.py --min-recall 0.8        # 품질 기준을 만족하는 가장 저렴한 설정 표시
+#   python evaluate.py --splitters tool --chunk-sizes 1000,2000   # 도구 제목 기준 분할만 평가
+
+import argparse
+import json
+import re
+import statistics
+import time
+
+import pandas as pd
+
+from rag import build_vectorstore, clean_documents, get_embeddings, load_pdf_pages, split_documents
+from tool_splitter import TOOL_HEADING_PATTERN, name_key, normalize_line
+
+QUESTION_TEMPLATES = [
+    "{name} 주요 기능",
+    "{name}의 가격은 얼마인가요?",
+    "What can {name} do?",
+]
+
+#========== 정답 세트 ==========
+def build_gold_set(text_path="tools.txt", pages=None):
+    """tools.txt의 도구 제목으로 (질문, 정답 도구, 정답 페이지) 세트 생성"""
+    with open(text_path, "r", encoding="utf-8-sig") as f:
+        # 원문에 섞인 줄바꿈 없는 공백(\xa0)을 일반 공백으로 통일
+        lines = [line.replace("\xa0", " ").strip() for line in f]
+
+    tool_names = []
+    for line in lines:
+        match = TOOL_HEADING_PATTERN.match(line)
+        if match:
+            tool_names.append(match.group(2).strip())
+
+    sections = find_tool_sections(tool_names, pages) if pages else {}
+    gold = []
+    for name in tool_names:
+        expected_pages = sections.get(name, [])
+        for template in QUESTION_TEMPLATES:
+            gold.append({
+                "question": template.format(name=name),
+                "expected_tool": name,
+                "expected_page": expected_pages[0] if expected_pages else None,
+                "expected_pages": expected_pages,
+            })
+    return gold
+
+def normalize_for_match(text):
+    """대소문자와 공백 차이를 무시하도록 정규화 (정제 과정에서 \xa0가 제거되기 때문)"""
+    return re.sub(r"\s+", "", text.lower())
+
+def is_heading_line(line, tool_name):
+    """도구 이름만 있는 제목 줄인지 (목차의 "• 분류: 도구, 도구" 줄은 제외)"""
+    return name_key(normalize_line(line)) == name_key(tool_name)
+
+def find_tool_sections(tool_names, pages):
+    """
+    도구 이름 → 도구 본문이 걸친 PDF 페이지 목록 (0부터 시작)
+    목차(1페이지)에 거의 모든 도구 이름이 나오므로 첫 등장 위치가 아니라 도구 제목 줄의 위치를 기준으로,
+    제목 페이지부터 다음 도구 제목 페이지까지를 본문으로 봄 (제목을 찾지 못한 도구는 빠짐)
+    """
+    starts = {}
+    for page in pages:
+        for line in page.page_content.split("\n"):
+            for name in tool_names:
+                if name not in starts and is_heading_line(line, name):
+                    starts[name] = page.metadata.get("page")
+    ordered = sorted(starts.items(), key=lambda item: item[1])
+    last_page = max(page.metadata.get("page") for page in pages)
+    sections = {}
+    for i, (name, start) in enumerate(ordered):
+        end = ordered[i + 1][1] if i + 1 < len(ordered) else last_page
+        sections[name] = list(range(start, end + 1))
+    return sections
+
+#========== 지표 계산 ==========
+def count_tokens(text, encoding=None):
+    """tiktoken으로 토큰 수 계산 (인코딩이 없으면 4글자 = 1토큰으로 근사)"""
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return len(text) // 4
+
+def get_token_encoding():
+    """tiktoken 인코딩 로드 (오프라인 환경에서 실패하면 None)"""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+def is_relevant(doc, item, gold_tools):
+    """
+    검색된 청크가 정답 도구의 본문인지 여부
+      - 도구 메타데이터가 있는 청크(tool 분할)는 메타데이터의 도구가 정답 도구인지로 판단
+      - 그 밖의 청크는 정답 도구 본문 페이지에 있고 도구 이름을 언급해야 하며,
+        다른 정답 도구도 언급하는 청크(목차, 도구 경계)는 정답 도구의 제목 줄을 포함할 때만 인정
+    """
+    expected = item["expected_tool"]
+    if doc.metadata.get("tool"):
+        return name_key(doc.metadata["tool"]) == name_key(expected)
+
+    if item.get("expected_pages") and doc.metadata.get("page") not in item["expected_pages"]:
+        return False
+    content = normalize_for_match(doc.page_content)
+    if normalize_for_match(expected) not in content:
+        return False
+    others = [name for name in gold_tools if name != expected and normalize_for_match(name) in content]
+    return not others or any(is_heading_line(line, expected) for line in doc.page_content.split("\n"))
+
+def evaluate_config(vectorstore, gold, k, retriever_type, encoding):
+    """하나의 검색 설정에 대해 품질/지연/토큰 지표 계산"""
+    search_kwargs = {"k": k}
+    if retriever_type == "mmr":
+        search_kwargs["fetch_k"] = k * 4
+    retriever = vectorstore.as_retriever(search_type=retriever_type, search_kwargs=search_kwargs)
+
+    gold_tools = sorted({item["expected_tool"] for item in gold})
+    hits, reciprocal_ranks, page_hits, latencies, tokens = [], [], [], [], []
+    for item in gold:
+        start = time.perf_counter()
+        docs = retriever.invoke(item["question"])
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        rank = next((i + 1 for i, doc in enumerate(docs) if is_relevant(doc, item, gold_tools)), None)
+        hits.append(1 if rank else 0)
+        reciprocal_ranks.append(1 / rank if rank else 0)
+        if item["expected_pages"]:
+            page_hits.append(1 if any(doc.metadata.get("page") in item["expected_pages"] for doc in docs) else 0)
+        tokens.append(sum(count_tokens(doc.page_content, encoding) for doc in docs))
+
+    latencies.sort()
+    return {
+        "recall@k": statistics.mean(hits),
+        "mrr": statistics.mean(reciprocal_ranks),
+        "page_recall@k": statistics.mean(page_hits) if page_hits else None,
+        "latency_ms": statistics.mean(latencies),
+        "p95_latency_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        "context_tokens": statistics.mean(tokens),
+    }
+
+#========== 파레토 분석 ==========
+def pareto_front(df):
+    """품질(recall, MRR)은 높고 비용(지연, 토큰)은 낮은 비지배 설정 표시"""
+    better = ["recall@k", "mrr"]
+    cheaper = ["latency_ms", "context_tokens"]
+    flags = []
+    for i, row in df.iterrows():
+        dominated = False
+        for j, other in df.iterrows():
+            if i == j:
+                continue
+            no_worse = all(other[c] >= row[c] for c in better) and all(other[c] <= row[c] for c in cheaper)
+            strictly = any(other[c] > row[c] for c in better) or any(other[c] < row[c] for c in cheaper)
+            if no_worse and strictly:
+                dominated = True
+                break
+        flags.append(not dominated)
+    return df.assign(pareto=flags)
+
+def main():
+    parser = argparse.ArgumentParser(description="검색 설정별 품질/비용 평가")
+    parser.add_argument("--pdf", default="tools.pdf")
+    parser.add_argument("--text", default="tools.txt", help="정답 세트를 만들 원문")
+    parser.add_argument("--backend", default="local", help="임베딩 백엔드 (local 또는 openai)")
+    parser.add_argument("--splitters", default="recursive,tool", help="분할 방식 (recursive, tool)")
+    parser.add_argument("--chunk-sizes", default="500,1000,1500")
+    parser.add_argument("--chunk-overlaps", default="0,200")
+    parser.add_argument("--ks", default="3,5,7")
+    parser.add_argument("--retrievers", default="similarity,mmr")
+    parser.add_argument("--min-recall", type=float, help="이 recall@k 이상인 설정 중 가장 저렴한 설정 선택")
+    parser.add_argument("--output", default="eval_results.csv")
+    parser.add_argument("--save-gold", help="생성한 정답 세트를 JSON으로 저장")
+    args = parser.parse_args()
+
+    embeddings = get_embeddings(args.backend)
+    encoding = get_token_encoding()
+    pages = load_pdf_pages(args.pdf)
+    gold = build_gold_set(args.text, pages)
+    print(f"📋 정답 세트: {len(gold)}개 질문")
+    if args.save_gold:
+        with open(args.save_gold, "w", encoding="utf-8") as f:
+            json.dump(gold, f, ensure_ascii=False, indent=2)
+
+    rows = []
+    for splitter in args.splitters.split(","):
+        # 도구 제목 기준 분할은 청크가 도구 경계를 넘지 않으므로 겹침 없이 한 번만 평가
+        overlaps = [0] if splitter == "tool" else [int(v) for v in args.chunk_overlaps.split(",")]
+        for chunk_size in [int(v) for v in args.chunk_sizes.split(",")]:
+            for chunk_overlap in overlaps:
+                if chunk_overlap >= chunk_size:
+                    continue
+                docs = clean_documents(split_documents(pages, chunk_size=chunk_size, chunk_overlap=chunk_overlap,
+                                                       strategy=splitter))
+                start = time.perf_counter()
+                vectorstore = build_vectorstore(docs, embeddings)
+                build_seconds = time.perf_counter() - start
+
+                for k in [int(v) for v in args.ks.split(",")]:
+                    for retriever_type in args.retrievers.split(","):
+                        metrics = evaluate_config(vectorstore, gold, k, retriever_type, encoding)
+                        rows.append({
+                            "splitter": splitter,
+                            "chunk_size": chunk_size,
+                            "chunk_overlap": chunk_overlap,
+                            "k": k,
+                            "retriever": retriever_type,
+                            "vectors": len(docs),
+                            "build_s": build_seconds,
+                            **metrics,
+                        })
+                        print(f"  {splitter} chunk={chunk_size}/{chunk_overlap} k={k} {retriever_type}: "
+                              f"recall {metrics['recall@k']:.3f}, MRR {metrics['mrr']:.3f}")
+
+    df = pareto_front(pd.DataFrame(rows))
+    df = df.sort_values(["pareto", "recall@k", "context_tokens"], ascending=[False, False, True])
+    df.to_csv(args.output, index=False)
+
+    print("\n📊 파레토 최적 설정")
+    print(df[df["pareto"]].to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+    print(f"\n✅ 전체 결과 저장: {args.output}")
+
+    if args.min_recall is not None:
+        candidates = df[df["recall@k"] >= args.min_recall].sort_values(["context_tokens", "latency_ms"])
+        if candidates.empty:
+            print(f"⚠️ recall@k {args.min_recall} 이상인 설정이 없습니다.")
+        else:
+            best = candidates.iloc[0]
+            print(f"🏆 기준을 만족하는 가장 저렴한 설정: {best['splitter']} chunk={best['chunk_size']}/{best['chunk_overlap']}, "
+                  f"k={best['k']}, retriever={best['retriever']} "
+                  f"(recall {best['recall@k']:.3f}, 토큰 {best['context_tokens']:.0f})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+# feedback.py
+
+import copy
+import json
+import os
+import tempfile
+import threading
+import streamlit as st
+
+from user_type import determine_user_type
+
+FEEDBACK_FILE = "user_feedback.jsonl"  # 한 줄에 피드백 하나 (제출마다 끝에 추가)
+LEGACY_FEEDBACK_FILE = "user_feedback.json"  # 이전 형식 (전체 JSON 배열)
+FEEDBACK_STATS_FILE = "feedback_stats.json"
+
+# 같은 프로세스의 여러 세션이 피드백 파일을 동시에 읽고 쓰지 않도록 보호
+_feedback_lock = threading.Lock()
+
+#========== 평점 집계 ==========
+class FeedbackAggregates:
+    """
+    도구별, (사용자 유형, 도구)별 평점 누적 통계
+    제출마다 O(1)로 갱신하고 주기적으로 스냅샷을 저장해 시작 시 바로 불러옴
+    스냅샷에는 반영한 피드백 기록 수(records)와 피드백 파일의 바이트 위치(offset)를 함께 저장해,
+    시작 시 그 위치로 바로 이동해 이후에 추가된 줄만 다시 반영함
+    """
+
+    def __init__(self, prior_weight=5, snapshot_path=FEEDBACK_STATS_FILE, snapshot_every=10):
+        self.prior_weight = prior_weight  # 베이지안 평활에 쓰는 가상 평점 수
+        self.snapshot_path = snapshot_path
+        self.snapshot_every = snapshot_every
+        self.total = [0, 0]  # [평점 수, 평점 합]
+        self.tools = {}  # 도구 → [평점 수, 평점 합]
+        self.type_tools = {}  # 사용자 유형 → 도구 → [평점 수, 평점 합]
+        self.records = 0  # 집계에 반영한 피드백 파일 기록 수
+        self.offset = 0  # 집계에 반영한 마지막 기록이 끝나는 피드백 파일 바이트 위치
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()  # 스냅샷 파일 쓰기를 한 번에 하나씩 (오래된 스냅샷이 덮어쓰지 않도록)
+
+    def _add(self, tool_name, rating, responses, offset=None):
+        user_type = determine_user_type(responses or {})
+        with self._lock:
+            for stats in (self.total,
+                          self.tools.setdefault(tool_name, [0, 0]),
+                          self.type_tools.setdefault(user_type, {}).setdefault(tool_name, [0, 0])):
+                stats[0] += 1
+                stats[1] += rating
+            self.records += 1
+            if offset is not None:
+                self.offset = offset
+            self._pending += 1
+            if self._pending < self.snapshot_every:
+                return False
+            # 스냅샷 저장을 이 호출이 맡음 (동시에 기준을 넘은 다른 스레드가 중복 저장하지 않도록 바로 초기화)
+            self._pending = 0
+            return True
+
+    def record(self, tool_name, rating, responses, offset=None):
+        """피드백 한 건 반영 (파일 재탐색 없음, offset은 이 기록이 끝나는 피드백 파일 위치)"""
+        if self._add(tool_name, rating, responses, offset) and self.snapshot_path:
+            self.save_snapshot()
+
+    def global_mean(self):
+        """전체 평균 평점 (피드백이 없으면 중간값 3점)"""
+        count, total = self.total
+        return total / count if count else 3.0
+
+    def _smoothed(self, stats, prior_mean):
+        count, total = stats
+        return (self.prior_weight * prior_mean + total) / (self.prior_weight + count)
+
+    def tool_stats(self, tool_name, user_type=None):
+        """도구의 평점 수, 평균, 평활 점수"""
+        with self._lock:
+            stats = self.tools.get(tool_name, [0, 0])
+            smoothed = self._smoothed(stats, self.global_mean())
+            if user_type:
+                # 유형별 평점은 도구 전체 평활 점수를 사전값으로 한 번 더 평활
+                stats = self.type_tools.get(user_type, {}).get(tool_name, [0, 0])
+                smoothed = self._smoothed(stats, smoothed)
+            count, total = stats
+            return {"count": count, "mean": total / count if count else None, "smoothed": smoothed}
+
+    def ranking_signal(self, user_type=None):
+        """추천 점수에 더할 도구별 신호 (평활 점수 - 전체 평균)"""
+        with self._lock:
+            tool_names = set(self.tools)
+        mean = self.global_mean()
+        return {name: self.tool_stats(name, user_type)["smoothed"] - mean for name in tool_names}
+
+    def save_snapshot(self, path=None):
+        """집계 스냅샷을 원자적으로 저장"""
+        path = path or self.snapshot_path
+        with self._save_lock:
+            # 집계 잠금은 복사하는 동안만 잡음 (파일을 쓰는 동안에도 평점 반영 가능)
+            with self._lock:
+                data = copy.deepcopy({"total": self.total, "tools": self.tools, "type_tools": self.type_tools,
+                                      "records": self.records, "offset": self.offset})
+                self._pending = 0
+            fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path), suffix=".tmp",
+                                            dir=os.path.dirname(os.path.abspath(path)))
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(tmp_path, path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+    def load_snapshot(self, path=None):
+        """저장된 스냅샷 불러오기 (없거나 파일 위치가 없는 이전 형식이면 False)"""
+        path = path or self.snapshot_path
+        if not os.path.exists(path):
+            return False
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if "offset" not in data:
+            return False
+        with self._lock:
+            self.total = data["total"]
+            self.tools = data["tools"]
+            self.type_tools = data["type_tools"]
+            self.records = data["records"]
+            self.offset = data["offset"]
+        return True
+
+def read_feedback_records(feedback_path=FEEDBACK_FILE, offset=0):
+    """
+    피드백 파일의 offset 이후 기록 목록과 마지막으로 읽은 줄이 끝나는 위치 (파일이 없으면 빈 목록)
+    줄바꿈으로 끝나지 않은 마지막 줄은 아직 쓰는 중일 수 있으므로 읽지 않음
+    """
+    records = []
+    if not os.path.exists(feedback_path):
+        return records, offset
+    with open(feedback_path, "rb") as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            offset += len(line)
+            if line.strip():
+                records.append(json.loads(line))
+    return records, offset
+
+def migrate_legacy_feedback(legacy_path=LEGACY_FEEDBACK_FILE, feedback_path=FEEDBACK_FILE):
+    """이전 형식(JSON 배열) 피드백 파일을 한 줄에 하나씩인 형식으로 한 번 변환"""
+    if not os.path.exists(legacy_path) or os.path.exists(feedback_path):
+        return False
+    try:
+        with open(legacy_path, "r", encoding="utf-8") as f:
+            records = json.load(f)
+    except UnicodeDecodeError:
+        with open(legacy_path, "r", encoding="latin-1") as f:
+            records = json.load(f)
+
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(feedback_path), suffix=".tmp",
+                                    dir=os.path.dirname(os.path.abspath(feedback_path)))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=True) + "\n")
+        os.replace(tmp_path, feedback_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return True
+
+def is_line_boundary(feedback_path, offset):
+    """offset이 피드백 파일의 줄 경계인지 (파일이 잘리거나 교체되면 스냅샷 위치가 맞지 않음)"""
+    size = os.path.getsize(feedback_path) if os.path.exists(feedback_path) else 0
+    if offset == 0:
+        return True
+    if offset > size:
+        return False
+    with open(feedback_path, "rb") as f:
+        f.seek(offset - 1)
+        return f.read(1) == b"\n"
+
+def load_feedback_aggregates(feedback_path=FEEDBACK_FILE, snapshot_path=FEEDBACK_STATS_FILE,
+                             legacy_path=LEGACY_FEEDBACK_FILE):
+    """스냅샷에서 집계를 불러오고 스냅샷 위치 이후에 추가된 피드백 줄만 다시 반영 (스냅샷이 없으면 전체 재구성)"""
+    migrate_legacy_feedback(legacy_path, feedback_path)
+    aggregates = FeedbackAggregates(snapshot_path=snapshot_path)
+    if not aggregates.load_snapshot() or not is_line_boundary(feedback_path, aggregates.offset):
+        # 스냅샷이 없거나 피드백 파일과 맞지 않으면 (파일 교체 등) 처음부터 다시 집계
+        aggregates = FeedbackAggregates(snapshot_path=snapshot_path)
+
+    replay, offset = read_feedback_records(feedback_path, aggregates.offset)
+    for record in replay:
+        aggregates._add(record["tool"], record["rating"], record.get("responses"))
+    aggregates.offset = offset
+    if replay:
+        aggregates.save_snapshot()
+    return aggregates
+
+#========== 피드백 저장 ==========
+def save_user_feedback(tool_name, rating, feedback_text, responses=None, path=FEEDBACK_FILE, aggregates=None):
+    """사용자 피드백 저장 (aggregates가 있으면 평점 집계도 갱신)"""
+    if responses is None:
+        responses = st.session_state.responses
+
+    feedback_data = {
+        "tool": tool_name,
+        "rating": rating,
+        "feedback": feedback_text,
+        "responses": responses
+    }
+
+    # 피드백 파일 끝에 한 줄 추가 (파일의 기록 순서와 집계에 반영한 순서가 같도록 같은 잠금 안에서 집계 갱신)
+    try:
+        with _feedback_lock:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(feedback_data, ensure_ascii=True) + "\n")
+                offset = f.tell()
+
+            if aggregates is not None:
+                aggregates.record(tool_name, rating, responses, offset)
+        return True
+    except Exception as e:
+        st.error(f"피드백 저장 중 오류 발생: {e}")
+        return False
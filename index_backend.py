@@ -0,0 +1,267 @@
+# index_backend.py
+# 대규모 문서용 압축 벡터 인덱스
+#   - faiss.index_factory 문자열로 인덱스 구조 선택: "Flat", "HNSW32,SQfp16", "IVF1024,SQ8", "IVF1024,PQ32" 등
+#   - 청크 본문과 메타데이터는 파이썬 객체 대신 메모리 매핑한 부속 파일(chunks.bin + offsets.npy)에 보관
+#   - 구축 시 정확 검색 대비 recall@k와 검색 지연 시간을 검색 파라미터별로 측정해 보고서로 저장
+#
+# ingest.py에서 --index-factory 옵션(또는 INDEX_FACTORY 환경 변수)을 주면 이 백엔드로 인덱스를 구축함
+
+import json
+import mmap
+import os
+import tempfile
+import time
+from typing import Any, Iterable, List, Optional
+
+import faiss
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+INDEX_FILE = "compact.faiss"
+CHUNKS_FILE = "chunks.bin"
+OFFSETS_FILE = "offsets.npy"
+REPORT_FILE = "index_report.json"
+TRAIN_SIZE = 20000  # 학습과 recall 측정용 질의 선택을 위해 처음에 모아 두는 벡터 수
+EVAL_QUERIES = 100  # recall 측정에 쓰는 질의 벡터 수
+EVAL_K = 10
+TARGET_RECALL = 0.95  # 기본 검색 파라미터는 이 recall을 넘는 가장 빠른 값으로 선택
+
+# 인덱스 종류별로 측정할 검색 파라미터 후보
+SEARCH_PARAM_CANDIDATES = {
+    "nprobe": [1, 2, 4, 8, 16, 32, 64, 128],
+    "efSearch": [16, 32, 64, 128, 256],
+}
+
+#========== 청크 부속 파일 ==========
+class ChunkStoreWriter:
+    """청크(본문 + 메타데이터)를 한 줄짜리 JSON으로 이어 쓰고 시작 위치를 기록"""
+
+    def __init__(self, index_dir):
+        self.index_dir = index_dir
+        os.makedirs(index_dir, exist_ok=True)
+        # 같은 디렉터리에 동시에 구축하는 다른 프로세스와 겹치지 않는 임시 파일에 씀
+        fd, self._tmp_path = tempfile.mkstemp(prefix=CHUNKS_FILE, suffix=".tmp", dir=index_dir)
+        self._file = os.fdopen(fd, "wb")
+        self._offsets = [0]
+
+    def add(self, texts, metadatas):
+        for text, metadata in zip(texts, metadatas):
+            record = json.dumps({"text": text, "metadata": metadata}, ensure_ascii=False).encode("utf-8")
+            self._file.write(record)
+            self._offsets.append(self._offsets[-1] + len(record))
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def close(self):
+        """파일을 닫고 임시 이름에서 실제 이름으로 교체"""
+        self._file.close()
+        fd, offsets_tmp_path = tempfile.mkstemp(prefix=OFFSETS_FILE, suffix=".tmp", dir=self.index_dir)
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, np.array(self._offsets, dtype=np.int64))
+        os.replace(offsets_tmp_path, os.path.join(self.index_dir, OFFSETS_FILE))
+        os.replace(self._tmp_path, os.path.join(self.index_dir, CHUNKS_FILE))
+
+class ChunkStore:
+    """메모리 매핑으로 필요한 청크만 읽는 읽기 전용 저장소"""
+
+    def __init__(self, index_dir):
+        self._offsets = np.load(os.path.join(index_dir, OFFSETS_FILE), mmap_mode="r")
+        self._file = open(os.path.join(index_dir, CHUNKS_FILE), "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def get(self, i):
+        record = json.loads(self._mmap[int(self._offsets[i]):int(self._offsets[i + 1])].decode("utf-8"))
+        return Document(page_content=record["text"], metadata=record["metadata"])
+
+#========== 검색 파라미터 ==========
+def search_param_name(index):
+    """인덱스 종류에 맞는 검색 파라미터 이름 (없으면 None)"""
+    try:
+        faiss.extract_index_ivf(index)
+        return "nprobe"
+    except RuntimeError:
+        pass
+    if "HNSW" in type(index).__name__:
+        return "efSearch"
+    return None
+
+def apply_search_params(index, params):
+    for name, value in (params or {}).items():
+        faiss.ParameterSpace().set_index_parameter(index, name, value)
+
+#========== 구축 ==========
+class CompactIndexBuilder:
+    """
+    배치 단위로 들어오는 임베딩을 압축 인덱스에 추가
+    처음 train_size개 벡터는 모아 두었다가 (필요하면) 학습과 recall 측정용 질의 선택에 쓰고,
+    정확 검색 정답은 배치마다 질의 벡터와의 거리를 누적해 계산하므로 전체 벡터를 메모리에 두지 않음
+    """
+
+    def __init__(self, index_dir, factory, train_size=TRAIN_SIZE, eval_queries=EVAL_QUERIES, eval_k=EVAL_K):
+        self.index_dir = index_dir
+        self.factory = factory
+        self.train_size = train_size
+        self.eval_queries = eval_queries
+        self.eval_k = eval_k
+        self.index = None
+        self._chunks = ChunkStoreWriter(index_dir)
+        self._buffer = []  # 학습 전까지 모아 두는 (벡터, 본문, 메타데이터) 배치
+        self._buffered = 0
+        self._queries = None
+        self._true_distances = None
+        self._true_ids = None
+
+    def add(self, texts, metadatas, vectors):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if self.index is None:
+            self.index = faiss.index_factory(vectors.shape[1], self.factory, faiss.METRIC_L2)
+        if self._queries is None:
+            # 학습과 recall 측정용 질의 선택이 끝날 때까지 모아 둠
+            self._buffer.append((vectors, texts, metadatas))
+            self._buffered += len(vectors)
+            if self._buffered >= self.train_size:
+                self._flush_buffer()
+            return
+        self._add(texts, metadatas, vectors)
+
+    def _flush_buffer(self):
+        """모아 둔 벡터로 학습하고 인덱스에 추가"""
+        sample = np.concatenate([vectors for vectors, _, _ in self._buffer])
+        if not self.index.is_trained:
+            try:
+                self.index.train(sample)
+            except RuntimeError as e:
+                raise ValueError(f"'{self.factory}' 인덱스를 학습하기에 청크({len(sample)}개)가 부족합니다. "
+                                 f"IVF 리스트 수나 PQ 크기를 줄여주세요: {e}") from e
+        rng = np.random.default_rng(0)
+        picks = rng.choice(len(sample), size=min(self.eval_queries, len(sample)), replace=False)
+        self._queries = sample[np.sort(picks)]
+        self._true_distances = np.full((len(self._queries), self.eval_k), np.inf, dtype=np.float32)
+        self._true_ids = np.full((len(self._queries), self.eval_k), -1, dtype=np.int64)
+
+        buffer, self._buffer = self._buffer, []
+        for vectors, texts, metadatas in buffer:
+            self._add(texts, metadatas, vectors)
+
+    def _add(self, texts, metadatas, vectors):
+        start = self.index.ntotal
+        self.index.add(vectors)
+        self._chunks.add(texts, metadatas)
+        self._update_ground_truth(vectors, start)
+
+    def _update_ground_truth(self, vectors, start):
+        """질의 벡터별 정확한 상위 k개를 배치마다 갱신"""
+        distances = ((self._queries ** 2).sum(axis=1)[:, None] - 2 * self._queries @ vectors.T
+                     + (vectors ** 2).sum(axis=1)[None, :])
+        ids = np.broadcast_to(np.arange(start, start + len(vectors)), distances.shape)
+        all_distances = np.concatenate([self._true_distances, distances], axis=1)
+        all_ids = np.concatenate([self._true_ids, ids], axis=1)
+        order = np.argsort(all_distances, axis=1, kind="stable")[:, :self.eval_k]
+        self._true_distances = np.take_along_axis(all_distances, order, axis=1)
+        self._true_ids = np.take_along_axis(all_ids, order, axis=1)
+
+    def evaluate(self):
+        """검색 파라미터별 recall@k, 질의당 지연 시간, 메모리 사용량"""
+        name = search_param_name(self.index)
+        candidates = [v for v in SEARCH_PARAM_CANDIDATES.get(name, []) if name != "nprobe"
+                      or v <= faiss.extract_index_ivf(self.index).nlist] or [None]
+        k = min(self.eval_k, self.index.ntotal)
+        rows = []
+        for value in candidates:
+            params = {name: value} if value is not None else {}
+            apply_search_params(self.index, params)
+            start = time.perf_counter()
+            _, ids = self.index.search(self._queries, k)
+            latency_ms = (time.perf_counter() - start) * 1000 / len(self._queries)
+            hits = sum(len(set(found) & set(truth)) for found, truth in zip(ids, self._true_ids[:, :k]))
+            rows.append({"params": params, "recall_at_k": hits / (len(self._queries) * k),
+                         "latency_ms": round(latency_ms, 4)})
+
+        # recall 목표를 넘는 가장 빠른 파라미터 (없으면 recall이 가장 높은 것)
+        passing = [row for row in rows if row["recall_at_k"] >= TARGET_RECALL]
+        chosen = min(passing, key=lambda row: row["latency_ms"]) if passing else max(rows, key=lambda row: row["recall_at_k"])
+        apply_search_params(self.index, chosen["params"])
+
+        dim, ntotal = self.index.d, self.index.ntotal
+        return {
+            "factory": self.factory,
+            "vectors": ntotal,
+            "dim": dim,
+            "k": k,
+            "queries": len(self._queries),
+            "index_bytes": len(faiss.serialize_index(self.index)),
+            "flat_float32_bytes": ntotal * dim * 4,
+            "results": rows,
+            "search_params": chosen["params"],
+        }
+
+    def finish(self, embeddings):
+        """남은 벡터 추가, 파일 저장, recall/지연 시간 보고서 작성 후 벡터 스토어 반환"""
+        if self._buffer:
+            self._flush_buffer()
+        if self.index is None or self.index.ntotal == 0:
+            raise ValueError("인덱스에 추가할 문서 청크가 없습니다.")
+        report = self.evaluate()
+
+        fd, index_tmp_path = tempfile.mkstemp(prefix=INDEX_FILE, suffix=".tmp", dir=self.index_dir)
+        os.close(fd)
+        faiss.write_index(self.index, index_tmp_path)
+        os.replace(index_tmp_path, os.path.join(self.index_dir, INDEX_FILE))
+        self._chunks.close()
+        with open(os.path.join(self.index_dir, REPORT_FILE), "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        return CompactVectorStore(self.index, ChunkStore(self.index_dir), embeddings), report
+
+#========== 벡터 스토어 ==========
+class CompactVectorStore(VectorStore):
+    """압축 FAISS 인덱스 + 메모리 매핑 청크 저장소 기반 LangChain 벡터 스토어 (읽기 전용)"""
+
+    def __init__(self, index, chunk_store, embedding_function):
+        self.index = index
+        self.chunk_store = chunk_store
+        self.embedding_function = embedding_function
+
+    @property
+    def embeddings(self) -> Optional[Embeddings]:
+        return self.embedding_function
+
+    @classmethod
+    def load(cls, index_dir, embeddings, search_params=None):
+        """저장된 인덱스를 불러오고 구축 시 선택한 검색 파라미터 적용"""
+        index = faiss.read_index(os.path.join(index_dir, INDEX_FILE))
+        apply_search_params(index, search_params)
+        return cls(index, ChunkStore(index_dir), embeddings)
+
+    def similarity_search_with_score_by_vector(self, embedding: List[float], k: int = 4, **kwargs: Any):
+        vector = np.asarray([embedding], dtype=np.float32)
+        distances, ids = self.index.search(vector, k)
+        return [(self.chunk_store.get(i), float(distance))
+                for distance, i in zip(distances[0], ids[0]) if i >= 0]
+
+    def similarity_search_with_score(self, query: str, k: int = 4, **kwargs: Any):
+        return self.similarity_search_with_score_by_vector(self.embedding_function.embed_query(query), k)
+
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score_by_vector(embedding, k)]
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k)]
+
+    def add_texts(self, texts: Iterable[str], metadatas: Optional[List[dict]] = None, **kwargs: Any) -> List[str]:
+        """압축 인덱스에는 문서를 추가할 수 없음 (항상 TypeError)"""
+        raise TypeError("압축 인덱스는 읽기 전용입니다. CompactIndexBuilder(또는 ingest.py --index-factory)로 "
+                        "다시 구축해주세요.")
+
+    @classmethod
+    def from_texts(cls, texts: List[str], embedding: Embeddings, metadatas: Optional[List[dict]] = None, *,
+                   index_dir: str, factory: str = "HNSW32,SQfp16", **kwargs: Any):
+        """index_dir에 압축 인덱스를 구축하고 불러옴 (index_dir은 필수, 기존 파일은 교체됨)"""
+        builder = CompactIndexBuilder(index_dir, factory)
+        builder.add(texts, metadatas or [{} for _ in texts], embedding.embed_documents(texts))
+        return builder.finish(embedding)[0]
@@ -0,0 +1,264 @@
+# ingest.py
+# 여러 원본 문서(PDF, tools.txt 등)를 스트리밍으로 처리해 FAISS 인덱스를 만들고 디스크에 저장
+#
+#   파일별 지연 로드 → 분할 → 정제 (프로세스 풀에서 병렬) → 고정 크기 배치로 임베딩 → 인덱스에 추가
+#
+# 진행 중인 파일 수와 임베딩 배치 크기만큼만 메모리에 올리므로 문서 수가 늘어도 메모리 사용량이 일정함
+# 저장된 인덱스는 manifest.json의 버전(원본 내용 + 분할 설정 + 임베딩)이 같으면 다시 만들지 않고 불러옴
+#
+# 사용법:
+#   python ingest.py tools.pdf tools.txt --index-dir faiss_index
+#   python ingest.py vendor_pdfs/*.pdf --workers 8 --batch-size 128 --embeddings local
+#   python ingest.py vendor_pdfs/*.pdf --index-factory "IVF1024,SQ8"   (압축 인덱스, index_backend.py 참고)
+#   python ingest.py tools.pdf --split-strategy recursive --chunk-size 1000 --chunk-overlap 200   (글자 수 기준 분할)
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from langchain_community.document_loaders import PyPDFLoader
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+
+from index_backend import REPORT_FILE, CompactIndexBuilder, CompactVectorStore
+from rag import DEFAULT_CHUNK_SIZES, clean_text, get_embeddings, get_index_version, get_text_splitter
+from tool_splitter import get_tool_categories_hash
+
+INDEX_DIR = "faiss_index"
+INDEX_SOURCES = ["tools.pdf"]
+# 비어 있으면 LangChain 기본 FAISS(정확 검색), 값이 있으면 해당 faiss.index_factory 구조의 압축 인덱스
+INDEX_FACTORY = os.getenv("INDEX_FACTORY", "")
+# recursive: 글자 수 기준 분할, tool: 카테고리/도구 제목 기준 분할 (tool_splitter.py 참고)
+SPLIT_STRATEGY = os.getenv("SPLIT_STRATEGY", "tool")
+MANIFEST_FILE = "manifest.json"
+TEXT_PAGE_SIZE = 4000  # 텍스트 파일을 페이지처럼 나누어 읽는 단위 (문자 수)
+
+#========== 원본 문서 로드 ==========
+def iter_text_pages(path, page_size=TEXT_PAGE_SIZE):
+    """텍스트 파일을 빈 줄 기준 문단을 모아 page_size 정도씩 지연 로드"""
+    page, buffer, size = 0, [], 0
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            buffer.append(line)
+            size += len(line)
+            if size >= page_size and not line.strip():
+                yield Document(page_content="".join(buffer), metadata={"source": path, "page": page})
+                page, buffer, size = page + 1, [], 0
+    if buffer:
+        yield Document(page_content="".join(buffer), metadata={"source": path, "page": page})
+
+def iter_pages(path):
+    """확장자에 맞는 로더로 페이지 단위 문서를 하나씩 생성"""
+    if path.lower().endswith(".pdf"):
+        return PyPDFLoader(path).lazy_load()
+    return iter_text_pages(path)
+
+def parse_source(path, chunk_size=1000, chunk_overlap=200, split_strategy=SPLIT_STRATEGY):
+    """파일 하나를 페이지 단위로 읽으며 분할·정제한 청크 목록 반환 (프로세스 풀 작업 단위)"""
+    text_splitter = get_text_splitter(split_strategy, chunk_size, chunk_overlap)
+    if split_strategy == "tool":
+        # 도구 구간이 페이지를 넘어 이어지므로 페이지를 차례로 흘려보내며 구간 단위로 분할
+        docs = text_splitter.iter_split(iter_pages(path))
+    else:
+        docs = (doc for page in iter_pages(path) for doc in text_splitter.split_documents([page]))
+    chunks = []
+    for doc in docs:
+        doc.page_content = clean_text(doc.page_content)
+        chunks.append(doc)
+    return chunks
+
+def iter_chunks(paths, chunk_size=1000, chunk_overlap=200, workers=1, split_strategy=SPLIT_STRATEGY):
+    """여러 파일의 청크를 파일 순서대로 생성 (동시에 처리 중인 파일은 workers × 2개 이하)"""
+    if workers <= 1 or len(paths) <= 1:
+        for path in paths:
+            yield path, parse_source(path, chunk_size, chunk_overlap, split_strategy)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = []
+        for path in paths:
+            pending.append((path, executor.submit(parse_source, path, chunk_size, chunk_overlap, split_strategy)))
+            while len(pending) > workers * 2:
+                done_path, future = pending.pop(0)
+                yield done_path, future.result()
+        for done_path, future in pending:
+            yield done_path, future.result()
+
+#========== 인덱스 구축 ==========
+def describe_embeddings(embeddings):
+    """인덱스 버전에 포함할 임베딩 모델 식별자"""
+    inner = getattr(embeddings, "embeddings", embeddings)
+    return f"{type(inner).__name__}:{getattr(inner, 'model', getattr(inner, 'dim', ''))}"
+
+def build_index(paths, embeddings, chunk_size=1000, chunk_overlap=200, batch_size=64, workers=1, progress=None,
+                factory="", index_dir=INDEX_DIR, split_strategy=SPLIT_STRATEGY):
+    """
+    문서 청크를 batch_size개씩 임베딩해 FAISS 인덱스에 추가
+    factory가 있으면 index_dir에 압축 인덱스를 바로 기록하고 recall/지연 시간 보고서를 stats["report"]에 담음
+    progress가 있으면 배치마다 진행 상황 dict를 전달
+    """
+    vectorstore = None
+    builder = CompactIndexBuilder(index_dir, factory) if factory else None
+    batch = []
+    stats = {"files_done": 0, "files_total": len(paths), "chunks": 0, "elapsed": 0.0}
+    start = time.perf_counter()
+
+    def flush():
+        nonlocal vectorstore
+        texts = [doc.page_content for doc in batch]
+        metadatas = [doc.metadata for doc in batch]
+        vectors = embeddings.embed_documents(texts)
+        if builder:
+            builder.add(texts, metadatas, vectors)
+        elif vectorstore is None:
+            vectorstore = FAISS.from_embeddings(list(zip(texts, vectors)), embeddings, metadatas=metadatas)
+        else:
+            vectorstore.add_embeddings(list(zip(texts, vectors)), metadatas=metadatas)
+        stats["chunks"] += len(batch)
+        stats["elapsed"] = time.perf_counter() - start
+        batch.clear()
+        if progress:
+            progress(dict(stats))
+
+    for path, chunks in iter_chunks(paths, chunk_size, chunk_overlap, workers, split_strategy):
+        for doc in chunks:
+            batch.append(doc)
+            if len(batch) >= batch_size:
+                flush()
+        stats["files_done"] += 1
+    if batch:
+        flush()
+
+    if builder:
+        vectorstore, stats["report"] = builder.finish(embeddings)
+    elif vectorstore is None:
+        raise ValueError("인덱스에 추가할 문서 청크가 없습니다.")
+    return vectorstore, stats
+
+#========== 저장 및 로드 ==========
+def write_atomic(path, write, binary=False):
+    """
+    write(f)로 같은 디렉터리의 고유한 임시 파일에 쓴 뒤 path로 원자적으로 교체
+    (여러 프로세스가 같은 파일을 동시에 저장해도 서로의 임시 파일을 덮어쓰지 않음)
+    """
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path), suffix=".tmp",
+                                    dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(fd, "wb" if binary else "w", encoding=None if binary else "utf-8") as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def read_manifest(index_dir=INDEX_DIR):
+    """저장된 인덱스의 manifest (없으면 None)"""
+    path = os.path.join(index_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def save_index(vectorstore, manifest, index_dir=INDEX_DIR):
+    """인덱스와 manifest 저장 (manifest를 마지막에 원자적으로 기록, 압축 인덱스는 구축 중에 이미 저장됨)"""
+    if not isinstance(vectorstore, CompactVectorStore):
+        # 고유한 임시 디렉터리에 저장한 뒤 파일별로 교체 (다른 프로세스가 쓰는 중인 파일에 겹쳐 쓰지 않도록)
+        os.makedirs(index_dir, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(prefix=".save-", dir=index_dir)
+        try:
+            vectorstore.save_local(tmp_dir)
+            for name in os.listdir(tmp_dir):
+                os.replace(os.path.join(tmp_dir, name), os.path.join(index_dir, name))
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    write_atomic(os.path.join(index_dir, MANIFEST_FILE),
+                 lambda f: json.dump(manifest, f, ensure_ascii=False, indent=2))
+
+def load_index(embeddings, index_dir=INDEX_DIR):
+    """저장된 인덱스와 manifest 로드 (직접 만든 인덱스 파일만 불러옴)"""
+    manifest = read_manifest(index_dir)
+    if manifest and manifest.get("index_factory"):
+        return CompactVectorStore.load(index_dir, embeddings, manifest.get("search_params")), manifest
+    vectorstore = FAISS.load_local(index_dir, embeddings, allow_dangerous_deserialization=True)
+    return vectorstore, manifest
+
+def ensure_index(paths=None, embeddings=None, index_dir=INDEX_DIR, chunk_size=None, chunk_overlap=200,
+                 batch_size=64, workers=1, progress=None, factory=None, split_strategy=None):
+    """원본과 설정이 같은 인덱스가 저장되어 있으면 불러오고, 아니면 새로 구축해 저장"""
+    paths = list(paths or INDEX_SOURCES)
+    embeddings = embeddings or get_embeddings()
+    factory = INDEX_FACTORY if factory is None else factory
+    split_strategy = split_strategy or SPLIT_STRATEGY
+    chunk_size = chunk_size or DEFAULT_CHUNK_SIZES.get(split_strategy)
+    params = {}
+    if split_strategy == "tool":
+        chunk_overlap = 0  # 도구 경계를 넘지 않으므로 겹침 없음
+        # 청크 경계와 메타데이터가 카탈로그의 도구 이름/카테고리로 정해지므로 카탈로그가 바뀌면 새 버전
+        params["tool_catalog"] = get_tool_categories_hash()
+    version = get_index_version(paths, chunk_size=chunk_size, chunk_overlap=chunk_overlap,
+                                embeddings=describe_embeddings(embeddings), factory=factory,
+                                split_strategy=split_strategy, **params)
+
+    manifest = read_manifest(index_dir)
+    if manifest and manifest.get("version") == version:
+        return load_index(embeddings, index_dir)
+
+    vectorstore, stats = build_index(paths, embeddings, chunk_size, chunk_overlap, batch_size, workers, progress,
+                                     factory, index_dir, split_strategy)
+    manifest = {
+        "version": version,
+        "sources": paths,
+        "chunk_size": chunk_size,
+        "chunk_overlap": chunk_overlap,
+        "split_strategy": split_strategy,
+        "embeddings": describe_embeddings(embeddings),
+        "chunks": stats["chunks"],
+        "build_seconds": round(stats["elapsed"], 2),
+        "index_factory": factory,
+        "search_params": stats["report"]["search_params"] if factory else {},
+    }
+    save_index(vectorstore, manifest, index_dir)
+    return vectorstore, manifest
+
+def main():
+    parser = argparse.ArgumentParser(description="문서 인덱스 스트리밍 구축")
+    parser.add_argument("sources", nargs="*", default=INDEX_SOURCES, help="PDF 또는 텍스트 파일")
+    parser.add_argument("--index-dir", default=INDEX_DIR)
+    parser.add_argument("--chunk-size", type=int, default=None, help="기본: 분할 방식별 (recursive 1000, tool 2000)")
+    parser.add_argument("--chunk-overlap", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--embeddings", default=None, help="openai 또는 local (기본: EMBEDDING_BACKEND)")
+    parser.add_argument("--index-factory", default=None,
+                        help='압축 인덱스 구조 (예: "HNSW32,SQfp16", "IVF1024,SQ8", 기본: INDEX_FACTORY)')
+    parser.add_argument("--split-strategy", choices=["recursive", "tool"], default=None,
+                        help="recursive(글자 수 기준) 또는 tool(도구 제목 기준, 기본: SPLIT_STRATEGY)")
+    args = parser.parse_args()
+
+    def report(stats):
+        print(f"  파일 {stats['files_done']}/{stats['files_total']} | "
+              f"청크 {stats['chunks']:,}개 | {stats['elapsed']:.1f}초")
+
+    _, manifest = ensure_index(args.sources, get_embeddings(args.embeddings), args.index_dir, args.chunk_size,
+                               args.chunk_overlap, args.batch_size, args.workers, report, args.index_factory,
+                               args.split_strategy)
+    print(f"✅ 인덱스 준비 완료: {args.index_dir} (버전 {manifest['version']}, 청크 {manifest['chunks']:,}개)")
+
+    report_path = os.path.join(args.index_dir, REPORT_FILE)
+    if manifest.get("index_factory") and os.path.exists(report_path):
+        with open(report_path, "r", encoding="utf-8") as f:
+            index_report = json.load(f)
+        print(f"\n📊 {index_report['factory']} | 인덱스 {index_report['index_bytes'] / 1e6:.2f}MB "
+              f"(float32 Flat {index_report['flat_float32_bytes'] / 1e6:.2f}MB)")
+        for row in index_report["results"]:
+            chosen = " ← 선택" if row["params"] == index_report["search_params"] else ""
+            print(f"  {row['params'] or '기본'}: recall@{index_report['k']} {row['recall_at_k']:.3f} | "
+                  f"{row['latency_ms']:.3f}ms/질의{chosen}")
+
+if __name__ == "__main__":
+    main()
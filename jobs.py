@@ -0,0 +1,140 @@
+# jobs.py
+# Q&A와 전문가 설명 생성을 Streamlit 스크립트 스레드 밖의 작업자 풀에서 실행
+#   - 작업자 수와 대기 작업 수에 상한을 두고, 가득 차면 새 작업을 거부 (QueueFullError)
+#   - 작업 상태와 섹션별 부분 결과를 Job에 기록하고 화면은 세션 상태의 Job을 폴링해 표시
+#   - 작업 함수는 Streamlit에 의존하지 않음 (작업자 스레드에는 스크립트 컨텍스트가 없음)
+
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from rag import build_question_prompt, clean_text, generate_expert_sections, run_qa
+
+JOB_MAX_WORKERS = int(os.getenv("JOB_MAX_WORKERS", "4"))
+JOB_MAX_PENDING = int(os.getenv("JOB_MAX_PENDING", "32"))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1"))  # 초
+
+class QueueFullError(Exception):
+    """대기 중인 작업이 상한에 도달해 새 작업을 받을 수 없음"""
+
+#========== 작업 ==========
+class Job:
+    """작업 하나의 상태(queued → running → done/failed), 부분 결과, 최종 결과"""
+
+    def __init__(self, kind):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = "queued"
+        self.result = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.meta = {}  # 화면 표시용 부가 정보 (질문 원문 등)
+        self._partial = []
+        self._lock = threading.Lock()
+
+    @property
+    def done(self):
+        return self.status in ("done", "failed")
+
+    @property
+    def partial(self):
+        """지금까지 완성된 부분 결과 (복사본)"""
+        with self._lock:
+            return list(self._partial)
+
+    def add_partial(self, item):
+        """작업 함수가 중간 결과를 하나씩 보고할 때 사용"""
+        with self._lock:
+            self._partial.append(item)
+
+    def elapsed(self):
+        """제출부터 완료(또는 현재)까지 걸린 시간"""
+        return (self.finished_at or time.time()) - self.submitted_at
+
+#========== 작업 큐 ==========
+class JobQueue:
+    """작업자 수와 대기 작업 수가 제한된 프로세스 내 작업 큐"""
+
+    def __init__(self, max_workers=JOB_MAX_WORKERS, max_pending=JOB_MAX_PENDING):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="aidaum-job")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def submit(self, kind, fn, *args, **kwargs):
+        """fn(job, *args, **kwargs)를 작업자 풀에 제출 (대기 작업이 가득 차면 QueueFullError)"""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise QueueFullError(f"대기 중인 작업이 {self.max_pending}개로 가득 찼습니다.")
+
+        job = Job(kind)
+        with self._lock:
+            self.pending += 1
+        try:
+            self._executor.submit(self._run, job, fn, args, kwargs)
+        except Exception:
+            with self._lock:
+                self.pending -= 1
+            self._slots.release()
+            raise
+        return job
+
+    def _run(self, job, fn, args, kwargs):
+        with self._lock:
+            self.pending -= 1
+            self.running += 1
+        job.started_at = time.time()
+        job.status = "running"
+        try:
+            job.result = fn(job, *args, **kwargs)
+            job.status = "done"
+        except Exception as e:
+            job.error = str(e)
+            job.status = "failed"
+        finally:
+            job.finished_at = time.time()
+            with self._lock:
+                self.running -= 1
+                if job.status == "done":
+                    self.completed += 1
+                else:
+                    self.failed += 1
+            self._slots.release()
+
+    def stats(self):
+        """대기/실행/완료/실패/거부 작업 수"""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "pending": self.pending,
+                "running": self.running,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+            }
+
+#========== 작업 함수 ==========
+def question_job(job, qa_system, vectorstore, question, qa_cache, index_version, k=None):
+    """자유 질문 답변과 참고 문서를 생성하고 원래 질문으로 질문 캐시에 저장"""
+    clean_question = clean_text(question)
+    answer = run_qa(qa_system, build_question_prompt(clean_question))
+    docs = vectorstore.similarity_search(clean_question, k=2)
+    sources = [{"page": doc.metadata.get("page"), "content": doc.page_content} for doc in docs]
+    qa_cache.store(question, answer, sources, index_version, k)
+    return {"answer": answer, "sources": sources}
+
+def expert_sections_job(job, tool_name, qa_system, responses):
+    """전문가 설명 섹션을 생성하면서 완성된 섹션을 부분 결과로 보고"""
+    return generate_expert_sections(tool_name, qa_system, responses, on_section=job.add_partial)
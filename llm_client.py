@@ -0,0 +1,182 @@
+# llm_client.py
+# OpenAI LLM/임베딩 호출 보호 계층
+#   - 동일한 요청이 동시에 들어오면 한 번만 호출하고 결과 공유 (single-flight)
+#   - 프로세스 전체 동시 호출 수 제한(세마포어)과 초당 요청 수 제한(토큰 버킷)
+#     LLM과 임베딩은 OpenAI 한도가 따로 잡히므로 제한도 따로 둠 (질의 임베딩이 LLM 호출 한도를 쓰지 않도록)
+#   - 429/5xx/연결 오류는 지터를 준 지수 백오프로 재시도
+#   - 커넥션 풀을 공유하는 HTTP 클라이언트 하나로 모든 호출 처리
+
+import hashlib
+import os
+import random
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, List, Optional
+
+import httpx
+import openai
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.llms import LLM
+
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_RPS = float(os.getenv("LLM_RPS", "5"))
+LLM_BURST = int(os.getenv("LLM_BURST", "10"))
+EMBED_MAX_CONCURRENCY = int(os.getenv("EMBED_MAX_CONCURRENCY", "16"))
+EMBED_RPS = float(os.getenv("EMBED_RPS", "50"))
+EMBED_BURST = int(os.getenv("EMBED_BURST", "100"))
+MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "5"))
+BACKOFF_BASE = 0.5  # 초
+BACKOFF_MAX = 20.0  # 초
+
+#========== 동일 요청 병합 ==========
+class SingleFlight:
+    """같은 키의 호출이 진행 중이면 새로 호출하지 않고 그 결과를 기다림"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn):
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+
+        if not leader:
+            return future.result()
+
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._calls[key]
+        return future.result()
+
+#========== 요청 속도 제한 ==========
+class TokenBucket:
+    """초당 rate개씩 토큰이 채워지는 버킷 - 토큰이 없으면 채워질 때까지 대기"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+class Limiter:
+    """한 종류의 호출(LLM 또는 임베딩)에 대한 초당 요청 수와 동시 호출 수 제한"""
+
+    def __init__(self, rate, burst, max_concurrency):
+        self.bucket = TokenBucket(rate, burst)
+        self.semaphore = threading.BoundedSemaphore(max_concurrency)
+        self.max_concurrency = max_concurrency
+
+_single_flight = SingleFlight()
+llm_limiter = Limiter(LLM_RPS, LLM_BURST, LLM_MAX_CONCURRENCY)
+embed_limiter = Limiter(EMBED_RPS, EMBED_BURST, EMBED_MAX_CONCURRENCY)
+_http_client = None
+_http_client_lock = threading.Lock()
+
+def get_http_client():
+    """모든 OpenAI 호출이 공유하는 커넥션 풀 HTTP 클라이언트"""
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            max_concurrency = llm_limiter.max_concurrency + embed_limiter.max_concurrency
+            _http_client = httpx.Client(
+                limits=httpx.Limits(max_connections=max_concurrency * 2, max_keepalive_connections=max_concurrency),
+                timeout=httpx.Timeout(60.0, connect=10.0),
+            )
+        return _http_client
+
+#========== 재시도 ==========
+def is_retryable(error):
+    """재시도할 오류인지 (429, 5xx, 연결/타임아웃)"""
+    if isinstance(error, (openai.RateLimitError, openai.APIConnectionError, openai.APITimeoutError)):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return False
+
+def retry_delay(error, attempt):
+    """Retry-After 헤더가 있으면 따르고, 없으면 full-jitter 지수 백오프"""
+    response = getattr(error, "response", None)
+    if response is not None:
+        retry_after = response.headers.get("retry-after")
+        if retry_after:
+            try:
+                return min(float(retry_after), BACKOFF_MAX)
+            except ValueError:
+                pass
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+def guarded_call(fn, limiter=llm_limiter, max_retries=MAX_RETRIES):
+    """limiter의 속도 제한과 동시 호출 제한 안에서 fn 실행, 일시적 오류는 재시도"""
+    for attempt in range(max_retries + 1):
+        limiter.bucket.acquire()
+        try:
+            with limiter.semaphore:
+                return fn()
+        except Exception as e:
+            if attempt == max_retries or not is_retryable(e):
+                raise
+            time.sleep(retry_delay(e, attempt))
+
+def request_key(*parts):
+    """single-flight용 요청 키"""
+    return hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()
+
+#========== LangChain 래퍼 ==========
+class GuardedLLM(LLM):
+    """내부 LLM 호출에 single-flight, 동시성/속도 제한, 재시도를 적용"""
+
+    llm: Any
+
+    @property
+    def _llm_type(self) -> str:
+        return f"guarded-{self.llm._llm_type}"
+
+    def _call(self, prompt: str, stop: Optional[List[str]] = None, run_manager=None, **kwargs) -> str:
+        key = request_key("llm", self.llm._llm_type, repr(self.llm._identifying_params), prompt, stop)
+        return _single_flight.do(key, lambda: guarded_call(lambda: self.llm.invoke(prompt, stop=stop)))
+
+class GuardedEmbeddings(Embeddings):
+    """임베딩 호출에 single-flight, 동시성/속도 제한, 재시도를 적용"""
+
+    def __init__(self, embeddings):
+        self.embeddings = embeddings
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return guarded_call(lambda: self.embeddings.embed_documents(texts), embed_limiter)
+
+    def embed_query(self, text: str) -> List[float]:
+        key = request_key("embed_query", text)
+        return _single_flight.do(key, lambda: guarded_call(lambda: self.embeddings.embed_query(text), embed_limiter))
+
+#========== 생성 함수 ==========
+def get_llm(temperature=0.3):
+    """보호 계층을 거치는 OpenAI LLM (내부 재시도는 끄고 이 모듈에서 재시도)"""
+    from langchain_openai import OpenAI
+    return GuardedLLM(llm=OpenAI(temperature=temperature, http_client=get_http_client(), max_retries=0))
+
+def get_openai_embeddings():
+    """보호 계층을 거치는 OpenAI 임베딩"""
+    from langchain_openai.embeddings import OpenAIEmbeddings
+    return GuardedEmbeddings(OpenAIEmbeddings(http_client=get_http_client(), max_retries=0))
@@ -0,0 +1,244 @@
+# loadtest.py
+# 동시 Streamlit 세션을 흉내 내는 부하 테스트 (로컬 임베딩/LLM, 지연 시간 조절 가능)
+#
+# 각 가상 세션은 main.py와 같은 경로로 요청을 처리합니다:
+#   설문 5문항 응답 → 결과(스냅샷의 카탈로그로 유형/추천) → "자세히 보기"(미리 생성된 설명 또는 작업 큐)
+#   → 질문하기(의미 캐시 → 작업 큐) → 질문 기록 저장 → 피드백 제출(평점 집계 갱신)
+# 공유 자원은 service.load_resources(레지스트리 스냅샷, 질문 캐시, 평점 집계)로 만들고,
+# 로컬 LLM/임베딩은 llm_client의 보호 계층(single-flight, 동시 호출/초당 요청 제한)으로 감쌉니다.
+# 인덱스, 피드백, 질문 기록 등은 임시 작업 디렉터리에 만들어 실제 앱 데이터를 건드리지 않습니다.
+#
+# 사용법:
+#   python loadtest.py --levels 1,2,4,8,16 --llm-latency 0.5 --embed-latency 0.05
+#   LLM_RPS=20 EMBED_RPS=100 JOB_MAX_WORKERS=8 python loadtest.py   (제한 설정별 처리량 비교)
+
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import service
+from feedback import save_user_feedback
+from jobs import JOB_POLL_INTERVAL, JobQueue, QueueFullError, expert_sections_job, question_job
+from llm_client import GuardedEmbeddings, GuardedLLM
+from local_models import FakeLLM, HashingEmbeddings
+from session_store import HistoryStore, SessionHistory
+from survey import random_survey_responses
+from user_type import get_user_type_description
+
+STEPS = ["survey", "results", "detail", "ask", "feedback"]
+
+SAMPLE_QUESTIONS = [
+    "ChatGPT의 주요 기능은 무엇인가요?",
+    "무료로 쓸 수 있는 이미지 생성 도구를 알려주세요",
+    "회의록 작성에 좋은 AI 도구는?",
+    "코딩에 도움이 되는 AI는 무엇인가요?",
+]
+
+#========== 공유 자원 ==========
+def prepare_workdir(work_dir, pdf_path, tools_path):
+    """원본 문서와 카탈로그를 임시 작업 디렉터리에 복사 (앱과 같은 상대 경로로 산출물 생성)"""
+    for path in (pdf_path, tools_path):
+        shutil.copy(path, os.path.join(work_dir, os.path.basename(path)))
+    return os.path.basename(pdf_path), os.path.basename(tools_path)
+
+def build_shared_resources(pdf_path, tools_path, llm_latency, embed_latency):
+    """모든 세션이 공유하는 자원 (앱과 같은 서비스 계층, 보호 계층으로 감싼 로컬 모델)"""
+    embeddings = GuardedEmbeddings(HashingEmbeddings(latency=embed_latency))
+    llm = GuardedLLM(llm=FakeLLM(latency=llm_latency))
+    service.load_resources([pdf_path], tools_path, embeddings=embeddings, llm=llm)
+    return {"job_queue": JobQueue(), "history_store": HistoryStore()}
+
+#========== 세션 시나리오 ==========
+def wait_for_job(job, poll_interval):
+    """화면의 폴링 주기로 작업 완료를 확인 (실패하면 예외)"""
+    while not job.done:
+        time.sleep(poll_interval)
+    if job.status == "failed":
+        raise RuntimeError(job.error)
+    return job.result
+
+def run_session(session_id, shared, engine, poll_interval, seed):
+    """한 사용자 세션의 전체 흐름을 실행하고 단계별 지연(초) 반환"""
+    rng = random.Random(seed + session_id)
+    timings = {}
+    job_queue = shared["job_queue"]
+
+    start = time.perf_counter()
+    responses = random_survey_responses(rng)
+    timings["survey"] = time.perf_counter() - start
+
+    # 결과 화면: 재실행마다 현재 스냅샷을 받아 유형 판별과 추천 (카탈로그는 스냅샷에 이미 로드됨)
+    start = time.perf_counter()
+    resources = service.load_resources()
+    recommendation = service.recommend(responses, 3, engine, resources)
+    get_user_type_description(recommendation["user_type"])
+    recommended = recommendation["tools"]
+    qa = service.get_qa_chain(resources, responses)
+    k = service.get_search_kwargs(responses)["k"]
+    timings["results"] = time.perf_counter() - start
+
+    # "자세히 보기": 미리 생성된 설명이 있으면 그대로 표시, 없으면 작업 큐에서 생성
+    start = time.perf_counter()
+    tool_name = recommended[0]["name"] if recommended else "ChatGPT"
+    if not resources["tool_content"].get(tool_name):
+        wait_for_job(job_queue.submit("expert", expert_sections_job, tool_name, qa, dict(responses)), poll_interval)
+    timings["detail"] = time.perf_counter() - start
+
+    # 질문하기: 의미 캐시를 먼저 확인하고, 없으면 작업 큐에서 RAG 답변 생성
+    start = time.perf_counter()
+    question = rng.choice(SAMPLE_QUESTIONS)
+    qa_cache = resources["qa_cache"]
+    cached = qa_cache.lookup(question, resources["index_version"], k)
+    if cached:
+        answer = cached["answer"]
+    else:
+        job = job_queue.submit("qa", question_job, qa, resources["vectorstore"], question, qa_cache,
+                               resources["index_version"], k)
+        answer = wait_for_job(job, poll_interval)["answer"]
+    history = SessionHistory(shared["history_store"])
+    history.append(question, answer, time.perf_counter() - start, time.strftime("%Y-%m-%d %H:%M:%S"))
+    timings["ask"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if not save_user_feedback(tool_name, rng.randint(1, 5), "부하 테스트", responses,
+                              aggregates=resources["feedback"]):
+        raise RuntimeError("피드백 저장 실패")
+    timings["feedback"] = time.perf_counter() - start
+
+    return timings
+
+#========== 측정 ==========
+def current_rss_mb():
+    """현재 프로세스 RSS(MB) - /proc이 없으면 최대 RSS로 대체"""
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def percentile(values, pct):
+    """정렬된 값 목록의 백분위수"""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * pct))]
+
+def run_level(concurrency, sessions_per_worker, shared, engine, poll_interval, seed):
+    """동시 세션 수 하나에 대한 처리량/지연/메모리 측정"""
+    total_sessions = concurrency * sessions_per_worker
+    step_timings = {step: [] for step in STEPS}
+    session_timings = []
+    errors = []
+    rejected = 0
+    cache_before = service.load_resources()["qa_cache"].stats()
+    lock = threading.Lock()
+    rss_before = current_rss_mb()
+    rss_peak = rss_before
+
+    def worker(session_id):
+        nonlocal rss_peak, rejected
+        start = time.perf_counter()
+        try:
+            timings = run_session(session_id, shared, engine, poll_interval, seed)
+        except QueueFullError:
+            # 앱에서는 "요청이 많아" 경고를 보여주는 경우
+            with lock:
+                rejected += 1
+            return
+        except Exception as e:
+            with lock:
+                errors.append(str(e))
+            return
+        elapsed = time.perf_counter() - start
+        rss = current_rss_mb()
+        with lock:
+            session_timings.append(elapsed)
+            for step, value in timings.items():
+                step_timings[step].append(value)
+            rss_peak = max(rss_peak, rss)
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(worker, range(total_sessions)))
+    wall = time.perf_counter() - wall_start
+
+    session_timings.sort()
+    cache_after = service.load_resources()["qa_cache"].stats()
+    cache_lookups = (cache_after["hits"] + cache_after["misses"]) - (cache_before["hits"] + cache_before["misses"])
+    result = {
+        "concurrency": concurrency,
+        "sessions": total_sessions,
+        "errors": len(errors),
+        "rejected": rejected,
+        "qa_cache_hit_rate": (cache_after["hits"] - cache_before["hits"]) / cache_lookups if cache_lookups else 0.0,
+        "job_queue": shared["job_queue"].stats(),
+        "throughput_sessions_per_s": len(session_timings) / wall if wall else 0.0,
+        "session_p50_s": percentile(session_timings, 0.50),
+        "session_p95_s": percentile(session_timings, 0.95),
+        "session_p99_s": percentile(session_timings, 0.99),
+        "rss_peak_mb": rss_peak,
+        # 동시에 살아 있는 세션 수로 나눈 세션당 추가 메모리
+        "rss_per_session_mb": max(rss_peak - rss_before, 0.0) / concurrency,
+        "steps": {},
+    }
+    for step, values in step_timings.items():
+        values.sort()
+        result["steps"][step] = {
+            "mean_s": statistics.mean(values) if values else 0.0,
+            "p95_s": percentile(values, 0.95),
+        }
+    if errors:
+        result["sample_error"] = errors[0]
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="동시 세션 부하 테스트")
+    parser.add_argument("--levels", default="1,2,4,8,16,32", help="동시 세션 수 단계 (쉼표 구분)")
+    parser.add_argument("--sessions-per-worker", type=int, default=3)
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="LLM 호출당 지연(초)")
+    parser.add_argument("--embed-latency", type=float, default=0.05, help="임베딩 호출당 지연(초)")
+    parser.add_argument("--pdf", default="tools.pdf")
+    parser.add_argument("--tools", default="tools.json")
+    parser.add_argument("--engine", choices=["rules", "embedding", "hybrid"], default="rules", help="추천 방식")
+    parser.add_argument("--poll-interval", type=float, default=JOB_POLL_INTERVAL, help="작업 완료 확인 주기(초)")
+    parser.add_argument("--output", default="loadtest_results.json")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    output_path = os.path.abspath(args.output)
+    results = []
+    original_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as work_dir:
+        pdf_path, tools_path = prepare_workdir(work_dir, args.pdf, args.tools)
+        os.chdir(work_dir)
+        try:
+            print("⚙️ 공유 자원 준비 중...")
+            shared = build_shared_resources(pdf_path, tools_path, args.llm_latency, args.embed_latency)
+            for concurrency in [int(v) for v in args.levels.split(",")]:
+                result = run_level(concurrency, args.sessions_per_worker, shared, args.engine, args.poll_interval,
+                                   args.seed)
+                results.append(result)
+                print(f"동시 {concurrency:3d}: {result['throughput_sessions_per_s']:.2f} 세션/초, "
+                      f"p50 {result['session_p50_s']:.2f}s, p95 {result['session_p95_s']:.2f}s, "
+                      f"p99 {result['session_p99_s']:.2f}s, RSS/세션 {result['rss_per_session_mb']:.1f}MB, "
+                      f"캐시 적중 {result['qa_cache_hit_rate']:.0%}, 거부 {result['rejected']}, "
+                      f"오류 {result['errors']}")
+        finally:
+            os.chdir(original_dir)
+
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump({"config": vars(args), "levels": results}, f, ensure_ascii=False, indent=2)
+    print(f"✅ 결과 저장: {output_path}")
+
+if __name__ == "__main__":
+    main()
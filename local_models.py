@@ -0,0 +1,58 @@
+# local_models.py
+# OpenAI 없이 동작하는 로컬 임베딩/LLM (벤치마크, 평가, 부하 테스트용)
+
+import re
+import time
+import zlib
+from typing import List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.llms import LLM
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+#========== 해시 기반 임베딩 ==========
+class HashingEmbeddings(Embeddings):
+    """토큰 해시(feature hashing)로 만든 결정적 임베딩 - 네트워크 호출 없음"""
+
+    def __init__(self, dim=384, latency=0.0):
+        self.dim = dim
+        self.latency = latency  # 호출당 인위적 지연(초)
+
+    def _embed(self, text):
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for token in TOKEN_PATTERN.findall(text.lower()):
+            h = zlib.crc32(token.encode("utf-8"))
+            # 상위 비트로 부호를 정해 해시 충돌 편향을 줄임
+            vector[h % self.dim] += 1.0 if (h >> 31) & 1 else -1.0
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector.tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if self.latency:
+            time.sleep(self.latency)
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        if self.latency:
+            time.sleep(self.latency)
+        return self._embed(text)
+
+#========== 고정 응답 LLM ==========
+class FakeLLM(LLM):
+    """지정한 지연 후 고정된 한국어 응답을 돌려주는 LLM"""
+
+    latency: float = 0.0
+    response: str = "이 도구는 텍스트 생성, 요약, 번역 등 다양한 작업을 지원하는 AI 도구입니다."
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-local"
+
+    def _call(self, prompt, stop=None, run_manager=None, **kwargs) -> str:
+        if self.latency:
+            time.sleep(self.latency)
+        return self.response
@@ -3,7 +3,6 @@ import streamlit as st
 st.set_page_config(page_title="AI 도구 추천", page_icon="🌟", layout="wide")
 
 import pandas as pd
-import json
 import matplotlib.pyplot as plt
 import os
 import re
@@ -11,14 +10,18 @@ import time
 from datetime import datetime
 from dotenv import load_dotenv
 from survey import questions, reset_survey, run_survey
-from langchain.chains import RetrievalQA
-from langchain_openai.embeddings import OpenAIEmbeddings
-from langchain_community.vectorstores import FAISS
 from langchain_openai import OpenAI
-from langchain_community.document_loaders import PyPDFLoader
-from langchain.chains.question_answering import load_qa_chain
+from llm_client import get_llm
 from user_type import determine_user_type, get_user_type_description
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+from recommend import get_tool_details, find_best_matching_tool, recommend_tools_by_criteria, translate_difficulty
+from feedback import load_feedback_aggregates, save_user_feedback
+from qa_cache import SemanticQueryCache
+from rag import get_embeddings, get_search_kwargs, build_qa_chain, get_user_context
+from catalog import SORT_COLUMNS, filter_catalog, get_page, list_categories, page_count, sort_catalog, suggest_names
+from registry import ArtifactRegistry
+from session_store import HistoryStore, SessionHistory
+from tool_embeddings import HYBRID_RULE_WEIGHT, recommend_tools_by_embedding
+from jobs import JOB_POLL_INTERVAL, Job, JobQueue, QueueFullError, expert_sections_job, question_job
 
 
 #========== 환경 변수 로딩 ==========
@@ -53,117 +56,6 @@ except Exception as e:
     st.stop()
 
 #========== 함수 정의 ==========
-def load_json_data():
-    """JSON 파일에서 AI 도구 데이터 로드"""
-    try:
-        # UTF-8로 시도(한국어로 ㄱㄱㄱ)
-        with open("tools.json", "r", encoding="utf-8") as f:
-            return json.load(f)
-    except UnicodeDecodeError:
-        # UTF-8로 실패한 경우 errors='ignore' 옵션으로 다시 시도
-        try:
-            with open("tools.json", "r", encoding="utf-8", errors="ignore") as f:
-                return json.load(f)
-        except json.JSONDecodeError:
-            # JSON 파싱 오류 발생 시 latin-1 인코딩으로 시도
-            try:
-                with open("tools.json", "r", encoding="latin-1") as f:
-                    return json.load(f)
-            except Exception as e:
-                st.error(f"❌ JSON 파일 로드 오류: {e}")
-                return []
-    except Exception as e:
-        st.error(f"❌ JSON 파일 로드 오류: {e}")
-        return []
-
-def filter_tools_by_difficulty(tools, difficulty_level):
-    """난이도 기준으로 AI 도구 필터링"""
-    if difficulty_level == "모든 난이도":
-        return tools
-    
-    difficulty_map = {
-        "쉬움": "low", 
-        "중간": "medium", 
-        "어려움": "hard"
-    }
-    
-    target_difficulty = difficulty_map.get(difficulty_level)
-    
-    filtered = []
-    for tool in tools:
-        # None 난이도는 중간 난이도로 간주
-        if tool.get("difficulty") is None and target_difficulty == "medium":
-            filtered.append(tool)
-        elif tool.get("difficulty") == target_difficulty:
-            filtered.append(tool)
-    return filtered
-
-def filter_tools_by_category(tools, category):
-    """카테고리 기준으로 AI 도구 필터링"""
-    if category == "모든 카테고리":
-        return tools
-    
-    return [tool for tool in tools if tool.get("category") == category]
-
-def filter_tools_by_search(tools, search_term):
-    """검색어 기준으로 AI 도구 필터링"""
-    if not search_term:
-        return tools
-    
-    return [tool for tool in tools if search_term.lower() in tool.get("name", "").lower() or 
-            (tool.get("description") and search_term.lower() in tool.get("description", "").lower())]
-
-def get_tool_details(tool_name, tools_data):
-    """도구 이름으로 세부 정보 검색"""
-    for tool in tools_data:
-        if tool["name"].lower() == tool_name.lower():
-            return tool
-    return None
-
-def find_best_matching_tool(tool_name, tools_data):
-    """가장 유사한 도구 이름 찾기"""
-    # 정확히 일치하는 도구 먼저 확인
-    for tool in tools_data:
-        if tool["name"].lower() == tool_name.lower():
-            return tool
-    
-    # 부분 일치하는 도구 확인
-    for tool in tools_data:
-        if tool_name.lower() in tool["name"].lower() or tool["name"].lower() in tool_name.lower():
-            return tool
-    
-    return None
-
-def save_user_feedback(tool_name, rating, feedback_text):
-    """사용자 피드백 저장"""
-    feedback_data = {
-        "tool": tool_name,
-        "rating": rating,
-        "feedback": feedback_text,
-        "responses": st.session_state.responses
-    }
-    
-    # 피드백 파일 저장
-    try:
-        if os.path.exists("user_feedback.json"):
-            try:
-                with open("user_feedback.json", "r", encoding="utf-8") as f:
-                    existing_data = json.load(f)
-            except UnicodeDecodeError:
-                with open("user_feedback.json", "r", encoding="latin-1") as f:
-                    existing_data = json.load(f)
-            
-            existing_data.append(feedback_data)
-            with open("user_feedback.json", "w", encoding="utf-8", errors="ignore") as f:
-                json.dump(existing_data, f, ensure_ascii=True, indent=2)
-        else:
-            with open("user_feedback.json", "w", encoding="utf-8", errors="ignore") as f:
-                json.dump([feedback_data], f, ensure_ascii=True, indent=2)
-        return True
-    except Exception as e:
-        st.error(f"피드백 저장 중 오류 발생: {e}")
-        return False
-
 def visualize_category_distribution(tools_data):
     """카테고리별 AI 도구 분포 시각화"""
     categories = {}
@@ -191,244 +83,173 @@ def visualize_category_distribution(tools_data):
     plt.tight_layout()
     return fig
 
-def recommend_tools_by_criteria(tools_data, user_responses, max_recommendations=3):
-    """사용자 응답 기반으로 AI 도구 알고리즘적 추천"""
-    if not tools_data:
-        return []
-    
-    # 점수 초기화
-    for tool in tools_data:
-        tool['score'] = 0
-        
-    # 1. 난이도 기준 점수화 (사용자 선호 난이도에 가까울수록 높은 점수)
-    difficulty_map = {
-        "쉬움 (초보자도 바로 사용 가능한 도구)": "low",
-        "중간 (기본적인 지식이 필요한 도구)": "medium", 
-        "어려움 (전문적인 지식이 필요한 고급 도구)": "hard",
-        "난이도보다는 기능 중심으로 선택하고 싶음": None
-    }
-    
-    preferred_difficulty = difficulty_map.get(
-        user_responses.get('preferred_difficulty', "난이도보다는 기능 중심으로 선택하고 싶음")
-    )
-    
-    # 난이도 점수 계산
-    if preferred_difficulty:
-        for tool in tools_data:
-            if tool.get('difficulty') == preferred_difficulty:
-                tool['score'] += 5
-            # None 난이도는 medium으로 간주
-            elif tool.get('difficulty') is None and preferred_difficulty == "medium":
-                tool['score'] += 4
-    
-    # 2. AI
-    # 2. AI 지식 수준에 따른 난이도 조정
-    knowledge_level = user_responses.get('ai_knowledge', '')
-    if knowledge_level in ['전혀 모른다', '이름만 들어봤다']:
-        # 초보자는 쉬운 도구 선호
-        for tool in tools_data:
-            if tool.get('difficulty') == 'low':
-                tool['score'] += 3
-    elif knowledge_level in ['AI 모델이나 알고리즘을 직접 다뤄본 적 있다']:
-        # 전문가는 어려운 도구 선호
-        for tool in tools_data:
-            if tool.get('difficulty') == 'hard':
-                tool['score'] += 3
-    
-    # 3. 관심 분야 기반 점수화
-    interests = user_responses.get('tool_interest', [])
-    interest_category_map = {
-        "텍스트 생성": ["AI Assistants (Chatbots)", "Writing", "Grammar and Writing Improvement"],
-        "이미지 생성": ["Image Generation", "Graphic Design"],
-        "영상/음성 합성": ["Video Generation and Editing", "Voice Generation", "Music Generation"],
-        "데이터 분석 및 시각화": ["Research"],
-        "업무 자동화": ["Project Management", "Scheduling", "Email"],
-        "검색 및 지식 관리": ["Search Engines", "Knowledge Management"],
-        "코드 생성 및 개발 지원": ["App Builders & Coding"],
-        "번역 및 언어 학습": ["Grammar and Writing Improvement","AI Assistants (Chatbots)"],
-        "기타": []
-    }
-    
-    for interest in interests:
-        matching_categories = interest_category_map.get(interest, [])
-        for tool in tools_data:
-            if tool.get('category') in matching_categories:
-                tool['score'] += 4
-    
-    # 4. 특정 목적 기반 점수화
-    purposes = user_responses.get('specific_purpose', [])
-    purpose_category_map = {
-        "문서 작성 및 편집": ["Writing", "Grammar and Writing Improvement","AI Assistants (Chatbots)"],
-        "이미지/영상 제작": ["Image Generation", "Video Generation and Editing","Graphic Design"],
-        "데이터 분석": ["Research"],
-        "프로그래밍 및 개발": ["App Builders & Coding"],
-        "영문이력서 작성": ["Resume Builders", "Writing", "AI Assistants (Chatbots)"],
-        "마케팅 및 홍보": ["Marketing", "Social Media Management"],
-        "교육 및 학습": ["Knowledge Management","Search Engines"],
-        "업무 자동화": ["Project Management", "Scheduling", "Email"],
-        "고객 서비스": ["Customer Service"],
-        "연구 및 논문 작성": ["Research", "Writing","Search Engines","AI Assistants (Chatbots)"],
-        "기타": []
-    }
-    
-    for purpose in purposes:
-        matching_categories = purpose_category_map.get(purpose, [])
-        for tool in tools_data:
-            if tool.get('category') in matching_categories:
-                tool['score'] += 4
-    
-    # 5. 직업 기반 점수화 (추가됨)
-    job = user_responses.get('job', '')
-    job_category_map = {
-        "학생": ["Writing", "Research", "Grammar and Writing Improvement", "Knowledge Management"],
-        "개발자/IT 종사자": ["App Builders & Coding", "AI Assistants (Chatbots)"],
-        "교육자/연구원": ["Research", "Knowledge Management", "Presentations", "Writing"],
-        "디자이너/창작자": ["Image Generation", "Video Generation and Editing", "Graphic Design", "Music Generation"],
-        "마케터/홍보": ["Social Media Management", "Marketing", "Writing", "Image Generation"],
-        "사무직": ["Email", "Project Management", "Scheduling", "Writing"],
-        "경영/관리자": ["Project Management", "Knowledge Management", "Presentations"],
-        "창업가/프리랜서": ["Marketing", "Social Media Management", "Email", "Customer Service"],
-        "의료/건강 종사자": ["Research", "Knowledge Management"],
-        "법률/금융 전문가": ["Research", "Grammar and Writing Improvement", "Writing"],
-        "기타": []
-    }
-    
-    if job:
-        matching_categories = job_category_map.get(job, [])
-        for tool in tools_data:
-            if tool.get('category') in matching_categories:
-                tool['score'] += 5  # 직업 관련성이 높은 도구에 더 높은 가중치 부여
-    
-    # 도구 설명이 있는 도구에 가중치 부여
-    for tool in tools_data:
-        if tool.get('description') and len(str(tool.get('description'))) > 10:
-            tool['score'] += 1
-    
-    # 최종 점수 기준 정렬 및 상위 추천
-    sorted_tools = sorted(tools_data, key=lambda x: x.get('score', 0), reverse=True)
-    
-    # 최소한 하나의 쉬운 도구가 포함되도록 보장 (초보자를 위한 배려)
-    recommended = []
-    has_easy_tool = False
-    
-    # 상위 도구들 중에서 선택
-    for tool in sorted_tools:
-        if len(recommended) < max_recommendations:
-            recommended.append(tool)
-            if tool.get('difficulty') == 'low':
-                has_easy_tool = True
-        elif not has_easy_tool and tool.get('difficulty') == 'low':
-            # 쉬운 도구가 없으면 마지막 도구를 쉬운 도구로 교체
-            recommended[-1] = tool
-            has_easy_tool = True
-            break
-    
-    return recommended
-
-def translate_difficulty(difficulty):
-    """난이도 영어 표현을 한국어로 변환"""
-    if difficulty == "low":
-        return "쉬움"
-    elif difficulty == "medium":
-        return "중간"
-    elif difficulty == "hard":
-        return "어려움"
-    return "중간"  # 기본값
-
-def add_korean_description(tools):
-    """영어 설명이 있는 도구에 한국어 설명 추가"""
-    korean_descriptions = {
-        "ChatGPT": "다양한 텍스트 생성과 대화가 가능한 OpenAI의 대표적인 AI 챗봇으로, 코딩, 글쓰기, 질문 응답 등 다양한 작업에 활용할 수 있습니다.",
-        "Claude": "Anthropic에서 개발한 AI 어시스턴트로, 친절하고 정확한 응답과 특히 코딩에 강점을 가지고 있습니다.",
-        "Gemini": "Google에서 개발한 AI 어시스턴트로 구글 생태계와 높은 통합성을 가지고 있으며 검색과 정보 요약에 강점이 있습니다.",
-        "Midjourney": "텍스트 프롬프트를 기반으로 고품질 이미지를 생성하는 AI 도구로, 예술적 표현과 창의적인 시각화에 탁월합니다.",
-        "Perplexity": "다양한 정보 소스를 활용해 깊이 있는 검색과 답변을 제공하는 AI 검색 엔진입니다.",
-        "Grammarly": "텍스트 작성 시 문법, 맞춤법, 문체를 자동으로 교정해주는 AI 글쓰기 도우미입니다.",
-        "Canva Magic Studio": "손쉬운 디자인 제작을 위한 AI 기능이 강화된 그래픽 디자인 플랫폼입니다.",
-    }
-    
-    for tool in tools:
-        if tool.get("name") in korean_descriptions and (tool.get("description") is None or "Korean" not in tool.get("lang", [])):
-            tool["korean_description"] = korean_descriptions[tool.get("name")]
-    
-    return tools
+EXPERT_EXPLANATIONS_MAX = 10  # 세션별로 보관하는 전문가 설명 수
+
+@st.cache_resource
+def get_shared_llm():
+    """모든 세션이 공유하는 LLM 클라이언트 (재실행마다 새로 만들지 않음)"""
+    return get_llm(temperature=0.3)
+
+@st.cache_resource
+def get_feedback_aggregates():
+    """모든 세션이 공유하는 평점 집계 (스냅샷에서 바로 로드)"""
+    return load_feedback_aggregates()
 
-def generate_expert_explanation_by_sections(tool_name, qa_system, st):
+@st.cache_resource
+def get_qa_cache():
+    """모든 세션이 공유하는 질문 의미 캐시"""
+    return SemanticQueryCache(get_embeddings())
+
+@st.cache_resource(show_spinner=False)
+def get_registry():
     """
-    AI 도구 전문가의 도구 설명을 섹션별로 나누어 생성하는 함수
-    각 섹션을 개별적으로 생성하여 응답이 중간에 끊기는 문제를 방지
+    모든 세션이 공유하는 카탈로그/인덱스 스냅샷 저장소
+    tools.json이나 인덱스가 바뀌면 백그라운드에서 새 스냅샷을 로드해 교체 (서버 재시작 불필요)
     """
-    # 사용자 타입에 맞춘 프롬프트 엔지니어링
-    user_type = ""
-    if 'responses' in st.session_state:
-        job = st.session_state.responses.get('job', '')
-        ai_knowledge = st.session_state.responses.get('ai_knowledge', '')
-        
-        if job:
-            user_type += f" {job}로서"
-        
-        if ai_knowledge in ['전혀 모른다', '이름만 들어봤다']:
-            user_type += " AI 초보자를 위한"
-        elif ai_knowledge in ['AI 모델이나 알고리즘을 직접 다뤄본 적 있다']:
-            user_type += " AI 전문가를 위한"
-    
-    # 섹션 정의
-    sections = [
-        {
-            "emoji": "✨",
-            "title": f"{tool_name}이란?",
-            "prompt": f"{tool_name}의 핵심 기능과 목적을 간결하게 설명해주세요. 2-3문장으로 요약해주세요."
-        },
-        {
-            "emoji": "🚀",
-            "title": "주요 기능",
-            "prompt": f"{tool_name}의 가장 인기 있는 3-5가지 핵심 기능을 간략히 설명해주세요."
-        },
-        {
-            "emoji": "🔄",
-            "title": "유사한 대체 도구",
-            "prompt": f"{tool_name}과 비슷한 기능을 가진 다른 도구 1-2개와 간략한 비교를 해주세요."
-        }
-    ]
-    
-    # 각 섹션별로 응답 생성
+    return ArtifactRegistry(embeddings=get_embeddings())
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def get_filtered_catalog(version, _table, difficulty_level, category, search_term, sort_by, descending):
+    """스냅샷 버전과 필터 조건별로 필터링·정렬한 카탈로그 테이블 (버전이 바뀌면 새로 계산)"""
+    table = filter_catalog(_table, difficulty_level, category, search_term)
+    return sort_catalog(table, sort_by, descending)
+
+@st.cache_resource
+def get_history_store():
+    """모든 세션이 공유하는 질문 기록 저장소 (오래된 기록과 만료 세션 관리)"""
+    return HistoryStore()
+
+@st.cache_resource
+def get_job_queue():
+    """모든 세션이 공유하는 LLM 작업 큐 (작업자 수와 대기 작업 수 제한)"""
+    return JobQueue()
+
+def render_expert_sections(sections):
+    """세션 상태에 저장된 전문가 설명 섹션을 LLM 호출 없이 다시 표시"""
     for section in sections:
         st.markdown(f"### {section['emoji']} {section['title']}")
-        with st.spinner(f"{section['title']} 정보를 생성 중..."):
-            try:
-                # 섹션별 프롬프트 생성
-                section_prompt = f"""
-                당신은 AI 도구 전문가입니다.{user_type} 다음 질문에 한국어로 답변해주세요:
-                
-                {section["prompt"]}
-                
-                답변은 반드시 한국어로만, 간결하게 작성하세요. 불확실한 정보는 제공하지 마세요.
-                """
-                
-                # 응답 생성 (LangChain 버전에 따라 run 또는 invoke 사용)
-                try:
-                    # 최신 LangChain 버전용
-                    section_response = qa_system.invoke(section_prompt)
-                    if isinstance(section_response, dict) and "result" in section_response:
-                        section_result = section_response["result"]
-                    else:
-                        section_result = str(section_response)
-                except:
-                    # 이전 LangChain 버전용
-                    section_result = qa_system.run(section_prompt)
-                
-                # 응답이 너무 짧은 경우 대체 텍스트 제공
-                if len(section_result.strip()) < 20:
-                    section_result = f"{tool_name}에 대한 이 정보는 현재 데이터베이스에서 충분히 찾을 수 없습니다."
-                
-                # 섹션 내용 표시
-                st.markdown(section_result)
-                
-            except Exception as e:
-                st.warning(f"{section['title']} 정보 생성 중 오류 발생: {str(e)}")
-                st.markdown(f"{tool_name}에 대한 이 정보는 현재 생성할 수 없습니다.")
+        if section.get("error"):
+            st.warning(f"{section['title']} 정보 생성 중 오류 발생: {section['error']}")
+        st.markdown(section["content"])
+
+def collect_expert_job(store, cache_key):
+    """완료된 설명 작업의 결과를 세션 저장소로 옮김 (완료되었으면 True)"""
+    job = store.get(cache_key)
+    if not isinstance(job, Job) or not job.done:
+        return False
+    if job.status == "done":
+        store[cache_key] = job.result
+        # 세션당 최근 설명만 유지 (진행 중인 작업은 제외하고 오래된 것부터 삭제)
+        finished = [key for key, value in store.items() if not isinstance(value, Job)]
+        for key in finished[:-EXPERT_EXPLANATIONS_MAX]:
+            del store[key]
+    else:
+        del store[cache_key]
+        st.session_state.expert_errors[cache_key] = job.error
+    return True
+
+def poll_expert_job(cache_key):
+    """설명 작업이 끝날 때까지 완성된 섹션을 이 영역에서만 주기적으로 다시 그림"""
+    store = st.session_state.expert_explanations
+    if collect_expert_job(store, cache_key):
+        # 폴링을 멈추고 완성된 설명으로 화면 전체를 다시 그림
+        st.rerun()
+    job = store[cache_key]
+    render_expert_sections(job.partial)
+    status = "대기 중" if job.status == "queued" else "생성 중"
+    st.info(f"⏳ 다음 섹션 {status}... ({job.elapsed():.0f}초) 다른 메뉴를 계속 이용하셔도 됩니다.")
+
+def show_expert_explanation(tool_name, qa_system, snapshot, key_prefix, auto_generate=True):
+    """
+    전문가 설명을 (도구, 사용자 프로필, 인덱스 버전)별로 세션에 저장해 두고 다시 표시
+    슬라이더/검색어/필터 등 다른 위젯 변경으로 재실행될 때 LLM을 다시 호출하지 않음
+    미리 생성된 설명(precompute.py)이 있으면 먼저 보여주고, 사용자 맞춤 설명은 요청할 때만 생성
+    생성은 작업 큐에서 진행하고, 진행 중에는 완성된 섹션부터 폴링으로 표시
+    auto_generate가 False이면 버튼을 눌렀을 때만 생성
+    """
+    if 'expert_explanations' not in st.session_state:
+        st.session_state.expert_explanations = {}
+    if 'expert_errors' not in st.session_state:
+        st.session_state.expert_errors = {}
+    store = st.session_state.expert_explanations
+    
+    # 프롬프트에 들어가는 사용자 맥락이 같으면 같은 설명을 재사용
+    responses = st.session_state.responses if 'responses' in st.session_state else {}
+    cache_key = (tool_name, get_user_context(responses), snapshot.index_version)
+    collect_expert_job(store, cache_key)
+    
+    st.markdown("### 🤖 AI 도구 전문가의 상세 설명")
+    error = st.session_state.expert_errors.pop(cache_key, None)
+    if error:
+        st.error(f"전문가 설명 생성 중 오류가 발생했습니다: {error}")
+    
+    if isinstance(store.get(cache_key), Job):
+        st.fragment(run_every=JOB_POLL_INTERVAL)(poll_expert_job)(cache_key)
+        return
+    precomputed = snapshot.tool_content.get(tool_name)
+    if cache_key in store:
+        if not st.button("🔄 설명 다시 생성", key=f"{key_prefix}_regenerate"):
+            render_expert_sections(store[cache_key])
+            return
+    elif precomputed:
+        # 미리 생성된 설명은 LLM 호출 없이 바로 표시하고, 원하면 사용자 맞춤으로 다시 생성
+        render_expert_sections(precomputed["sections"])
+        st.caption(f"📦 미리 생성된 설명입니다 ({precomputed['generated_at'][:10]})")
+        if not st.button("🎯 내 수준에 맞춰 다시 생성", key=f"{key_prefix}_personalize"):
+            return
+    elif not auto_generate and not st.button("✨ 전문가 설명 생성", key=f"{key_prefix}_generate"):
+        return
     
-    return "설명 생성 완료"
+    try:
+        store[cache_key] = get_job_queue().submit("expert", expert_sections_job, tool_name, qa_system, dict(responses))
+    except QueueFullError:
+        st.warning("⚠️ 지금은 요청이 많아 설명을 생성할 수 없습니다. 잠시 후 다시 시도해주세요.")
+        return
+    st.fragment(run_every=JOB_POLL_INTERVAL)(poll_expert_job)(cache_key)
+
+
+def record_qa_answer(question, answer, sources, response_time, similarity=None):
+    """답변을 질문 기록에 추가하고 현재 답변으로 표시"""
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    st.session_state.qa_history.append(question, answer, response_time, timestamp)
+    st.session_state.qa_current = {
+        "question": question,
+        "answer": answer,
+        "response_time": response_time,
+        "timestamp": timestamp,
+        "sources": sources,
+        "similarity": similarity
+    }
+
+def render_qa_records(records):
+    """질문 기록 목록 표시"""
+    for qa_item in records:
+        st.markdown(f"**질문 {qa_item['seq'] + 1}**: {qa_item['question']}")
+        st.markdown(f"**답변**: {qa_item['answer']}")
+        st.caption(f"응답 시간: {qa_item['response_time']:.2f}초 | 시간: {qa_item['timestamp']}")
+        st.markdown("---")
+
+def collect_qa_job():
+    """완료된 질문 작업의 결과를 세션 상태로 옮김 (완료되었으면 True)"""
+    job = st.session_state.get("qa_job")
+    if job is None or not job.done:
+        return False
+    st.session_state.qa_job = None
+    if job.status == "done":
+        record_qa_answer(job.meta["question"], job.result["answer"], job.result["sources"], job.elapsed())
+        get_qa_cache().save_stats()
+    else:
+        st.session_state.qa_current = {"question": job.meta["question"], "error": job.error}
+    return True
+
+def poll_qa_job():
+    """질문 작업이 끝날 때까지 이 영역만 주기적으로 다시 그림 (다른 위젯은 막지 않음)"""
+    if collect_qa_job():
+        # 폴링을 멈추고 답변과 질문 기록을 화면 전체에 반영
+        st.rerun()
+    job = st.session_state.qa_job
+    status = "대기 중" if job.status == "queued" else "답변 생성 중"
+    st.info(f"⏳ {status}... ({job.elapsed():.0f}초) 답변을 기다리는 동안 다른 메뉴를 계속 이용하셔도 됩니다.")
 
 
 #========== Streamlit UI ==========
@@ -444,69 +265,35 @@ if not st.session_state.get("survey_complete", False):
 
 responses = st.session_state.responses
 
-#========== tools.txt 및 JSON 데이터 로드 ==========
-
-# PDF 파일 로드
-with st.spinner("PDF 파일 로딩 중..."):
-    try:
-        # PDF 로더 생성
-        pdf_loader = PyPDFLoader("tools.pdf")
-        # PDF 파일에서 문서 추출
-        pages = pdf_loader.load()
-        #st.success(f"✅ PDF 파일 로드 완료: {len(pages)}페이지")
-        
-        # 텍스트 분할 설정
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200,
-            length_function=len,
-        )
-        
-        # 문서 분할
-        split_docs = text_splitter.split_documents(pages)
-        #st.success(f"✅ 문서 분할 완료: {len(split_docs)}개 청크")
-    except Exception as e:
-        st.error(f"❌ PDF 파일 로드 중 오류 발생: {str(e)}")
-        st.stop()
-
-# JSON 데이터 로드
-tools_data = load_json_data()
-
 #========== 사용자 선호도에 맞는 검색 매개변수 결정 ==========
-search_kwargs = {"k": 5}  # 기본값
-
 # AI 지식 수준에 따라 검색 깊이 조정
-if responses.get('ai_knowledge') in ['전혀 모른다', '이름만 들어봤다']:
-    search_kwargs["k"] = 3  # 초보자는 더 기본적인 내용만 검색
-elif responses.get('ai_knowledge') in ['AI 모델이나 알고리즘을 직접 다뤄본 적 있다']:
-    search_kwargs["k"] = 7  # 전문가는 더 깊은 검색
+search_kwargs = get_search_kwargs(responses)
 
 #========== RAG 기반 도구 추천 ==========
-with st.spinner("벡터 데이터베이스 구축 중..."):
+with st.spinner("벡터 데이터베이스 준비 중..."):
     try:
-        # 임베딩 모델 초기화
-        embeddings = OpenAIEmbeddings()
-        
-        # 유니코드 처리를 위한 문서 정제
-        for doc in split_docs:
-            # 비ASCII 문자 처리
-            doc.page_content = re.sub(r'[\u2014\u2013\u2015\u2017\u2018\u2019\u201a\u201b\u201c\u201d\u201e\u201f\u2020\u2021\u2026\u2032\u2033]+', '-', doc.page_content)
-            # 나머지 특수 유니코드 문자 처리
-            doc.page_content = doc.page_content.encode('ascii', errors='ignore').decode('ascii')
+        # 이번 실행 동안 사용할 카탈로그/인덱스 스냅샷 (실행 도중에 새 버전이 로드되어도 끝까지 같은 버전 사용)
+        snapshot = get_registry().current()
+        vectorstore = snapshot.vectorstore
         
-        # 벡터 스토어 생성
-        vectorstore = FAISS.from_documents(split_docs, embeddings)
-        #st.success("✅ 벡터 데이터베이스 구축 완료")
+        # RAG 시스템 설정 (스냅샷 버전과 검색 깊이별로 한 번만 만들어 재사용)
+        qa = snapshot.cached(("qa_chain", search_kwargs["k"]),
+                             lambda: build_qa_chain(get_shared_llm(), vectorstore, search_kwargs))
         
-        # RAG 시스템 설정
-        qa = RetrievalQA.from_chain_type(
-            llm=OpenAI(temperature=0.3),
-            retriever=vectorstore.as_retriever(search_kwargs=search_kwargs)
-        )
+        # 질문 캐시 무효화 기준이 되는 문서 인덱스 버전
+        index_version = snapshot.index_version
     except Exception as e:
         st.error(f"❌ 벡터 데이터베이스 구축 중 오류 발생: {str(e)}")
         st.stop()
 
+# 이전 실행 이후 카탈로그나 인덱스가 교체되었으면 알림
+if st.session_state.get("artifact_version") not in (None, snapshot.version):
+    st.toast("📦 AI 도구 카탈로그가 업데이트되었습니다.")
+st.session_state.artifact_version = snapshot.version
+
+# 한국어 설명이 추가된 카탈로그 (스냅샷 로드 시 한 번 구성)
+tools_data = snapshot.tools
+
 #========== AI 유형 추천 ==========
 
 st.markdown("### 🧩 당신의 AI 유형은?")
@@ -535,12 +322,31 @@ st.markdown("---")
 #========== 알고리즘 기반 도구 추천 ==========
 st.markdown("### 🔎 당신을 위한 AI 도구 추천")
 
-# 한국어 설명 추가
-tools_data = add_korean_description(tools_data)
+# 추천 방식 선택 (설명 유사도는 카테고리 매핑에 없는 도구도 찾아냄)
+recommendation_engine = st.radio("추천 방식", ["규칙 기반", "설명 유사도 + 규칙", "설명 유사도"], horizontal=True)
 
 # 알고리즘 기반 추천
 with st.spinner("추천 생성 중입니다..."):
-    recommended_tools = recommend_tools_by_criteria(tools_data, responses, max_recommendations=3)
+    # 같은 유형 사용자들의 평점을 순위 신호로 함께 반영
+    feedback_scores = get_feedback_aggregates().ranking_signal(user_type)
+    if recommendation_engine == "규칙 기반":
+        recommended_tools = recommend_tools_by_criteria(
+            tools_data, responses, max_recommendations=3, feedback_scores=feedback_scores
+        )
+    else:
+        try:
+            tool_index, tool_embeddings = snapshot.tool_index, get_registry().embeddings
+            rule_weight = HYBRID_RULE_WEIGHT if recommendation_engine == "설명 유사도 + 규칙" else 0.0
+            recommended_tools = recommend_tools_by_embedding(
+                tools_data, responses, tool_index, tool_embeddings, max_recommendations=3,
+                rule_weight=rule_weight, feedback_scores=feedback_scores
+            )
+        except Exception as e:
+            # 임베딩을 사용할 수 없으면 규칙 기반 추천으로 대체
+            st.warning(f"설명 유사도 추천을 사용할 수 없어 규칙 기반으로 추천합니다: {str(e)}")
+            recommended_tools = recommend_tools_by_criteria(
+                tools_data, responses, max_recommendations=3, feedback_scores=feedback_scores
+            )
 
 # 추천 결과 표시
 if recommended_tools:
@@ -594,12 +400,9 @@ if hasattr(st.session_state, 'selected_tool') and st.session_state.selected_tool
         else:
             st.markdown("**설명**: 상세 설명 정보가 없습니다.")
         
-         # AI 도구 전문가의 설명 생성 (섹션별로 분리)
+         # AI 도구 전문가의 설명 (처음 열 때만 생성하고 이후에는 세션에 저장된 내용 표시)
         try:
-            st.markdown("### 🤖 AI 도구 전문가의 상세 설명")
-            with st.spinner(f"{tool_name}에 관한 상세 정보 분석 중..."):
-                # 새로운 함수 호출 (섹션별 생성)
-                generate_expert_explanation_by_sections(tool_name, qa, st)
+            show_expert_explanation(tool_name, qa, snapshot, key_prefix="selected_tool")
         
         except Exception as e:
             st.error(f"전문가 설명 생성 중 오류 발생: {e}")
@@ -635,6 +438,7 @@ st.markdown("---")
 st.markdown("### 🔍 AI 도구 데이터베이스 탐색")
 
 if tools_data:
+    catalog_table = snapshot.catalog_table
     col1, col2, col3 = st.columns(3)
     
     with col1:
@@ -644,36 +448,43 @@ if tools_data:
     
     with col2:
         # 카테고리별 필터링
-        categories = ["모든 카테고리"] + sorted(list(set([tool.get("category", "기타") for tool in tools_data if tool.get("category")])))
+        categories = ["모든 카테고리"] + list_categories(catalog_table)
         selected_category = st.selectbox("카테고리별 필터링", categories)
     
     with col3:
         # 검색어 필터링
         search_term = st.text_input("🔍 도구 이름 또는 설명 검색")
     
-    # 필터링 적용
-    filtered_tools = filter_tools_by_difficulty(tools_data, selected_difficulty)
-    filtered_tools = filter_tools_by_category(filtered_tools, selected_category)
-    filtered_tools = filter_tools_by_search(filtered_tools, search_term)
-    
     # 카테고리별 도구 분포 시각화
     with st.expander("📊 AI 도구 카테고리 분포 그래프로 보기", expanded=False):
         fig = visualize_category_distribution(tools_data)
         st.pyplot(fig)
     
-    # 필터링된 도구 리스트
+    # 필터링된 도구 리스트 (정렬/페이지 나누기는 서버에서 처리하고 한 페이지만 표시)
     st.markdown("### 📋 필터링된 도구 목록")
-    if filtered_tools:
-        tool_df = pd.DataFrame([{
-            "이름": tool.get("name", ""),
-            "카테고리": tool.get("category", ""),
-            "난이도": translate_difficulty(tool.get("difficulty", "medium"))
-        } for tool in filtered_tools])
-        
-        st.dataframe(tool_df, use_container_width=True)
+    sort_col1, sort_col2, sort_col3 = st.columns(3)
+    with sort_col1:
+        sort_by = st.selectbox("정렬 기준", list(SORT_COLUMNS))
+    with sort_col2:
+        descending = st.toggle("내림차순", value=False)
+    with sort_col3:
+        page_size = st.selectbox("페이지당 도구 수", [25, 50, 100])
+    
+    filtered_table = get_filtered_catalog(snapshot.version, catalog_table, selected_difficulty, selected_category,
+                                          search_term, sort_by, descending)
+    
+    if filtered_table.num_rows:
+        total_pages = page_count(filtered_table, page_size)
+        catalog_page = st.number_input(f"페이지 (전체 {total_pages}쪽, {filtered_table.num_rows}개 도구)",
+                                       min_value=1, max_value=total_pages, value=1)
+        st.dataframe(pd.DataFrame(get_page(filtered_table, catalog_page, page_size)), use_container_width=True)
         
-        # 도구 상세 정보 확인
-        selected_tool_name = st.selectbox("상세 정보를 볼 도구 선택", ["선택하세요"] + tool_df["이름"].tolist())
+        # 도구 상세 정보 확인 (입력한 글자와 일치하는 도구만 후보로 표시)
+        tool_query = st.text_input("상세 정보를 볼 도구 이름 입력", placeholder="예: Chat")
+        suggestions = suggest_names(filtered_table, tool_query)
+        if tool_query and not suggestions:
+            st.caption("일치하는 도구가 없습니다.")
+        selected_tool_name = st.selectbox("상세 정보를 볼 도구 선택", ["선택하세요"] + suggestions)
         
         if selected_tool_name != "선택하세요":
             tool_info = get_tool_details(selected_tool_name, tools_data)
@@ -690,12 +501,9 @@ if tools_data:
                 else:
                     st.markdown("**기본 설명**: 상세 설명 정보가 없습니다.")
                 
-                # AI 도구 전문가의 설명 생성 (섹션별로 분리)
+                # AI 도구 전문가의 설명 (탐색 중에는 버튼을 눌렀을 때만 생성)
                 try:
-                    st.markdown("### 🤖 AI 도구 전문가의 상세 설명")
-                    with st.spinner(f"{selected_tool_name}에 관한 상세 정보 분석 중..."):
-                        # 새로운 함수 호출 (섹션별 생성)
-                        generate_expert_explanation_by_sections(selected_tool_name, qa, st)
+                    show_expert_explanation(selected_tool_name, qa, snapshot, key_prefix="explorer", auto_generate=False)
                 
                 except Exception as e:
                     st.error(f"전문가 설명 생성 중 오류 발생: {e}")
@@ -712,7 +520,11 @@ if feedback_tool:
     feedback_text = st.text_area("상세 피드백 (선택사항)")
     
     if st.button("피드백 제출"):
-        if save_user_feedback(feedback_tool, rating, feedback_text):
+        # 입력한 이름을 카탈로그의 도구 이름으로 맞춰 집계가 흩어지지 않도록 함
+        matched_tool = find_best_matching_tool(feedback_tool, tools_data)
+        feedback_tool_name = matched_tool["name"] if matched_tool else feedback_tool
+        if save_user_feedback(feedback_tool_name, rating, feedback_text, st.session_state.responses,
+                              aggregates=get_feedback_aggregates()):
             st.success("피드백이 성공적으로 저장되었습니다. 감사합니다!")
         else:
             st.error("피드백 저장 중 오류가 발생했습니다.")
@@ -722,78 +534,81 @@ st.markdown("---")
 st.markdown("### 🤖 AI 도구에 대해 질문하기")
 st.write("AI 도구 전문가가 답변해 드립니다.")
 
-# 세션 상태에 질문-답변 저장
+# 세션 상태에 질문-답변 저장 (최근 기록만 메모리에, 오래된 기록은 서버 측 저장소에)
 if 'qa_history' not in st.session_state:
-    st.session_state.qa_history = []
+    st.session_state.qa_history = SessionHistory(get_history_store())
+st.session_state.qa_history.touch()
+get_history_store().maybe_expire()
+
+QA_HISTORY_PAGE_SIZE = 10
 
 user_question = st.text_input("AI 도구에 관한 질문을 입력하세요", placeholder="예: ChatGPT의 주요 기능은 무엇인가요?")
 
-if user_question:
-    with st.spinner("답변 생성 중..."):
-        try:
-            # 응답 시간 측정 시작
-            start_time = time.time()
-            
-            # 질문 전처리 (유니코드 문자 처리)
-            clean_question = re.sub(r'[\u2014\u2013\u2015\u2017\u2018\u2019\u201a\u201b\u201c\u201d\u201e\u201f\u2020\u2021\u2026\u2032\u2033]+', '-', user_question)
-            clean_question = clean_question.encode('ascii', errors='ignore').decode('ascii')
-            
-            # 질문에 대한 컨텍스트 정보
-            context_prompt = f"""
-            당신은 AI 도구 추천 전문가입니다. 사용자의 질문에 정확하고 친절하게 답변해주세요.
-            답변은 반드시 한국어로 제공해야 합니다. 사용자의 수준과 직업을 고려하여 적절한 깊이로 설명해주세요.
-            
-            가능하다면 다음 형식으로 답변해주세요:
-            1. 직접적인 질문 답변
-            2. 추가 상세 정보나 팁
-            3. 관련 도구나 활용법 추천
-            질문: {clean_question}
-            """
-            
-            # RAG 시스템으로 질문 처리
-            answer = qa.run(context_prompt)
-            
-            # 응답 시간 측정 종료
-            response_time = time.time() - start_time
-            
-            # 결과 저장
-            qa_result = {
-                "question": user_question,
-                "answer": answer,
-                "response_time": response_time,
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "rated": False
-            }
-            
-            # 세션 상태에 저장
-            st.session_state.qa_history.append(qa_result)
-            
-            st.markdown("### 📝 답변")
-            st.markdown(answer)
-            
-            # 응답 시간 표시
-            st.caption(f"응답 시간: {response_time:.2f}초")
-            
-            # 관련 문서 표시
-            docs = vectorstore.similarity_search(clean_question, k=2)
-            
-            with st.expander("참고 자료", expanded=False):
-                st.markdown("### 📄 참고한 문서")
-                for i, doc in enumerate(docs):
-                    st.markdown(f"**출처 #{i+1} (페이지 {doc.metadata.get('page', '알 수 없음')+1})**")
-                    st.markdown(doc.page_content)
-            
-        except Exception as e:
-            st.error(f"답변 생성 중 오류가 발생했습니다: {str(e)}")
+# 새 질문일 때만 처리 (다른 위젯 변경으로 재실행될 때 같은 질문을 다시 보내지 않음)
+if user_question and user_question != st.session_state.get("qa_question"):
+    try:
+        # 의미가 비슷한 이전 질문이 있으면 LLM 호출 없이 캐시된 답변 바로 사용
+        # (캐시는 원래 질문으로 찾고, LLM에 보내는 질문의 유니코드 정제는 작업에서 처리)
+        start_time = time.time()
+        qa_cache = get_qa_cache()
+        cached = qa_cache.lookup(user_question, index_version, search_kwargs["k"])
+        if cached:
+            record_qa_answer(user_question, cached["answer"], cached["sources"],
+                             time.time() - start_time, cached["similarity"])
+            qa_cache.save_stats()
+        else:
+            # RAG 시스템 질의는 작업 큐에서 처리
+            job = get_job_queue().submit("qa", question_job, qa, vectorstore, user_question, qa_cache, index_version,
+                                         search_kwargs["k"])
+            job.meta["question"] = user_question
+            st.session_state.qa_job = job
+            st.session_state.qa_current = None
+        st.session_state.qa_question = user_question
+    except QueueFullError:
+        st.warning("⚠️ 지금은 질문이 많아 답변을 생성할 수 없습니다. 잠시 후 다시 시도해주세요.")
+    except Exception as e:
+        st.error(f"답변 생성 중 오류가 발생했습니다: {str(e)}")
+
+collect_qa_job()
+current = st.session_state.get("qa_current") if user_question else None
+
+if user_question and st.session_state.get("qa_job") is not None:
+    st.fragment(run_every=JOB_POLL_INTERVAL)(poll_qa_job)()
+elif current and "error" in current:
+    st.error(f"답변 생성 중 오류가 발생했습니다: {current['error']}")
+elif current:
+    st.markdown("### 📝 답변")
+    st.markdown(current["answer"])
+    
+    # 응답 시간 표시
+    if current["similarity"] is not None:
+        st.caption(f"응답 시간: {current['response_time']:.2f}초 | 💾 캐시된 답변 (유사도 {current['similarity']:.2f})")
+    else:
+        st.caption(f"응답 시간: {current['response_time']:.2f}초")
+    
+    # 관련 문서 표시
+    with st.expander("참고 자료", expanded=False):
+        st.markdown("### 📄 참고한 문서")
+        for i, source in enumerate(current["sources"]):
+            source_page = source["page"] + 1 if source["page"] is not None else "알 수 없음"
+            st.markdown(f"**출처 #{i+1} (페이지 {source_page})**")
+            st.markdown(source["content"])
 
 # 이전 질문-답변 기록 표시
-if st.session_state.qa_history:
+qa_history = st.session_state.qa_history
+if len(qa_history):
     with st.expander("이전 질문 기록", expanded=False):
-        for i, qa_item in enumerate(reversed(st.session_state.qa_history[:-1] if user_question else st.session_state.qa_history)):
-            st.markdown(f"**질문 {i+1}**: {qa_item['question']}")
-            st.markdown(f"**답변**: {qa_item['answer']}")
-            st.caption(f"응답 시간: {qa_item['response_time']:.2f}초 | 시간: {qa_item['timestamp']}")
-            st.markdown("---")
+        recent = qa_history.recent()
+        # 위에 표시 중인 현재 답변은 제외
+        render_qa_records(recent[1:] if current and "answer" in current else recent)
+        
+        # 메모리에서 내보낸 오래된 기록은 요청할 때만 페이지 단위로 불러옴
+        if qa_history.older_count:
+            if st.toggle(f"더 오래된 기록 보기 ({qa_history.older_count}개)", key="qa_history_older"):
+                history_pages = (qa_history.older_count + QA_HISTORY_PAGE_SIZE - 1) // QA_HISTORY_PAGE_SIZE
+                history_page = st.number_input("페이지", min_value=1, max_value=history_pages, value=1,
+                                               key="qa_history_page")
+                render_qa_records(qa_history.older_page(history_page - 1, QA_HISTORY_PAGE_SIZE))
 
 
 st.markdown("---")
@@ -0,0 +1,153 @@
+# precompute.py
+# 카탈로그의 모든 도구에 대한 전문가 설명 섹션("이란?", "주요 기능", "유사한 대체 도구")과
+# 한국어 소개 문구를 오프라인으로 미리 생성해 버전별 결과 파일로 저장
+#
+#   tool_content/<버전>.json  도구별 생성 결과 (참고 청크 해시 포함)
+#   tool_content/LATEST       현재 사용하는 결과 파일 이름
+#
+# 각 프롬프트가 검색하는 참고 청크와 프롬프트로 도구별 해시를 계산해, 이전 결과와 해시가 같은 도구는
+# 그대로 재사용하고 바뀐 도구만 다시 생성함. 생성은 배치 단위로 스레드 풀에서 병렬 실행
+# (OpenAI 호출 제한과 재시도는 llm_client가 처리)
+#
+# 사용법:
+#   python precompute.py
+#   python precompute.py --workers 8 --batch-size 16
+#   python precompute.py --embeddings local --fake-llm   (API 키 없이 동작 확인)
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from ingest import INDEX_SOURCES, ensure_index, write_atomic
+from rag import (
+    build_korean_description_prompt, build_qa_chain, generate_expert_sections, generate_section,
+    get_embeddings, get_expert_sections, get_search_kwargs
+)
+from recommend import load_json_data
+
+TOOL_CONTENT_DIR = "tool_content"
+LATEST_FILE = "LATEST"
+
+#========== 결과 파일 ==========
+def load_tool_content(content_dir=TOOL_CONTENT_DIR):
+    """LATEST가 가리키는 미리 생성된 결과 (도구 이름 → 항목, 없으면 빈 dict)"""
+    latest_path = os.path.join(content_dir, LATEST_FILE)
+    if not os.path.exists(latest_path):
+        return {}
+    with open(latest_path, "r", encoding="utf-8") as f:
+        filename = f.read().strip()
+    with open(os.path.join(content_dir, filename), "r", encoding="utf-8") as f:
+        return json.load(f)["tools"]
+
+def save_tool_content(entries, version, content_dir=TOOL_CONTENT_DIR):
+    """버전별 결과 파일을 쓰고 LATEST를 원자적으로 교체"""
+    os.makedirs(content_dir, exist_ok=True)
+    filename = f"{version}.json"
+    path = os.path.join(content_dir, filename)
+    data = {"version": version, "created_at": datetime.now().isoformat(timespec="seconds"), "tools": entries}
+    write_atomic(path, lambda f: json.dump(data, f, ensure_ascii=False, indent=2))
+    write_atomic(os.path.join(content_dir, LATEST_FILE), lambda f: f.write(filename))
+    return path
+
+#========== 변경 감지 ==========
+def get_source_hash(tool_name, vectorstore, k):
+    """도구의 프롬프트들과 각 프롬프트가 검색하는 참고 청크로 계산한 해시"""
+    digest = hashlib.sha256()
+    prompts = [section["prompt"] for section in get_expert_sections(tool_name, {})]
+    prompts.append(build_korean_description_prompt(tool_name))
+    for prompt in prompts:
+        digest.update(prompt.encode("utf-8"))
+        for doc in vectorstore.similarity_search(prompt, k=k):
+            digest.update(doc.page_content.encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+#========== 생성 ==========
+def generate_tool_content(tool_name, qa_system, source_hash):
+    """
+    도구 하나의 전문가 설명 섹션(일반 사용자 기준)과 한국어 소개 문구 생성
+    소개 문구 생성이 실패하면 섹션처럼 error를 기록해 다음 실행에서 다시 생성
+    """
+    description_section = {"prompt": build_korean_description_prompt(tool_name)}
+    try:
+        korean_description = generate_section(tool_name, description_section, qa_system).strip()
+        error = None
+    except Exception as e:
+        korean_description = None
+        error = str(e)
+    return {
+        "name": tool_name,
+        "source_hash": source_hash,
+        "korean_description": korean_description,
+        "error": error,
+        "sections": generate_expert_sections(tool_name, qa_system, {}),
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+    }
+
+def has_error(entry):
+    """소개 문구나 섹션 중 생성에 실패한 것이 있는지"""
+    return bool(entry.get("error")) or any(section.get("error") for section in entry["sections"])
+
+def precompute(tools, vectorstore, llm, content_dir=TOOL_CONTENT_DIR, workers=4, batch_size=8, force=False):
+    """
+    바뀐 도구만 배치 단위로 병렬 생성하고 새 버전으로 저장 (재생성 수, 재사용 수, 결과 파일 경로 반환)
+    배치가 끝날 때마다 저장하므로 중간에 멈춰도 생성한 결과는 남고, 다음 실행에서 나머지만 생성
+    """
+    search_kwargs = get_search_kwargs({})
+    qa_system = build_qa_chain(llm, vectorstore, search_kwargs)
+    previous = {} if force else load_tool_content(content_dir)
+
+    names = list(dict.fromkeys(tool["name"] for tool in tools))
+    hashes = {name: get_source_hash(name, vectorstore, search_kwargs["k"]) for name in names}
+    entries = {name: previous[name] for name in names
+               if name in previous and previous[name]["source_hash"] == hashes[name]
+               and not has_error(previous[name])}
+    todo = [name for name in names if name not in entries]
+    version = hashlib.sha256("".join(f"{name}:{hashes[name]}" for name in names).encode("utf-8")).hexdigest()[:12]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for batch_start in range(0, len(todo), batch_size):
+            batch = todo[batch_start:batch_start + batch_size]
+            for entry in executor.map(lambda name: generate_tool_content(name, qa_system, hashes[name]), batch):
+                entries[entry["name"]] = entry
+            done = batch_start + len(batch)
+            # 아직 생성하지 않은 도구는 이전 결과를 그대로 둠 (해시가 달라 다음 실행에서 다시 생성됨)
+            save_tool_content({name: entries.get(name, previous.get(name)) for name in names
+                              if name in entries or name in previous}, version, content_dir)
+            print(f"  {done}/{len(todo)}개 도구 생성 ({time.perf_counter() - start:.1f}초)")
+
+    path = save_tool_content({name: entries[name] for name in names}, version, content_dir)
+    return len(todo), len(names) - len(todo), path
+
+def main():
+    parser = argparse.ArgumentParser(description="도구별 한국어 설명 미리 생성")
+    parser.add_argument("--tools", default="tools.json")
+    parser.add_argument("--content-dir", default=TOOL_CONTENT_DIR)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--force", action="store_true", help="변경 여부와 관계없이 모두 다시 생성")
+    parser.add_argument("--embeddings", default=None, help="openai 또는 local (기본: EMBEDDING_BACKEND)")
+    parser.add_argument("--fake-llm", action="store_true", help="OpenAI 대신 로컬 가짜 LLM 사용")
+    args = parser.parse_args()
+
+    if args.fake_llm:
+        from local_models import FakeLLM
+        llm = FakeLLM(response="미리 생성 동작 확인용 가짜 응답입니다. 실제 설명은 OpenAI LLM으로 생성하세요.")
+    else:
+        from dotenv import load_dotenv
+        from llm_client import get_llm
+        load_dotenv()
+        llm = get_llm(temperature=0.3)
+
+    tools = load_json_data(args.tools)
+    vectorstore, _ = ensure_index(INDEX_SOURCES, get_embeddings(args.embeddings))
+    generated, reused, path = precompute(tools, vectorstore, llm, args.content_dir, args.workers,
+                                         args.batch_size, args.force)
+    print(f"✅ 생성 {generated}개, 재사용 {reused}개: {path}")
+
+if __name__ == "__main__":
+    main()
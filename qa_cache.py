@@ -0,0 +1,116 @@
+# qa_cache.py
+# 자유 질문(Q&A) 앞단의 의미 기반 캐시 - 비슷한 질문이면 LLM 호출 없이 이전 답변 재사용
+# 캐시 키는 사용자가 입력한 원래 질문(한국어 포함)으로 만듦
+# (clean_text는 비ASCII 문자를 모두 지우므로 LLM에 보낼 질문에만 사용)
+
+import json
+import re
+import threading
+
+import faiss
+import numpy as np
+
+#========== 질문 정규화 ==========
+def normalize_question(question):
+    """공백/문장부호/대소문자 차이를 없앤 질문 문자열 (한국어 등 유니코드 문자는 유지)"""
+    question = question.strip().lower()
+    question = re.sub(r"[^\w\s]", " ", question)
+    return re.sub(r"\s+", " ", question).strip()
+
+#========== 의미 기반 캐시 ==========
+class SemanticQueryCache:
+    """질문 임베딩의 코사인 유사도로 이전 답변과 참고 문서를 찾는 캐시"""
+
+    def __init__(self, embeddings, threshold=0.92, max_entries=1000, search_width=8):
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.search_width = search_width  # 검색 깊이(k)가 다른 항목을 건너뛰기 위해 함께 살펴볼 후보 수
+        self.index_version = None
+        self._entries = []
+        self._index = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _embed(self, question):
+        vector = np.array([self.embeddings.embed_query(normalize_question(question))], dtype=np.float32)
+        faiss.normalize_L2(vector)  # 내적 = 코사인 유사도
+        return vector
+
+    def _reset(self, dim=None):
+        self._entries = []
+        self._index = faiss.IndexFlatIP(dim) if dim else None
+
+    def _check_version(self, index_version):
+        """문서 인덱스 버전이 바뀌면 캐시 전체 무효화"""
+        if index_version != self.index_version:
+            if self._entries:
+                self.invalidations += 1
+            self.index_version = index_version
+            self._reset()
+
+    def lookup(self, question, index_version, k=None):
+        """검색 깊이(k)가 같고 유사한 이전 질문이 있으면 캐시 항목 반환, 없으면 None"""
+        vector = self._embed(question)
+        with self._lock:
+            self._check_version(index_version)
+            if self._index is None or self._index.ntotal == 0:
+                self.misses += 1
+                return None
+
+            scores, ids = self._index.search(vector, min(self.search_width, self._index.ntotal))
+            for score, i in zip(scores[0], ids[0]):
+                if i < 0 or score < self.threshold:
+                    break
+                entry = self._entries[i]
+                if entry["k"] != k:
+                    continue
+                self.hits += 1
+                return {
+                    "question": entry["question"],
+                    "answer": entry["answer"],
+                    "sources": entry["sources"],
+                    "similarity": float(score),
+                }
+            self.misses += 1
+            return None
+
+    def store(self, question, answer, sources, index_version, k=None):
+        """새 질문(원래 입력)의 답변과 참고 문서(dict 목록)를 검색 깊이(k)와 함께 저장"""
+        vector = self._embed(question)
+        with self._lock:
+            self._check_version(index_version)
+            if self._index is None:
+                self._reset(vector.shape[1])
+
+            # 용량 초과 시 오래된 절반을 버리고 인덱스 재구성
+            if len(self._entries) >= self.max_entries:
+                kept = self._entries[len(self._entries) // 2:]
+                self._reset(vector.shape[1])
+                for entry in kept:
+                    self._index.add(entry["vector"])
+                self._entries = kept
+
+            self._entries.append({"question": question, "answer": answer, "sources": sources, "k": k,
+                                  "vector": vector})
+            self._index.add(vector)
+
+    def stats(self):
+        """적중률 등 캐시 지표"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "entries": len(self._entries),
+                "invalidations": self.invalidations,
+                "index_version": self.index_version,
+            }
+
+    def save_stats(self, path="qa_cache_stats.json"):
+        """캐시 지표를 JSON 파일로 저장"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.stats(), f, ensure_ascii=False, indent=2)
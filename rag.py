@@ -0,0 +1,210 @@
+# rag.py
+
+import hashlib
+import os
+import re
+from langchain.chains import RetrievalQA
+from langchain_community.document_loaders import PyPDFLoader
+from langchain_community.vectorstores import FAISS
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+from tool_splitter import TOOL_CHUNK_SIZE, ToolSectionSplitter, load_tool_categories
+
+# 임베딩 전에 '-'로 치환할 특수 유니코드 문자 (대시, 따옴표, 말줄임표 등)
+SPECIAL_CHAR_PATTERN = re.compile(r'[\u2014\u2013\u2015\u2017\u2018\u2019\u201a\u201b\u201c\u201d\u201e\u201f\u2020\u2021\u2026\u2032\u2033]+')
+
+# 분할 방식별 기본 청크 크기
+DEFAULT_CHUNK_SIZES = {"recursive": 1000, "tool": TOOL_CHUNK_SIZE}
+
+#========== 텍스트 정제 ==========
+def clean_text(text):
+    """특수 유니코드 문자를 치환하고 비ASCII 문자 제거"""
+    text = SPECIAL_CHAR_PATTERN.sub('-', text)
+    return text.encode('ascii', errors='ignore').decode('ascii')
+
+#========== 문서 로드 및 분할 ==========
+def load_pdf_pages(path="tools.pdf"):
+    """PDF 파일을 페이지 단위 문서로 로드"""
+    pdf_loader = PyPDFLoader(path)
+    return pdf_loader.load()
+
+def get_text_splitter(strategy="recursive", chunk_size=None, chunk_overlap=200):
+    """
+    분할 방식에 맞는 분할기 (chunk_size가 없으면 분할 방식별 기본값)
+      recursive: 글자 수 기준 RecursiveCharacterTextSplitter
+      tool: 카테고리/도구 제목 기준 ToolSectionSplitter (chunk_size는 도구 하나의 최대 청크 크기, 겹침 없음)
+    """
+    chunk_size = chunk_size or DEFAULT_CHUNK_SIZES.get(strategy)
+    if strategy == "tool":
+        return ToolSectionSplitter(load_tool_categories(), max_chunk_size=chunk_size)
+    if strategy != "recursive":
+        raise ValueError(f"알 수 없는 분할 방식: {strategy} (recursive 또는 tool)")
+    return RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        length_function=len,
+    )
+
+def split_documents(pages, chunk_size=None, chunk_overlap=200, strategy="recursive"):
+    """페이지 문서를 검색용 청크로 분할"""
+    return get_text_splitter(strategy, chunk_size, chunk_overlap).split_documents(pages)
+
+def clean_documents(docs):
+    """유니코드 처리를 위한 문서 정제 (문서를 직접 수정)"""
+    for doc in docs:
+        doc.page_content = clean_text(doc.page_content)
+    return docs
+
+#========== 임베딩 백엔드 ==========
+def get_embeddings(backend=None):
+    """임베딩 백엔드 선택 (openai 또는 오프라인 local)"""
+    backend = backend or os.getenv("EMBEDDING_BACKEND", "openai")
+    if backend == "local":
+        from local_models import HashingEmbeddings
+        return HashingEmbeddings()
+    if backend == "openai":
+        from llm_client import get_openai_embeddings
+        return get_openai_embeddings()
+    raise ValueError(f"알 수 없는 임베딩 백엔드: {backend}")
+
+#========== 벡터 스토어 및 QA ==========
+def get_index_version(source_paths, **params):
+    """원본 파일 내용과 분할 설정으로 문서 인덱스 버전 문자열 계산"""
+    digest = hashlib.sha256()
+    for path in source_paths:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    digest.update(repr(sorted(params.items())).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+def build_vectorstore(docs, embeddings):
+    """분할된 문서로 FAISS 벡터 스토어 생성"""
+    return FAISS.from_documents(docs, embeddings)
+
+def get_search_kwargs(responses):
+    """AI 지식 수준에 따라 검색 깊이(k) 결정"""
+    search_kwargs = {"k": 5}  # 기본값
+
+    if responses.get('ai_knowledge') in ['전혀 모른다', '이름만 들어봤다']:
+        search_kwargs["k"] = 3  # 초보자는 더 기본적인 내용만 검색
+    elif responses.get('ai_knowledge') in ['AI 모델이나 알고리즘을 직접 다뤄본 적 있다']:
+        search_kwargs["k"] = 7  # 전문가는 더 깊은 검색
+
+    return search_kwargs
+
+def build_qa_chain(llm, vectorstore, search_kwargs):
+    """벡터 스토어 검색기를 사용하는 RetrievalQA 체인 생성"""
+    return RetrievalQA.from_chain_type(
+        llm=llm,
+        retriever=vectorstore.as_retriever(search_kwargs=search_kwargs)
+    )
+
+#========== 전문가 설명 / 질의응답 프롬프트 ==========
+def get_user_context(responses):
+    """사용자 직업과 AI 지식 수준으로 프롬프트용 사용자 맥락 문구 생성"""
+    user_context = ""
+    if responses:
+        job = responses.get('job', '')
+        ai_knowledge = responses.get('ai_knowledge', '')
+
+        if job:
+            user_context += f" {job}로서"
+
+        if ai_knowledge in ['전혀 모른다', '이름만 들어봤다']:
+            user_context += " AI 초보자를 위한"
+        elif ai_knowledge in ['AI 모델이나 알고리즘을 직접 다뤄본 적 있다']:
+            user_context += " AI 전문가를 위한"
+    return user_context
+
+def get_expert_sections(tool_name, responses):
+    """전문가 설명 섹션 정의와 섹션별 프롬프트 생성"""
+    user_context = get_user_context(responses)
+    sections = [
+        {
+            "emoji": "✨",
+            "title": f"{tool_name}이란?",
+            "prompt": f"{tool_name}의 핵심 기능과 목적을 간결하게 설명해주세요. 2-3문장으로 요약해주세요."
+        },
+        {
+            "emoji": "🚀",
+            "title": "주요 기능",
+            "prompt": f"{tool_name}의 가장 인기 있는 3-5가지 핵심 기능을 간략히 설명해주세요."
+        },
+        {
+            "emoji": "🔄",
+            "title": "유사한 대체 도구",
+            "prompt": f"{tool_name}과 비슷한 기능을 가진 다른 도구 1-2개와 간략한 비교를 해주세요."
+        }
+    ]
+
+    for section in sections:
+        section["prompt"] = f"""
+        당신은 AI 도구 전문가입니다.{user_context} 다음 질문에 한국어로 답변해주세요:
+
+        {section["prompt"]}
+
+        답변은 반드시 한국어로만, 간결하게 작성하세요. 불확실한 정보는 제공하지 마세요.
+        """
+    return sections
+
+def run_qa(qa_system, prompt):
+    """QA 체인 실행 (LangChain 버전에 따라 run 또는 invoke 사용)"""
+    try:
+        # 최신 LangChain 버전용
+        response = qa_system.invoke(prompt)
+        if isinstance(response, dict) and "result" in response:
+            return response["result"]
+        return str(response)
+    except AttributeError:
+        # 이전 LangChain 버전용 (API 오류는 그대로 전달해 같은 요청을 두 번 보내지 않음)
+        return qa_system.run(prompt)
+
+def generate_section(tool_name, section, qa_system):
+    """전문가 설명 한 섹션 생성 (응답이 너무 짧으면 대체 텍스트)"""
+    section_result = run_qa(qa_system, section["prompt"])
+    if len(section_result.strip()) < 20:
+        section_result = f"{tool_name}에 대한 이 정보는 현재 데이터베이스에서 충분히 찾을 수 없습니다."
+    return section_result
+
+def generate_expert_sections(tool_name, qa_system, responses, on_section=None):
+    """
+    화면 출력 없이 전문가 설명 섹션 전체를 생성해 목록으로 반환
+    on_section이 있으면 섹션이 완성될 때마다 호출 (진행 상황 표시용)
+    """
+    results = []
+    for section in get_expert_sections(tool_name, responses):
+        try:
+            content = generate_section(tool_name, section, qa_system)
+            error = None
+        except Exception as e:
+            content = f"{tool_name}에 대한 이 정보는 현재 생성할 수 없습니다."
+            error = str(e)
+        result = {"emoji": section["emoji"], "title": section["title"], "content": content, "error": error}
+        results.append(result)
+        if on_section:
+            on_section(result)
+    return results
+
+def build_korean_description_prompt(tool_name):
+    """도구 목록/추천 카드에 표시할 한국어 소개 문구 프롬프트"""
+    return f"""
+        당신은 AI 도구 전문가입니다. 다음 질문에 한국어로 답변해주세요:
+
+        {tool_name}이 어떤 도구인지 한 문장, 최대 두 문장으로 소개해주세요.
+
+        답변은 반드시 한국어로만, 간결하게 작성하세요. 불확실한 정보는 제공하지 마세요.
+        """
+
+def build_question_prompt(clean_question):
+    """자유 질문용 RAG 프롬프트 생성"""
+    return f"""
+            당신은 AI 도구 추천 전문가입니다. 사용자의 질문에 정확하고 친절하게 답변해주세요.
+            답변은 반드시 한국어로 제공해야 합니다. 사용자의 수준과 직업을 고려하여 적절한 깊이로 설명해주세요.
+            
+            가능하다면 다음 형식으로 답변해주세요:
+            1. 직접적인 질문 답변
+            2. 추가 상세 정보나 팁
+            3. 관련 도구나 활용법 추천
+            질문: {clean_question}
+            """
@@ -0,0 +1,280 @@
+# recommend.py
+
+import json
+import streamlit as st
+
+#========== 데이터 로드 ==========
+def load_json_data(path="tools.json"):
+    """JSON 파일에서 AI 도구 데이터 로드"""
+    try:
+        # UTF-8로 시도(한국어로 ㄱㄱㄱ)
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except UnicodeDecodeError:
+        # UTF-8로 실패한 경우 errors='ignore' 옵션으로 다시 시도
+        try:
+            with open(path, "r", encoding="utf-8", errors="ignore") as f:
+                return json.load(f)
+        except json.JSONDecodeError:
+            # JSON 파싱 오류 발생 시 latin-1 인코딩으로 시도
+            try:
+                with open(path, "r", encoding="latin-1") as f:
+                    return json.load(f)
+            except Exception as e:
+                st.error(f"❌ JSON 파일 로드 오류: {e}")
+                return []
+    except Exception as e:
+        st.error(f"❌ JSON 파일 로드 오류: {e}")
+        return []
+
+#========== 필터링 ==========
+def filter_tools_by_difficulty(tools, difficulty_level):
+    """난이도 기준으로 AI 도구 필터링"""
+    if difficulty_level == "모든 난이도":
+        return tools
+
+    difficulty_map = {
+        "쉬움": "low",
+        "중간": "medium",
+        "어려움": "hard"
+    }
+
+    target_difficulty = difficulty_map.get(difficulty_level)
+
+    filtered = []
+    for tool in tools:
+        # None 난이도는 중간 난이도로 간주
+        if tool.get("difficulty") is None and target_difficulty == "medium":
+            filtered.append(tool)
+        elif tool.get("difficulty") == target_difficulty:
+            filtered.append(tool)
+    return filtered
+
+def filter_tools_by_category(tools, category):
+    """카테고리 기준으로 AI 도구 필터링"""
+    if category == "모든 카테고리":
+        return tools
+
+    return [tool for tool in tools if tool.get("category") == category]
+
+def filter_tools_by_search(tools, search_term):
+    """검색어 기준으로 AI 도구 필터링"""
+    if not search_term:
+        return tools
+
+    return [tool for tool in tools if search_term.lower() in tool.get("name", "").lower() or
+            (tool.get("description") and search_term.lower() in tool.get("description", "").lower())]
+
+#========== 도구 검색 ==========
+def get_tool_details(tool_name, tools_data):
+    """도구 이름으로 세부 정보 검색"""
+    for tool in tools_data:
+        if tool["name"].lower() == tool_name.lower():
+            return tool
+    return None
+
+def find_best_matching_tool(tool_name, tools_data):
+    """가장 유사한 도구 이름 찾기"""
+    # 정확히 일치하는 도구 먼저 확인
+    for tool in tools_data:
+        if tool["name"].lower() == tool_name.lower():
+            return tool
+
+    # 부분 일치하는 도구 확인
+    for tool in tools_data:
+        if tool_name.lower() in tool["name"].lower() or tool["name"].lower() in tool_name.lower():
+            return tool
+
+    return None
+
+#========== 추천 점수 기준 ==========
+# 선호 난이도 응답 → 도구 난이도
+DIFFICULTY_PREFERENCE_MAP = {
+    "쉬움 (초보자도 바로 사용 가능한 도구)": "low",
+    "중간 (기본적인 지식이 필요한 도구)": "medium",
+    "어려움 (전문적인 지식이 필요한 고급 도구)": "hard",
+    "난이도보다는 기능 중심으로 선택하고 싶음": None
+}
+
+# 관심 분야 → 카테고리
+INTEREST_CATEGORY_MAP = {
+    "텍스트 생성": ["AI Assistants (Chatbots)", "Writing", "Grammar and Writing Improvement"],
+    "이미지 생성": ["Image Generation", "Graphic Design"],
+    "영상/음성 합성": ["Video Generation and Editing", "Voice Generation", "Music Generation"],
+    "데이터 분석 및 시각화": ["Research"],
+    "업무 자동화": ["Project Management", "Scheduling", "Email"],
+    "검색 및 지식 관리": ["Search Engines", "Knowledge Management"],
+    "코드 생성 및 개발 지원": ["App Builders & Coding"],
+    "번역 및 언어 학습": ["Grammar and Writing Improvement","AI Assistants (Chatbots)"],
+    "기타": []
+}
+
+# 활용 목적 → 카테고리
+PURPOSE_CATEGORY_MAP = {
+    "문서 작성 및 편집": ["Writing", "Grammar and Writing Improvement","AI Assistants (Chatbots)"],
+    "이미지/영상 제작": ["Image Generation", "Video Generation and Editing","Graphic Design"],
+    "데이터 분석": ["Research"],
+    "프로그래밍 및 개발": ["App Builders & Coding"],
+    "영문이력서 작성": ["Resume Builders", "Writing", "AI Assistants (Chatbots)"],
+    "마케팅 및 홍보": ["Marketing", "Social Media Management"],
+    "교육 및 학습": ["Knowledge Management","Search Engines"],
+    "업무 자동화": ["Project Management", "Scheduling", "Email"],
+    "고객 서비스": ["Customer Service"],
+    "연구 및 논문 작성": ["Research", "Writing","Search Engines","AI Assistants (Chatbots)"],
+    "기타": []
+}
+
+# 직업 → 카테고리
+JOB_CATEGORY_MAP = {
+    "학생": ["Writing", "Research", "Grammar and Writing Improvement", "Knowledge Management"],
+    "개발자/IT 종사자": ["App Builders & Coding", "AI Assistants (Chatbots)"],
+    "교육자/연구원": ["Research", "Knowledge Management", "Presentations", "Writing"],
+    "디자이너/창작자": ["Image Generation", "Video Generation and Editing", "Graphic Design", "Music Generation"],
+    "마케터/홍보": ["Social Media Management", "Marketing", "Writing", "Image Generation"],
+    "사무직": ["Email", "Project Management", "Scheduling", "Writing"],
+    "경영/관리자": ["Project Management", "Knowledge Management", "Presentations"],
+    "창업가/프리랜서": ["Marketing", "Social Media Management", "Email", "Customer Service"],
+    "의료/건강 종사자": ["Research", "Knowledge Management"],
+    "법률/금융 전문가": ["Research", "Grammar and Writing Improvement", "Writing"],
+    "기타": []
+}
+
+#========== 알고리즘 기반 추천 ==========
+def recommend_tools_by_criteria(tools_data, user_responses, max_recommendations=3,
+                                feedback_scores=None, feedback_weight=2.0):
+    """
+    사용자 응답 기반으로 AI 도구 알고리즘적 추천
+    feedback_scores(도구 이름 → 평점 신호)가 있으면 사용자 평점을 순위에 반영
+    """
+    if not tools_data:
+        return []
+
+    # 공유 카탈로그를 변경하지 않도록 복사본에 점수 기록 (동시 요청 안전)
+    tools_data = [dict(tool) for tool in tools_data]
+
+    # 점수 초기화
+    for tool in tools_data:
+        tool['score'] = 0
+
+    # 1. 난이도 기준 점수화 (사용자 선호 난이도에 가까울수록 높은 점수)
+    preferred_difficulty = DIFFICULTY_PREFERENCE_MAP.get(
+        user_responses.get('preferred_difficulty', "난이도보다는 기능 중심으로 선택하고 싶음")
+    )
+
+    # 난이도 점수 계산
+    if preferred_difficulty:
+        for tool in tools_data:
+            if tool.get('difficulty') == preferred_difficulty:
+                tool['score'] += 5
+            # None 난이도는 medium으로 간주
+            elif tool.get('difficulty') is None and preferred_difficulty == "medium":
+                tool['score'] += 4
+
+    # 2. AI
+    # 2. AI 지식 수준에 따른 난이도 조정
+    knowledge_level = user_responses.get('ai_knowledge', '')
+    if knowledge_level in ['전혀 모른다', '이름만 들어봤다']:
+        # 초보자는 쉬운 도구 선호
+        for tool in tools_data:
+            if tool.get('difficulty') == 'low':
+                tool['score'] += 3
+    elif knowledge_level in ['AI 모델이나 알고리즘을 직접 다뤄본 적 있다']:
+        # 전문가는 어려운 도구 선호
+        for tool in tools_data:
+            if tool.get('difficulty') == 'hard':
+                tool['score'] += 3
+
+    # 3. 관심 분야 기반 점수화
+    interests = user_responses.get('tool_interest', [])
+    for interest in interests:
+        matching_categories = INTEREST_CATEGORY_MAP.get(interest, [])
+        for tool in tools_data:
+            if tool.get('category') in matching_categories:
+                tool['score'] += 4
+
+    # 4. 특정 목적 기반 점수화
+    purposes = user_responses.get('specific_purpose', [])
+    for purpose in purposes:
+        matching_categories = PURPOSE_CATEGORY_MAP.get(purpose, [])
+        for tool in tools_data:
+            if tool.get('category') in matching_categories:
+                tool['score'] += 4
+
+    # 5. 직업 기반 점수화 (추가됨)
+    job = user_responses.get('job', '')
+    if job:
+        matching_categories = JOB_CATEGORY_MAP.get(job, [])
+        for tool in tools_data:
+            if tool.get('category') in matching_categories:
+                tool['score'] += 5  # 직업 관련성이 높은 도구에 더 높은 가중치 부여
+
+    # 도구 설명이 있는 도구에 가중치 부여
+    for tool in tools_data:
+        if tool.get('description') and len(str(tool.get('description'))) > 10:
+            tool['score'] += 1
+
+    # 6. 사용자 평점 반영 (평활 평점이 전체 평균보다 높을수록 가산)
+    if feedback_scores:
+        for tool in tools_data:
+            tool['score'] = round(tool['score'] + feedback_weight * feedback_scores.get(tool.get('name'), 0), 2)
+
+    # 최종 점수 기준 정렬 및 상위 추천
+    sorted_tools = sorted(tools_data, key=lambda x: x.get('score', 0), reverse=True)
+    return select_with_easy_tool(sorted_tools, max_recommendations)
+
+def select_with_easy_tool(sorted_tools, max_recommendations):
+    """점수순으로 정렬된 도구에서 상위 추천을 고르되 쉬운 도구가 최소 하나 포함되도록 보장"""
+    # 최소한 하나의 쉬운 도구가 포함되도록 보장 (초보자를 위한 배려)
+    recommended = []
+    has_easy_tool = False
+
+    # 상위 도구들 중에서 선택
+    for tool in sorted_tools:
+        if len(recommended) < max_recommendations:
+            recommended.append(tool)
+            if tool.get('difficulty') == 'low':
+                has_easy_tool = True
+        elif not has_easy_tool and tool.get('difficulty') == 'low':
+            # 쉬운 도구가 없으면 마지막 도구를 쉬운 도구로 교체
+            recommended[-1] = tool
+            has_easy_tool = True
+            break
+
+    return recommended
+
+#========== 표시용 변환 ==========
+def translate_difficulty(difficulty):
+    """난이도 영어 표현을 한국어로 변환"""
+    if difficulty == "low":
+        return "쉬움"
+    elif difficulty == "medium":
+        return "중간"
+    elif difficulty == "hard":
+        return "어려움"
+    return "중간"  # 기본값
+
+def add_korean_description(tools, precomputed=None):
+    """
+    영어 설명이 있는 도구에 한국어 설명 추가
+    precomputed(도구 이름 → 미리 생성된 결과, precompute.py)가 있으면 직접 작성한 설명이 없는 도구에 사용
+    """
+    korean_descriptions = {
+        "ChatGPT": "다양한 텍스트 생성과 대화가 가능한 OpenAI의 대표적인 AI 챗봇으로, 코딩, 글쓰기, 질문 응답 등 다양한 작업에 활용할 수 있습니다.",
+        "Claude": "Anthropic에서 개발한 AI 어시스턴트로, 친절하고 정확한 응답과 특히 코딩에 강점을 가지고 있습니다.",
+        "Gemini": "Google에서 개발한 AI 어시스턴트로 구글 생태계와 높은 통합성을 가지고 있으며 검색과 정보 요약에 강점이 있습니다.",
+        "Midjourney": "텍스트 프롬프트를 기반으로 고품질 이미지를 생성하는 AI 도구로, 예술적 표현과 창의적인 시각화에 탁월합니다.",
+        "Perplexity": "다양한 정보 소스를 활용해 깊이 있는 검색과 답변을 제공하는 AI 검색 엔진입니다.",
+        "Grammarly": "텍스트 작성 시 문법, 맞춤법, 문체를 자동으로 교정해주는 AI 글쓰기 도우미입니다.",
+        "Canva Magic Studio": "손쉬운 디자인 제작을 위한 AI 기능이 강화된 그래픽 디자인 플랫폼입니다.",
+    }
+
+    precomputed = precomputed or {}
+    for tool in tools:
+        if tool.get("description") is not None and "Korean" in tool.get("lang", []):
+            continue
+        if tool.get("name") in korean_descriptions:
+            tool["korean_description"] = korean_descriptions[tool.get("name")]
+        elif precomputed.get(tool.get("name"), {}).get("korean_description"):
+            tool["korean_description"] = precomputed[tool.get("name")]["korean_description"]
+
+    return tools
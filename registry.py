@@ -0,0 +1,185 @@
+# registry.py
+# 카탈로그(tools.json)와 인덱스 산출물의 버전별 스냅샷을 관리해 서버 재시작 없이 교체
+#   - 감시 대상 파일(tools.json, 원본 문서, 인덱스 manifest, 미리 생성한 설명 LATEST)의 mtime/크기를 주기적으로 확인
+#   - 바뀌었으면 내용 해시로 실제 변경인지 확인한 뒤 새 스냅샷을 백그라운드 스레드에서 로드
+#   - 로드가 끝나면 현재 스냅샷 참조만 원자적으로 교체 (로드 실패 시 기존 스냅샷 유지)
+# 요청(재실행)은 시작할 때 받은 스냅샷을 끝까지 사용하고, 제출된 작업도 제출 시점의 자원을 쓰므로
+# 진행 중인 요청은 이전 버전으로 끝나고 새 요청부터 새 버전을 사용함. 버전에 묶인 캐시는 스냅샷과 함께 교체됨
+
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+from catalog import build_catalog_table
+from ingest import INDEX_DIR, INDEX_SOURCES, MANIFEST_FILE, ensure_index
+from precompute import LATEST_FILE, TOOL_CONTENT_DIR, load_tool_content
+from rag import get_embeddings
+from recommend import add_korean_description
+from tool_embeddings import load_tool_index
+
+TOOLS_PATH = "tools.json"
+RELOAD_POLL_INTERVAL = float(os.getenv("RELOAD_POLL_INTERVAL", "10"))  # 변경 확인 최소 간격 (초)
+
+#========== 변경 감지 ==========
+def stat_signature(paths):
+    """파일별 (mtime, 크기) (없는 파일은 None) — 매번 확인해도 부담 없는 가벼운 비교용"""
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            signature.append((path, stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            signature.append((path, None, None))
+    return tuple(signature)
+
+def content_hash(paths):
+    """파일 내용 해시 (mtime만 바뀐 경우 다시 로드하지 않도록)"""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(path.encode("utf-8"))
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(block)
+        digest.update(b"\0")
+    return digest.hexdigest()[:12]
+
+#========== 카탈로그 검증 ==========
+def load_catalog(tools_path=TOOLS_PATH):
+    """
+    스냅샷용 카탈로그 로드 (형식이 잘못되었거나 비어 있으면 ValueError)
+    recommend.load_json_data는 파싱 오류 시 빈 목록을 돌려주므로, 쓰는 도중인 파일이 빈 카탈로그로 교체되지 않도록 따로 검증
+    """
+    try:
+        with open(tools_path, "r", encoding="utf-8-sig") as f:
+            tools = json.load(f)
+    except (OSError, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"카탈로그를 읽을 수 없습니다 ({tools_path}): {e}") from e
+    if not isinstance(tools, list) or not tools:
+        raise ValueError(f"카탈로그가 비어 있거나 도구 목록이 아닙니다: {tools_path}")
+    if not all(isinstance(tool, dict) and tool.get("name") for tool in tools):
+        raise ValueError(f"이름이 없는 도구 항목이 있습니다: {tools_path}")
+    return tools
+
+#========== 스냅샷 ==========
+class Snapshot:
+    """한 버전의 카탈로그와 인덱스 자원 (로드 후에는 읽기만 함)"""
+
+    def __init__(self, version, tools, tool_content, catalog_table, vectorstore, index_manifest, tool_index):
+        self.version = version
+        self.tools = tools
+        self.tool_content = tool_content
+        self.catalog_table = catalog_table
+        self.vectorstore = vectorstore
+        self.index_manifest = index_manifest
+        self.index_version = index_manifest["version"]
+        self.tool_index = tool_index
+        self.loaded_at = datetime.now().isoformat(timespec="seconds")
+        self._cache = {}  # 이 버전에 묶인 파생 객체 (QA 체인 등), 스냅샷이 교체되면 함께 버려짐
+        self._cache_lock = threading.Lock()
+
+    def cached(self, key, factory):
+        """이 버전에서 key에 해당하는 파생 객체를 한 번만 만들어 재사용"""
+        with self._cache_lock:
+            if key not in self._cache:
+                self._cache[key] = factory()
+            return self._cache[key]
+
+def load_snapshot(tools_path=TOOLS_PATH, sources=None, index_dir=INDEX_DIR, content_dir=TOOL_CONTENT_DIR,
+                  embeddings=None):
+    """카탈로그, 미리 생성한 설명, 문서 인덱스, 도구 인덱스를 읽어 스냅샷 구성 (원본이 바뀌었으면 인덱스 재구축)"""
+    embeddings = embeddings or get_embeddings()
+    catalog_hash = content_hash([tools_path, os.path.join(content_dir, LATEST_FILE)])
+    tool_content = load_tool_content(content_dir)
+    tools = add_korean_description(load_catalog(tools_path), tool_content)
+    vectorstore, manifest = ensure_index(sources or INDEX_SOURCES, embeddings, index_dir)
+    return Snapshot(
+        # 카탈로그/설명 내용과 인덱스 버전이 같으면 같은 스냅샷 버전
+        version=hashlib.sha256(f"{catalog_hash}:{manifest['version']}".encode("utf-8")).hexdigest()[:12],
+        tools=tools,
+        tool_content=tool_content,
+        catalog_table=build_catalog_table(tools),
+        vectorstore=vectorstore,
+        index_manifest=manifest,
+        tool_index=load_tool_index(tools, embeddings),
+    )
+
+#========== 레지스트리 ==========
+class ArtifactRegistry:
+    """감시 대상 파일이 바뀌면 새 스냅샷을 백그라운드에서 로드해 교체하는 저장소"""
+
+    def __init__(self, tools_path=TOOLS_PATH, sources=None, index_dir=INDEX_DIR, content_dir=TOOL_CONTENT_DIR,
+                 embeddings=None, poll_interval=RELOAD_POLL_INTERVAL):
+        self.tools_path = tools_path
+        self.sources = list(sources or INDEX_SOURCES)
+        self.index_dir = index_dir
+        self.content_dir = content_dir
+        self.embeddings = embeddings or get_embeddings()
+        self.poll_interval = poll_interval
+        self.watched = [tools_path, *self.sources, os.path.join(index_dir, MANIFEST_FILE),
+                        os.path.join(content_dir, LATEST_FILE)]
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._loading = None  # 로드 중인 스레드
+        self._last_check = time.time()
+
+        # 첫 스냅샷은 바로 로드 (이후 변경은 로드 직전의 파일 상태와 비교)
+        self._signature = stat_signature(self.watched)
+        self._fingerprint = content_hash(self.watched)
+        self._current = self._load()
+
+    def _load(self):
+        return load_snapshot(self.tools_path, self.sources, self.index_dir, self.content_dir, self.embeddings)
+
+    def current(self):
+        """지금 요청에 사용할 스냅샷 (필요하면 변경 확인을 시작하지만 기다리지 않음)"""
+        self.maybe_reload()
+        return self._current
+
+    def maybe_reload(self):
+        """마지막 확인 후 poll_interval이 지났을 때만 파일 상태를 비교하고, 바뀌었으면 백그라운드 로드 시작"""
+        now = time.time()
+        if now - self._last_check < self.poll_interval:
+            return False
+        with self._lock:
+            if now - self._last_check < self.poll_interval or self._loading is not None:
+                return False
+            self._last_check = now
+            signature = stat_signature(self.watched)
+            if signature == self._signature:
+                return False
+            fingerprint = content_hash(self.watched)
+            self._signature = signature
+            if fingerprint == self._fingerprint:
+                return False  # 내용은 그대로 (mtime만 바뀜)
+            self._fingerprint = fingerprint
+            self._loading = threading.Thread(target=self._reload, name="artifact-reload", daemon=True)
+            self._loading.start()
+            return True
+
+    def _reload(self):
+        try:
+            snapshot = self._load()
+        except Exception as e:
+            # 쓰는 도중인 파일 등으로 실패하면 기존 스냅샷을 유지하고 다음 확인 때 다시 시도
+            with self._lock:
+                self.last_error = str(e)
+                self._signature = self._fingerprint = None
+                self._loading = None
+            return
+        with self._lock:
+            # 인덱스 재구축으로 manifest만 다시 쓰인 경우처럼 내용 버전이 같으면 기존 스냅샷(과 캐시)을 유지
+            if snapshot.version != self._current.version:
+                self._current = snapshot
+            self.last_error = None
+            self._loading = None
+
+    def wait(self, timeout=None):
+        """진행 중인 로드가 있으면 끝날 때까지 기다린 뒤 현재 스냅샷 반환"""
+        loading = self._loading
+        if loading is not None:
+            loading.join(timeout)
+        return self._current
@@ -0,0 +1,150 @@
+# service.py
+# Streamlit 없이 사용할 수 있는 추천/질의응답 서비스 계층
+# API 서버 등 여러 요청이 미리 로드된 공유 자원(카탈로그, 벡터 스토어, LLM)을 함께 사용
+# 카탈로그와 인덱스는 registry.py의 스냅샷으로 관리해 파일이 바뀌면 재시작 없이 새 요청부터 새 버전 사용
+
+import threading
+
+from feedback import load_feedback_aggregates
+from ingest import INDEX_SOURCES
+from llm_client import get_llm
+from qa_cache import SemanticQueryCache
+from registry import TOOLS_PATH, ArtifactRegistry
+from tool_embeddings import HYBRID_RULE_WEIGHT, recommend_tools_by_embedding
+from rag import build_qa_chain, build_question_prompt, clean_text, get_embeddings, get_search_kwargs, run_qa
+from recommend import (
+    filter_tools_by_category, filter_tools_by_difficulty, filter_tools_by_search, get_tool_details,
+    recommend_tools_by_criteria
+)
+from user_type import determine_user_type, get_user_type_description
+
+_resources = None
+_resources_lock = threading.Lock()
+
+#========== 공유 자원 ==========
+def load_resources(sources=None, tools_path=None, embeddings=None, llm=None):
+    """
+    요청 하나가 사용할 자원
+    LLM, 임베딩, 캐시 등은 프로세스당 한 번만 만들고, 카탈로그와 인덱스는 현재 스냅샷에서 가져옴
+    (요청 처리 중에 새 버전이 로드되어도 이 요청은 끝까지 같은 스냅샷 사용)
+    원본 문서는 기본적으로 Streamlit 앱과 같은 ingest.INDEX_SOURCES를 사용해 같은 인덱스 디렉터리를 공유하고,
+    자원이 만들어진 뒤 다른 경로나 모델을 넘기면 무시하지 않고 ValueError
+    """
+    global _resources
+    with _resources_lock:
+        if _resources is None:
+            embeddings = embeddings or get_embeddings()
+            sources = list(sources or INDEX_SOURCES)
+            tools_path = tools_path or TOOLS_PATH
+            _resources = {
+                "registry": ArtifactRegistry(tools_path, sources, embeddings=embeddings),
+                "sources": sources,
+                "tools_path": tools_path,
+                "embeddings": embeddings,
+                "llm": llm or get_llm(temperature=0.3),
+                "qa_cache": SemanticQueryCache(embeddings),
+                "feedback": load_feedback_aggregates(),
+            }
+        else:
+            conflicts = [name for name, value, loaded in (
+                ("sources", sources and list(sources), _resources["sources"]),
+                ("tools_path", tools_path, _resources["tools_path"]),
+            ) if value is not None and value != loaded]
+            conflicts += [name for name, value in (("embeddings", embeddings), ("llm", llm))
+                          if value is not None and value is not _resources[name]]
+            if conflicts:
+                raise ValueError(f"공유 자원이 이미 다른 설정으로 만들어졌습니다: {', '.join(conflicts)}")
+    snapshot = _resources["registry"].current()
+    return {
+        **_resources,
+        "snapshot": snapshot,
+        "tools": snapshot.tools,
+        "tool_content": snapshot.tool_content,
+        "tool_index": snapshot.tool_index,
+        "vectorstore": snapshot.vectorstore,
+        "index_version": snapshot.index_version,
+    }
+
+def get_qa_chain(resources, responses):
+    """스냅샷 버전과 검색 깊이(k)별 QA 체인을 한 번만 만들어 재사용"""
+    search_kwargs = get_search_kwargs(responses or {})
+    snapshot = resources["snapshot"]
+    return snapshot.cached(("qa_chain", search_kwargs["k"]),
+                           lambda: build_qa_chain(resources["llm"], snapshot.vectorstore, search_kwargs))
+
+#========== 유형 판별 및 추천 ==========
+def tool_summary(tool):
+    """API 응답용 도구 정보"""
+    return {
+        "name": tool.get("name"),
+        "category": tool.get("category"),
+        "difficulty": tool.get("difficulty"),
+        "description": tool.get("korean_description") or tool.get("description"),
+        "score": tool.get("score"),
+    }
+
+def classify(responses):
+    """설문 응답으로 AI 사용자 유형과 설명 반환"""
+    user_type = determine_user_type(responses)
+    return {"user_type": user_type, **get_user_type_description(user_type)}
+
+def recommend(responses, max_recommendations=3, engine="rules", resources=None):
+    """
+    설문 응답 하나에 대한 유형과 추천 도구
+    engine: rules(규칙 기반), embedding(설명 유사도), hybrid(설명 유사도 + 규칙)
+    """
+    resources = resources or load_resources()
+    user_type = determine_user_type(responses)
+    feedback_scores = resources["feedback"].ranking_signal(user_type)
+    if engine == "rules":
+        recommended = recommend_tools_by_criteria(resources["tools"], responses, max_recommendations, feedback_scores)
+    else:
+        recommended = recommend_tools_by_embedding(
+            resources["tools"], responses, resources["tool_index"], resources["embeddings"], max_recommendations,
+            rule_weight=HYBRID_RULE_WEIGHT if engine == "hybrid" else 0.0, feedback_scores=feedback_scores
+        )
+    return {
+        "user_type": user_type,
+        "tools": [tool_summary(tool) for tool in recommended],
+    }
+
+def recommend_batch(responses_list, max_recommendations=3, engine="rules"):
+    """여러 설문 응답을 한 번에 추천 (배치 전체가 같은 스냅샷 사용)"""
+    resources = load_resources()
+    return [recommend(responses, max_recommendations, engine, resources) for responses in responses_list]
+
+def list_tools(difficulty="모든 난이도", category="모든 카테고리", search=""):
+    """난이도/카테고리/검색어로 필터링한 도구 목록"""
+    tools = load_resources()["tools"]
+    tools = filter_tools_by_difficulty(tools, difficulty)
+    tools = filter_tools_by_category(tools, category)
+    tools = filter_tools_by_search(tools, search)
+    return [tool_summary(tool) for tool in tools]
+
+def tool_detail(name):
+    """도구 정보와 미리 생성된 전문가 설명 섹션 (도구가 없으면 None)"""
+    resources = load_resources()
+    tool = get_tool_details(name, resources["tools"])
+    if tool is None:
+        return None
+    content = resources["tool_content"].get(tool["name"], {})
+    return {**tool_summary(tool), "sections": content.get("sections", [])}
+
+#========== 질의응답 ==========
+def ask(question, responses=None):
+    """자유 질문에 RAG로 답변 (의미 캐시 우선)"""
+    resources = load_resources()
+    clean_question = clean_text(question)
+    k = get_search_kwargs(responses or {})["k"]
+    qa_cache = resources["qa_cache"]
+
+    # 캐시는 원래 질문(한국어 포함)과 검색 깊이로 찾고, 정제한 질문은 LLM과 문서 검색에만 사용
+    cached = qa_cache.lookup(question, resources["index_version"], k)
+    if cached:
+        return {"answer": cached["answer"], "sources": cached["sources"], "cached": True}
+
+    answer = run_qa(get_qa_chain(resources, responses), build_question_prompt(clean_question))
+    docs = resources["vectorstore"].similarity_search(clean_question, k=2)
+    sources = [{"page": doc.metadata.get("page"), "content": doc.page_content} for doc in docs]
+    qa_cache.store(question, answer, sources, resources["index_version"], k)
+    return {"answer": answer, "sources": sources, "cached": False}
@@ -0,0 +1,179 @@
+# session_store.py
+# 세션별 질문 기록을 일정한 크기로 유지하는 저장 계층
+#   - 최근 기록만 압축된 형태로 메모리(링 버퍼)에 두고, 개수/바이트 상한을 넘으면 오래된 기록을 SQLite로 내보냄
+#   - 내보낸 기록은 사용자가 요청할 때만 페이지 단위로 불러옴
+#   - 일정 시간 사용하지 않은 세션은 메모리 버퍼와 SQLite 기록을 모두 정리
+# 여러 세션이 하나의 HistoryStore를 공유하므로 세션 수나 세션 길이와 관계없이 서버 메모리가 일정함
+
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import weakref
+import zlib
+from collections import deque
+
+HISTORY_DB = os.getenv("SESSION_HISTORY_DB", "session_history.db")
+HISTORY_MAX_ITEMS = int(os.getenv("SESSION_HISTORY_MAX_ITEMS", "20"))
+HISTORY_MAX_BYTES = int(os.getenv("SESSION_HISTORY_MAX_BYTES", str(64 * 1024)))
+SESSION_IDLE_TTL = float(os.getenv("SESSION_IDLE_TTL", str(6 * 3600)))  # 초
+EXPIRE_INTERVAL = 60.0  # 만료 세션 정리 최소 간격 (초)
+
+#========== 압축 기록 ==========
+def pack_record(seq, question, answer, response_time, timestamp):
+    """기록 하나를 (순번, 질문, 압축 답변, 응답 시간, 시각) 튜플로"""
+    return (seq, question, zlib.compress(answer.encode("utf-8")), response_time, timestamp)
+
+def unpack_record(record):
+    seq, question, answer, response_time, timestamp = record
+    return {
+        "seq": seq,
+        "question": question,
+        "answer": zlib.decompress(answer).decode("utf-8"),
+        "response_time": response_time,
+        "timestamp": timestamp,
+    }
+
+def record_size(record):
+    return len(record[1].encode("utf-8")) + len(record[2])
+
+#========== 서버 측 저장소 ==========
+class HistoryStore:
+    """모든 세션이 공유하는 SQLite 기록 저장소와 세션 만료 관리"""
+
+    def __init__(self, path=HISTORY_DB, idle_ttl=SESSION_IDLE_TTL):
+        self.path = path
+        self.idle_ttl = idle_ttl
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._sessions = weakref.WeakValueDictionary()  # 세션 ID → 메모리에 있는 SessionHistory
+        self._last_expire = 0.0
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS qa_history ("
+                "session_id TEXT, seq INTEGER, question TEXT, answer BLOB, response_time REAL, timestamp TEXT, "
+                "PRIMARY KEY (session_id, seq))"
+            )
+            self._conn.execute("CREATE TABLE IF NOT EXISTS sessions (session_id TEXT PRIMARY KEY, last_seen REAL)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS sessions_last_seen ON sessions (last_seen)")
+
+    def register(self, history):
+        with self._lock:
+            self._sessions[history.session_id] = history
+
+    def spill(self, session_id, records):
+        """메모리에서 밀려난 기록 저장"""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO qa_history VALUES (?, ?, ?, ?, ?, ?)",
+                [(session_id, *record) for record in records]
+            )
+            self._conn.execute("INSERT OR REPLACE INTO sessions VALUES (?, ?)", (session_id, time.time()))
+
+    def page(self, session_id, before_seq, page, page_size):
+        """before_seq보다 오래된 기록을 최신순으로 한 페이지"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, question, answer, response_time, timestamp FROM qa_history "
+                "WHERE session_id = ? AND seq < ? ORDER BY seq DESC LIMIT ? OFFSET ?",
+                (session_id, before_seq, page_size, page * page_size)
+            ).fetchall()
+        return [unpack_record(row) for row in rows]
+
+    def touch(self, session_id):
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE sessions SET last_seen = ? WHERE session_id = ?", (time.time(), session_id))
+
+    def expire(self, now=None):
+        """오래 사용하지 않은 세션의 메모리 버퍼와 저장된 기록 삭제 (삭제한 세션 수 반환)"""
+        now = now or time.time()
+        cutoff = now - self.idle_ttl
+        with self._lock:
+            self._last_expire = now
+            idle = [history for history in self._sessions.values() if history.last_seen < cutoff]
+            with self._conn:
+                expired = [row[0] for row in self._conn.execute(
+                    "SELECT session_id FROM sessions WHERE last_seen < ?", (cutoff,))]
+                expired_ids = set(expired) | {history.session_id for history in idle}
+                self._conn.executemany("DELETE FROM qa_history WHERE session_id = ?", [(sid,) for sid in expired_ids])
+                self._conn.executemany("DELETE FROM sessions WHERE session_id = ?", [(sid,) for sid in expired_ids])
+        for history in idle:
+            history.clear()
+        return len(expired_ids)
+
+    def maybe_expire(self):
+        """마지막 정리 후 EXPIRE_INTERVAL이 지났을 때만 만료 세션 정리"""
+        if time.time() - self._last_expire >= EXPIRE_INTERVAL:
+            self.expire()
+
+#========== 세션별 기록 ==========
+class SessionHistory:
+    """최근 기록은 압축해 메모리에, 상한을 넘는 오래된 기록은 HistoryStore에 두는 세션 질문 기록"""
+
+    def __init__(self, store, max_items=HISTORY_MAX_ITEMS, max_bytes=HISTORY_MAX_BYTES):
+        self.session_id = uuid.uuid4().hex
+        self.store = store
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.last_seen = time.time()
+        self._store_touched = 0.0  # 저장소의 last_seen을 마지막으로 갱신한 시각
+        self._recent = deque()
+        self._bytes = 0
+        self._next_seq = 0
+        self._spilled = False
+        store.register(self)
+
+    def __len__(self):
+        return len(self._recent) + self.older_count
+
+    @property
+    def older_count(self):
+        """SQLite로 내보낸 기록 수"""
+        return self._recent[0][0] if self._recent else self._next_seq
+
+    def append(self, question, answer, response_time, timestamp):
+        self.touch()
+        record = pack_record(self._next_seq, question, answer, response_time, timestamp)
+        self._next_seq += 1
+        self._recent.append(record)
+        self._bytes += record_size(record)
+
+        # 개수나 크기 상한을 넘으면 오래된 기록부터 서버 측 저장소로 (가장 최근 기록 하나는 항상 유지)
+        spilled = []
+        while len(self._recent) > 1 and (len(self._recent) > self.max_items or self._bytes > self.max_bytes):
+            old = self._recent.popleft()
+            self._bytes -= record_size(old)
+            spilled.append(old)
+        if spilled:
+            self.store.spill(self.session_id, spilled)
+            self._spilled = True
+            self._store_touched = time.time()
+
+    def recent(self):
+        """메모리에 있는 최근 기록 (최신순)"""
+        return [unpack_record(record) for record in reversed(self._recent)]
+
+    def older_page(self, page, page_size=10):
+        """내보낸 기록 한 페이지 (최신순)"""
+        if not self._recent:
+            return self.store.page(self.session_id, self._next_seq, page, page_size)
+        return self.store.page(self.session_id, self._recent[0][0], page, page_size)
+
+    def touch(self):
+        """세션 사용 시각 갱신 (내보낸 기록이 있으면 저장소에도 EXPIRE_INTERVAL마다 한 번 반영)"""
+        now = time.time()
+        # 자주 사용하는 세션도 저장소 시각이 갱신되도록 마지막 사용 시각이 아닌 마지막 저장소 갱신 시각 기준
+        if self._spilled and now - self._store_touched >= EXPIRE_INTERVAL:
+            self.store.touch(self.session_id)
+            self._store_touched = now
+        self.last_seen = now
+
+    def clear(self):
+        """만료된 세션의 기록 비우기"""
+        self._recent.clear()
+        self._bytes = 0
+        self._next_seq = 0
+        self._spilled = False
+        self._store_touched = 0.0
@@ -58,6 +58,16 @@ questions = [
     }
 ]
 
+def random_survey_responses(rng):
+    """설문 질문 목록에서 무작위 응답 생성 (벤치마크/부하 테스트용)"""
+    responses = {}
+    for q in questions:
+        if q.get("multi"):
+            responses[q["key"]] = rng.sample(q["options"], rng.randint(1, 3))
+        else:
+            responses[q["key"]] = rng.choice(q["options"])
+    return responses
+
 #========== 설문 실행 함수 ==========
 def run_survey():
     init_state()
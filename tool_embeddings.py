@@ -0,0 +1,163 @@
+# tool_embeddings.py
+# 도구 설명 임베딩 기반 추천
+#   - 카탈로그의 각 도구(이름, 카테고리, description, korean_description)를 미리 한 번 임베딩해 인덱스로 저장
+#   - 요청 시 설문 응답으로 만든 사용자 프로필 문장만 임베딩해 근사 최근접(ANN) 상위 후보를 찾음
+#   - 필요하면 후보 안에서 규칙 기반 점수(recommend_tools_by_criteria)와 섞어 최종 순위 결정
+# 카테고리 매핑 표에 없는 도구(Recruitment, Sales, Notetakers 등)도 설명이 비슷하면 추천될 수 있음
+#
+# 사용법 (오프라인 인덱스 구축):
+#   python tool_embeddings.py --tools tools.json --index-dir tool_index --embeddings local
+
+import argparse
+import hashlib
+import json
+import os
+
+import faiss
+import numpy as np
+
+from ingest import describe_embeddings, write_atomic
+from rag import get_embeddings
+from recommend import add_korean_description, load_json_data, recommend_tools_by_criteria, select_with_easy_tool
+
+TOOL_INDEX_DIR = "tool_index"
+HNSW_THRESHOLD = 5000  # 이보다 도구가 많으면 정확 검색 대신 HNSW 근사 검색 사용
+EMBED_BATCH_SIZE = 64
+HYBRID_RULE_WEIGHT = 0.5  # 혼합 추천에서 규칙 기반 점수의 비중
+
+#========== 임베딩 문장 ==========
+def tool_text(tool):
+    """도구 하나를 임베딩할 문장"""
+    parts = [tool.get("name", ""), tool.get("category") or ""]
+    for key in ("korean_description", "description"):
+        if tool.get(key):
+            parts.append(str(tool[key]))
+    return "\n".join(part for part in parts if part)
+
+def build_profile_text(responses):
+    """설문 응답으로 만든 사용자 프로필 문장 (도구 설명과 같은 공간에 임베딩)"""
+    lines = []
+    if responses.get("job"):
+        lines.append(f"직업: {responses['job']}")
+    if responses.get("tool_interest"):
+        lines.append(f"관심 분야: {', '.join(responses['tool_interest'])}")
+    if responses.get("specific_purpose"):
+        lines.append(f"활용 목적: {', '.join(responses['specific_purpose'])}")
+    if responses.get("preferred_difficulty"):
+        lines.append(f"선호 난이도: {responses['preferred_difficulty']}")
+    if responses.get("ai_knowledge"):
+        lines.append(f"AI 지식 수준: {responses['ai_knowledge']}")
+    return "\n".join(lines)
+
+def get_catalog_version(tools, embeddings):
+    """도구 문장과 임베딩 모델이 같으면 같은 버전"""
+    digest = hashlib.sha256()
+    for tool in tools:
+        digest.update(tool_text(tool).encode("utf-8"))
+        digest.update(b"\0")
+    digest.update(describe_embeddings(embeddings).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+def normalized(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    faiss.normalize_L2(vectors)  # 내적 = 코사인 유사도
+    return vectors
+
+#========== 도구 인덱스 ==========
+class ToolIndex:
+    """도구 설명 임베딩의 코사인 유사도 인덱스 (카탈로그가 크면 HNSW)"""
+
+    def __init__(self, index, names, version):
+        self.index = index
+        self.names = names
+        self.version = version
+
+    @classmethod
+    def build(cls, tools, embeddings, batch_size=EMBED_BATCH_SIZE):
+        texts = [tool_text(tool) for tool in tools]
+        index = None
+        for start in range(0, len(texts), batch_size):
+            vectors = normalized(embeddings.embed_documents(texts[start:start + batch_size]))
+            if index is None:
+                if len(texts) >= HNSW_THRESHOLD:
+                    index = faiss.IndexHNSWFlat(vectors.shape[1], 32, faiss.METRIC_INNER_PRODUCT)
+                else:
+                    index = faiss.IndexFlatIP(vectors.shape[1])
+            index.add(vectors)
+        return cls(index, [tool.get("name") for tool in tools], get_catalog_version(tools, embeddings))
+
+    def save(self, index_dir=TOOL_INDEX_DIR):
+        os.makedirs(index_dir, exist_ok=True)
+        write_atomic(os.path.join(index_dir, "tools.faiss"),
+                     lambda f: f.write(faiss.serialize_index(self.index).tobytes()), binary=True)
+        write_atomic(os.path.join(index_dir, "manifest.json"),
+                     lambda f: json.dump({"version": self.version, "names": self.names}, f, ensure_ascii=False))
+
+    @classmethod
+    def load(cls, index_dir=TOOL_INDEX_DIR):
+        """저장된 인덱스 (없으면 None)"""
+        manifest_path = os.path.join(index_dir, "manifest.json")
+        if not os.path.exists(manifest_path):
+            return None
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        return cls(faiss.read_index(os.path.join(index_dir, "tools.faiss")), manifest["names"], manifest["version"])
+
+    def search(self, vector, k):
+        """프로필 벡터와 가장 비슷한 도구 (이름, 코사인 유사도) 목록"""
+        scores, ids = self.index.search(normalized([vector]), min(k, self.index.ntotal))
+        return [(self.names[i], float(score)) for score, i in zip(scores[0], ids[0]) if i >= 0]
+
+def load_tool_index(tools, embeddings, index_dir=TOOL_INDEX_DIR):
+    """카탈로그와 임베딩 모델이 같은 저장 인덱스가 있으면 불러오고, 아니면 새로 구축해 저장"""
+    index = ToolIndex.load(index_dir)
+    if index is not None and index.version == get_catalog_version(tools, embeddings):
+        return index
+    index = ToolIndex.build(tools, embeddings)
+    index.save(index_dir)
+    return index
+
+#========== 추천 ==========
+def recommend_tools_by_embedding(tools_data, user_responses, tool_index, embeddings, max_recommendations=3,
+                                 rule_weight=0.0, feedback_scores=None, candidate_k=None):
+    """
+    사용자 프로필과 도구 설명의 유사도로 추천
+    rule_weight > 0이면 유사도 상위 후보 안에서 규칙 기반 점수(최고점으로 정규화)와 섞어 순위 결정
+    """
+    if not tools_data or not tool_index.names:
+        return []
+
+    candidate_k = candidate_k or max(max_recommendations * 10, 30)
+    vector = embeddings.embed_query(build_profile_text(user_responses))
+    similarities = dict(tool_index.search(vector, candidate_k))
+
+    # 인덱스 후보를 카탈로그 도구로 (공유 카탈로그를 변경하지 않도록 복사)
+    candidates = [dict(tool) for tool in tools_data if tool.get("name") in similarities]
+    if rule_weight > 0:
+        rule_scored = recommend_tools_by_criteria(candidates, user_responses, len(candidates), feedback_scores)
+        max_rule = max((tool["score"] for tool in rule_scored), default=0) or 1
+        rule_scores = {tool["name"]: tool["score"] / max_rule for tool in rule_scored}
+    else:
+        rule_scores = {}
+
+    for tool in candidates:
+        similarity = similarities[tool["name"]]
+        tool["similarity"] = round(similarity, 4)
+        tool["score"] = round((1 - rule_weight) * similarity + rule_weight * rule_scores.get(tool["name"], 0), 4)
+
+    sorted_tools = sorted(candidates, key=lambda x: x["score"], reverse=True)
+    return select_with_easy_tool(sorted_tools, max_recommendations)
+
+def main():
+    parser = argparse.ArgumentParser(description="도구 설명 임베딩 인덱스 구축")
+    parser.add_argument("--tools", default="tools.json")
+    parser.add_argument("--index-dir", default=TOOL_INDEX_DIR)
+    parser.add_argument("--embeddings", default=None, help="openai 또는 local (기본: EMBEDDING_BACKEND)")
+    args = parser.parse_args()
+
+    tools = add_korean_description(load_json_data(args.tools))
+    index = load_tool_index(tools, get_embeddings(args.embeddings), args.index_dir)
+    print(f"✅ 도구 인덱스 준비 완료: {args.index_dir} (도구 {index.index.ntotal}개, 버전 {index.version})")
+
+if __name__ == "__main__":
+    main()
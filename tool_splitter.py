@@ -0,0 +1,119 @@
+# tool_splitter.py
+# 원문(tools.txt / tools.pdf)의 구조에 맞춘 문서 분할기
+#   - "The best AI ..." 카테고리 제목과 "1. ChatGPT" 같은 번호 붙은 도구 제목을 인식
+#     (PDF에서는 번호가 추출되지 않으므로 카탈로그의 도구 이름과 정확히 같은 줄도 도구 제목으로 봄)
+#   - 도구 하나의 본문을 하나(길면 몇 개)의 청크로 만들고 category/section/tool 메타데이터를 붙임
+#   - 청크가 도구 경계를 넘지 않으므로 겹침(overlap)이 필요 없음
+
+import hashlib
+import os
+import re
+
+from langchain_core.documents import Document
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+from recommend import load_json_data
+
+# 카테고리 제목 (예: "The best AI assistants (chatbots)", 목차 제목 "The Best AI Tools by Category"는 제외)
+CATEGORY_HEADING_PATTERN = re.compile(r"^The best AI (?!tools by category)", re.IGNORECASE)
+# 번호 붙은 도구 제목 (예: "1. ChatGPT", "36.Textio")
+TOOL_HEADING_PATTERN = re.compile(r"^(\d{1,2})\.\s*(\S.{0,40})$")
+# 도구 하나를 한 청크로 둘 최대 크기 (tools.txt 도구 본문 중앙값 약 1,400자, evaluate.py 비교로 결정)
+TOOL_CHUNK_SIZE = 2000
+
+def normalize_line(line):
+    """줄바꿈 없는 공백(\xa0), BOM, 연속 공백을 정리"""
+    return re.sub(r"\s+", " ", line.replace("\xa0", " ").replace("\ufeff", "")).strip()
+
+def name_key(name):
+    """도구 이름 비교용 키 (대소문자/공백 무시)"""
+    return re.sub(r"\s+", "", name.lower())
+
+def load_tool_categories(tools_path="tools.json"):
+    """카탈로그의 도구 이름 → 카테고리 (카탈로그가 없으면 번호 붙은 제목만 인식하도록 빈 dict)"""
+    if not os.path.exists(tools_path):
+        return {}
+    return {tool["name"]: tool.get("category") for tool in load_json_data(tools_path) if tool.get("name")}
+
+def get_tool_categories_hash(tools_path="tools.json"):
+    """분할 결과에 영향을 주는 카탈로그 내용(도구 이름 → 카테고리)의 해시 (인덱스 버전에 포함)"""
+    items = sorted(load_tool_categories(tools_path).items(), key=lambda item: item[0])
+    return hashlib.sha256(repr(items).encode("utf-8")).hexdigest()[:16]
+
+class ToolSectionSplitter:
+    """카테고리/도구 제목 기준으로 페이지 문서를 도구별 청크로 분할"""
+
+    def __init__(self, tool_categories=None, max_chunk_size=TOOL_CHUNK_SIZE):
+        self.max_chunk_size = max_chunk_size
+        self._tools = {name_key(name): (name, category) for name, category in (tool_categories or {}).items()}
+        # 한 도구의 본문이 너무 길 때만 문단/문장 경계에서 나눔
+        self._splitter = RecursiveCharacterTextSplitter(chunk_size=max_chunk_size, chunk_overlap=0)
+
+    def _match_tool(self, line, in_body):
+        """도구 제목 줄이면 (이름, 카테고리), 아니면 None"""
+        match = TOOL_HEADING_PATTERN.match(line)
+        if match:
+            name = match.group(2).strip()
+            return self._tools.get(name_key(name), (name, None))
+        # 번호가 없는 PDF 제목은 본문(첫 카테고리 제목 이후)에서 카탈로그 이름과 같은 줄만 인정
+        if in_body:
+            return self._tools.get(name_key(line))
+        return None
+
+    def _section_documents(self, lines, metadata):
+        text = "\n".join(lines).strip()
+        if not text:
+            return []
+        parts = [text] if len(text) <= self.max_chunk_size else self._splitter.split_text(text)
+        documents = []
+        for i, part in enumerate(parts):
+            # 이어지는 청크에도 도구 이름을 붙여 어떤 도구의 내용인지 검색되도록 함
+            if i > 0 and metadata.get("tool"):
+                part = f"{metadata['tool']}\n{part}"
+            documents.append(Document(page_content=part, metadata={**metadata, "chunk": i}))
+        return documents
+
+    def iter_split(self, pages):
+        """페이지 문서를 차례로 읽으며 도구 구간이 끝날 때마다 청크를 생성"""
+        lines = []
+        metadata = None
+        section = None
+        in_body = False
+        heading_only = False  # 현재 구간에 카테고리 제목 줄만 있는지
+        for page in pages:
+            for raw_line in page.page_content.split("\n"):
+                line = normalize_line(raw_line)
+                if not line:
+                    continue
+
+                tool = None
+                is_category = bool(CATEGORY_HEADING_PATTERN.match(line))
+                if not is_category:
+                    tool = self._match_tool(line, in_body)
+
+                if tool and heading_only:
+                    # 카테고리 제목만 있는 구간은 따로 청크를 만들지 않고 첫 도구 청크 앞에 붙임
+                    metadata.update(tool=tool[0], category=tool[1])
+                    heading_only = False
+                elif is_category or tool or metadata is None:
+                    if metadata is not None:
+                        yield from self._section_documents(lines, metadata)
+                    if is_category:
+                        section, in_body = line, True
+                    heading_only = is_category
+                    lines = []
+                    metadata = {
+                        "source": page.metadata.get("source"),
+                        "page": page.metadata.get("page"),
+                        "section": section,
+                        "tool": tool[0] if tool else None,
+                        "category": tool[1] if tool else None,
+                    }
+                elif heading_only:
+                    heading_only = False
+                lines.append(line)
+        if metadata is not None:
+            yield from self._section_documents(lines, metadata)
+
+    def split_documents(self, pages):
+        return list(self.iter_split(pages))
@@ -1,113 +1,92 @@
 # user_type.py
 
+# 유형 목록 (동점일 때는 앞에 있는 유형이 선택됨)
+USER_TYPES = [
+    "AI 탐험가",
+    "디지털 아티스트",
+    "효율성 추구자",
+    "지식 수집가",
+    "코드 마법사",
+    "콘텐츠 크리에이터",
+    "비즈니스 전략가",
+    "AI 초보 탐험가"
+]
+
+BEGINNER_LEVELS = ['전혀 모른다', '이름만 들어봤다']
+
+# AI 지식 수준별 점수
+KNOWLEDGE_POINTS = {
+    '전혀 모른다': {"AI 초보 탐험가": 10},
+    '이름만 들어봤다': {"AI 초보 탐험가": 10},
+    '기본 개념은 알고 있다': {"AI 탐험가": 5, "지식 수집가": 3},
+    '실제로 활용해본 경험이 있다': {"효율성 추구자": 5, "콘텐츠 크리에이터": 3, "비즈니스 전략가": 3},
+    'AI 모델이나 알고리즘을 직접 다뤄본 적 있다': {"코드 마법사": 8, "AI 탐험가": 5},
+}
+
+# 직업별 점수
+JOB_POINTS = {
+    "학생": {"AI 탐험가": 3, "지식 수집가": 3},
+    "개발자/IT 종사자": {"코드 마법사": 8, "효율성 추구자": 3},
+    "교육자/연구원": {"지식 수집가": 7, "콘텐츠 크리에이터": 3},
+    "디자이너/창작자": {"디지털 아티스트": 10, "콘텐츠 크리에이터": 5},
+    "마케터/홍보": {"비즈니스 전략가": 7, "콘텐츠 크리에이터": 5},
+    "사무직": {"효율성 추구자": 8, "지식 수집가": 3},
+    "경영/관리자": {"비즈니스 전략가": 9, "효율성 추구자": 6},
+    "창업가/프리랜서": {"AI 탐험가": 5, "비즈니스 전략가": 5, "효율성 추구자": 4},
+}
+
+# 관심 분야별 점수
+INTEREST_POINTS = {
+    "텍스트 생성": {"콘텐츠 크리에이터": 4},
+    "이미지 생성": {"디지털 아티스트": 5},
+    "영상/음성 합성": {"디지털 아티스트": 4, "콘텐츠 크리에이터": 3},
+    "데이터 분석 및 시각화": {"비즈니스 전략가": 4, "지식 수집가": 3},
+    "업무 자동화": {"효율성 추구자": 6},
+    "검색 및 지식 관리": {"지식 수집가": 6},
+    "코드 생성 및 개발 지원": {"코드 마법사": 7},
+    "번역 및 언어 학습": {"지식 수집가": 3, "콘텐츠 크리에이터": 2},
+}
+
+# 활용 목적별 점수
+PURPOSE_POINTS = {
+    "문서 작성 및 편집": {"콘텐츠 크리에이터": 4, "효율성 추구자": 2},
+    "이미지/영상 제작": {"디지털 아티스트": 6},
+    "데이터 분석": {"비즈니스 전략가": 4, "지식 수집가": 3},
+    "프로그래밍 및 개발": {"코드 마법사": 6},
+    "마케팅 및 홍보": {"비즈니스 전략가": 5, "콘텐츠 크리에이터": 3},
+    "교육 및 학습": {"지식 수집가": 5},
+    "업무 자동화": {"효율성 추구자": 6},
+    "고객 서비스": {"비즈니스 전략가": 3},
+    "연구 및 논문 작성": {"지식 수집가": 6, "콘텐츠 크리에이터": 2},
+}
+
 def determine_user_type(responses):
     """사용자 응답에 기반한 AI 사용자 유형 결정"""
     # 포인트 초기화
-    user_type_points = {
-        "AI 탐험가": 0,
-        "디지털 아티스트": 0,
-        "효율성 추구자": 0,
-        "지식 수집가": 0,
-        "코드 마법사": 0,
-        "콘텐츠 크리에이터": 0,
-        "비즈니스 전략가": 0,
-        "AI 초보 탐험가": 0
-    }
+    user_type_points = {user_type: 0 for user_type in USER_TYPES}
+
+    def add_points(points):
+        for user_type, value in points.items():
+            user_type_points[user_type] += value
     
     # AI 지식 수준 기반 점수 부여
     knowledge_level = responses.get('ai_knowledge', '')
-    if knowledge_level in ['전혀 모른다', '이름만 들어봤다']:
-        user_type_points["AI 초보 탐험가"] += 10
-    elif knowledge_level in ['기본 개념은 알고 있다']:
-        user_type_points["AI 탐험가"] += 5
-        user_type_points["지식 수집가"] += 3
-    elif knowledge_level in ['실제로 활용해본 경험이 있다']:
-        user_type_points["효율성 추구자"] += 5
-        user_type_points["콘텐츠 크리에이터"] += 3
-        user_type_points["비즈니스 전략가"] += 3
-    elif knowledge_level in ['AI 모델이나 알고리즘을 직접 다뤄본 적 있다']:
-        user_type_points["코드 마법사"] += 8
-        user_type_points["AI 탐험가"] += 5
+    add_points(KNOWLEDGE_POINTS.get(knowledge_level, {}))
     
     # 직업 기반 점수 부여
     job = responses.get('job', '')
-    if job == "학생":
-        user_type_points["AI 탐험가"] += 3
-        user_type_points["지식 수집가"] += 3
-    elif job == "개발자/IT 종사자":
-        user_type_points["코드 마법사"] += 8
-        user_type_points["효율성 추구자"] += 3
-    elif job == "교육자/연구원":
-        user_type_points["지식 수집가"] += 7
-        user_type_points["콘텐츠 크리에이터"] += 3
-    elif job == "디자이너/창작자":
-        user_type_points["디지털 아티스트"] += 10
-        user_type_points["콘텐츠 크리에이터"] += 5
-    elif job == "마케터/홍보":
-        user_type_points["비즈니스 전략가"] += 7
-        user_type_points["콘텐츠 크리에이터"] += 5
-    elif job == "사무직":
-        user_type_points["효율성 추구자"] += 8
-        user_type_points["지식 수집가"] += 3
-    elif job == "경영/관리자":
-        user_type_points["비즈니스 전략가"] += 9
-        user_type_points["효율성 추구자"] += 6
-    elif job == "창업가/프리랜서":
-        user_type_points["AI 탐험가"] += 5
-        user_type_points["비즈니스 전략가"] += 5
-        user_type_points["효율성 추구자"] += 4
+    add_points(JOB_POINTS.get(job, {}))
     
     # 관심 분야 기반 점수 부여
-    interests = responses.get('tool_interest', [])
-    for interest in interests:
-        if interest == "텍스트 생성":
-            user_type_points["콘텐츠 크리에이터"] += 4
-        elif interest == "이미지 생성":
-            user_type_points["디지털 아티스트"] += 5
-        elif interest == "영상/음성 합성":
-            user_type_points["디지털 아티스트"] += 4
-            user_type_points["콘텐츠 크리에이터"] += 3
-        elif interest == "데이터 분석 및 시각화":
-            user_type_points["비즈니스 전략가"] += 4
-            user_type_points["지식 수집가"] += 3
-        elif interest == "업무 자동화":
-            user_type_points["효율성 추구자"] += 6
-        elif interest == "검색 및 지식 관리":
-            user_type_points["지식 수집가"] += 6
-        elif interest == "코드 생성 및 개발 지원":
-            user_type_points["코드 마법사"] += 7
-        elif interest == "번역 및 언어 학습":
-            user_type_points["지식 수집가"] += 3
-            user_type_points["콘텐츠 크리에이터"] += 2
+    for interest in responses.get('tool_interest', []):
+        add_points(INTEREST_POINTS.get(interest, {}))
     
     # 활용 목적 기반 점수 부여
-    purposes = responses.get('specific_purpose', [])
-    for purpose in purposes:
-        if purpose == "문서 작성 및 편집":
-            user_type_points["콘텐츠 크리에이터"] += 4
-            user_type_points["효율성 추구자"] += 2
-        elif purpose == "이미지/영상 제작":
-            user_type_points["디지털 아티스트"] += 6
-        elif purpose == "데이터 분석":
-            user_type_points["비즈니스 전략가"] += 4
-            user_type_points["지식 수집가"] += 3
-        elif purpose == "프로그래밍 및 개발":
-            user_type_points["코드 마법사"] += 6
-        elif purpose == "마케팅 및 홍보":
-            user_type_points["비즈니스 전략가"] += 5
-            user_type_points["콘텐츠 크리에이터"] += 3
-        elif purpose == "교육 및 학습":
-            user_type_points["지식 수집가"] += 5
-        elif purpose == "업무 자동화":
-            user_type_points["효율성 추구자"] += 6
-        elif purpose == "고객 서비스":
-            user_type_points["비즈니스 전략가"] += 3
-        elif purpose == "연구 및 논문 작성":
-            user_type_points["지식 수집가"] += 6
-            user_type_points["콘텐츠 크리에이터"] += 2
+    for purpose in responses.get('specific_purpose', []):
+        add_points(PURPOSE_POINTS.get(purpose, {}))
     
     # 초보 레벨일 경우 초보 탐험가 가중치 추가
-    if knowledge_level in ['전혀 모른다', '이름만 들어봤다']:
+    if knowledge_level in BEGINNER_LEVELS:
         user_type_points["AI 초보 탐험가"] = max(user_type_points.values()) + 5
     
     # 점수가 가장 높은 유형 선택